@@ -0,0 +1,51 @@
+# backend/app/api/admin_router.py
+
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+
+from ..core import profiler
+from ..core.config_loader import settings
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None)) -> None:
+    """
+    Operator endpoints are authenticated with ADMIN_API_TOKEN (not a user
+    login). Without that setting they do not exist at all.
+    """
+    if not settings.ADMIN_API_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, settings.ADMIN_API_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
+
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(require_admin_token)],
+    include_in_schema=False
+)
+
+@router.post("/profile")
+async def profile_worker(
+    seconds: float = Query(10.0, gt=0, le=profiler.MAX_PROFILE_SECONDS)
+):
+    """
+    Profiles the worker that receives this request for `seconds` and
+    returns the samples as a collapsed-stack file (feed it to
+    flamegraph.pl or speedscope). Each worker is profiled on its own, so
+    send load while this runs.
+    """
+    try:
+        result = await profiler.profile_for(seconds)
+    except profiler.ProfilerBusy:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A profile is already running in this worker.")
+    return Response(
+        content=result.collapsed(),
+        media_type="text/plain",
+        headers={
+            "Content-Disposition": 'attachment; filename="profile.collapsed"',
+            "X-Profile-Samples": str(result.samples),
+        }
+    )
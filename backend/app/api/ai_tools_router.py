@@ -1,32 +1,32 @@
 # backend/app/api/ai_tools_router.py
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Dict, Any
 
-from ..core.database import get_db
+from ..core.database import get_async_db
 from ..models import user_model, task_model
 from ..schemas import task_schema
-from ..services import auth_service, ai_tools_service, priority_service
+from ..services import auth_service, ai_tools_service, priority_service, calendar_service
 
 router = APIRouter(
     prefix="/ai-tools",
     tags=["AI Tools"],
-    dependencies=[Depends(auth_service.get_current_user)]
+    dependencies=[Depends(auth_service.get_current_principal)]
 )
 
 @router.post("/split-task/{task_id}", response_model=List[task_schema.TaskRead], status_code=status.HTTP_201_CREATED)
 async def split_task(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user: user_model.User = Depends(auth_service.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_model.User = Depends(auth_service.get_current_user_async)
 ):
     """
     Uses the AI Task Splitter service to break a parent task into new sub-tasks.
     """
     
     # 1. Get the parent task
-    parent_task = db.query(task_model.Task).filter(task_model.Task.id == task_id).first()
+    parent_task = await db.get(task_model.Task, task_id)
     if not parent_task:
         raise HTTPException(status_code=404, detail="Parent task not found")
     if parent_task.owner_id != current_user.id:
@@ -64,16 +64,33 @@ async def split_task(
         parent_task.completed = True
         db.add(parent_task)
         
-        db.commit()
+        await db.commit()
         
         # Refresh all new tasks to get their IDs
         for task in new_tasks:
-            db.refresh(task)
+            await db.refresh(task)
+
+        # 5. Sync the calendar in one batch: add the sub-tasks' events
+        # and remove the (now completed) parent's event
+        operations = [calendar_service.CalendarOperation("create", task=task) for task in new_tasks]
+        if parent_task.google_calendar_event_id:
+            operations.append(calendar_service.CalendarOperation("delete", task=parent_task))
+        results = await calendar_service.batch_calendar_operations_async(db, current_user, operations)
+
+        for result in results:
+            if result.operation.action == "create" and result.event_id:
+                result.operation.task.google_calendar_event_id = result.event_id
+            elif result.operation.action == "delete" and result.ok:
+                parent_task.google_calendar_event_id = None
+        await db.commit()
+
+        for task in new_tasks:
+            await db.refresh(task)
             
         return new_tasks
 
     except RuntimeError as e:
         raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create sub-tasks: {e}")
\ No newline at end of file
@@ -3,18 +3,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any
 # --- THIS IS THE FIX ---
 import datetime 
+import logging
 # ------------------------
 
 
-from ..core.database import get_db
+from ..core.database import get_db, get_async_db
 from ..schemas import user_schema
 from ..models import user_model
-from ..services import auth_service
+from ..services import auth_service, timezone_service
 from ..core.config_loader import settings
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(
     prefix="/auth",
     tags=["Authentication"]
@@ -42,7 +46,7 @@ def google_login():
 async def google_callback(
     request: Request, # We need the full request to get query params
     response: Response,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Handles the callback from Google. Exchanges the code for tokens,
@@ -61,13 +65,14 @@ async def google_callback(
         )
         
         # 2. Get Google user profile
-        google_user_profile = auth_service.get_google_user_profile(google_tokens)
+        google_user_profile = await auth_service.get_google_user_profile(google_tokens)
         
         # 3. Find or create the user in our database
-        user = auth_service.get_or_create_user_from_google(db=db, google_profile=google_user_profile)
+        # (sync services; run_sync runs them on the async connection)
+        user = await db.run_sync(auth_service.get_or_create_user_from_google, google_user_profile)
         
         # 4. Create our app's "Facebook-style" persistent login tokens
-        app_tokens = auth_service.create_app_tokens(db=db, user_id=user.id)
+        app_tokens = await db.run_sync(auth_service.create_app_tokens, user.id)
         
         # 5. Set the long-lived refresh token in a secure, HttpOnly cookie
         response.set_cookie(
@@ -88,10 +93,10 @@ async def google_callback(
         
         # 6. Store the Google refresh token (if we got one) for calendar access
         if google_tokens.get("refresh_token"):
-            auth_service.store_google_refresh_token(
-                db=db, 
-                user=user, 
-                google_refresh_token=google_tokens["refresh_token"]
+            await db.run_sync(
+                auth_service.store_google_refresh_token,
+                user,
+                google_tokens["refresh_token"]
             )
         
         # 7. Always redirect to the frontend callback page
@@ -101,7 +106,7 @@ async def google_callback(
         return RedirectResponse(f"{redirect_url}?token={app_tokens['access_token']}")
 
     except Exception as e:
-        print(f"🚨 Auth Callback Error: {e}")
+        logger.exception("Auth callback error: %s", e)
         error_message = str(e).replace(" ", "+") # Simple URL encoding
         return RedirectResponse(f"http://{settings.DOMAIN}:3000/?error={error_message}")
 # --- 3. The /finalize-signup endpoint (No changes) ---
@@ -166,10 +171,30 @@ def logout(response: Response, request: Request, db: Session = Depends(get_db)):
 # --- 6. The /me endpoint (No changes) ---
 @router.get("/me", response_model=user_schema.UserReadWithStatus)
 def read_users_me(
-    current_user: user_model.User = Depends(auth_service.get_current_user)
+    current_user: user_schema.Principal = Depends(auth_service.get_current_principal)
 ):
     """
     Get the profile for the currently authenticated user.
     This is used by the frontend to check has_finalized_signup.
     """
-    return current_user
\ No newline at end of file
+    return current_user
+
+# --- 7. The /me/timezone endpoint ---
+@router.put("/me/timezone", response_model=user_schema.UserReadWithStatus)
+def update_my_timezone(
+    timezone_in: user_schema.TimezoneUpdate,
+    db: Session = Depends(get_db),
+    current_user: user_model.User = Depends(auth_service.get_current_user)
+):
+    """
+    Sets the user's IANA timezone, which decides where "today" starts and ends
+    for task filters, dashboard progress, streaks and the heatmap.
+    """
+    if not timezone_service.is_valid_timezone(timezone_in.timezone):
+        raise HTTPException(status_code=400, detail=f"Unknown timezone: {timezone_in.timezone}")
+
+    current_user.timezone = timezone_in.timezone
+    db.add(current_user)
+    db.commit()
+    db.refresh(current_user)
+    return current_user
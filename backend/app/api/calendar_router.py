@@ -0,0 +1,47 @@
+# backend/app/api/calendar_router.py
+
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy.orm import Session
+
+from ..core.database import get_db
+from ..models import user_model
+from ..services import auth_service, calendar_sync_service
+
+router = APIRouter(
+    prefix="/calendar",
+    tags=["Calendar"]
+)
+
+@router.post("/sync", response_model=Dict[str, int])
+def sync_calendar_now(
+    db: Session = Depends(get_db),
+    current_user: user_model.User = Depends(auth_service.get_current_user)
+):
+    """
+    Pulls the user's Google Calendar changes right away (moved, renamed
+    or deleted events) instead of waiting for the background sync.
+    """
+    return calendar_sync_service.sync_user_calendar(db, current_user)
+
+@router.post("/notifications", status_code=status.HTTP_204_NO_CONTENT, include_in_schema=False)
+def receive_calendar_notification(
+    db: Session = Depends(get_db),
+    x_goog_channel_token: Optional[str] = Header(None),
+    x_goog_resource_state: Optional[str] = Header(None)
+):
+    """
+    Google's push-notification webhook (see GOOGLE_CALENDAR_WEBHOOK_URL).
+    A notification carries no event data, only "something changed", so we
+    just make the user due for a sync and wake the sync worker.
+    """
+    user_id = calendar_sync_service.read_channel_token(x_goog_channel_token)
+    if user_id is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Unknown channel")
+
+    # 'sync' is only the handshake sent when the channel is created
+    if x_goog_resource_state != "sync":
+        calendar_sync_service.request_sync(db, user_id)
+        calendar_sync_service.calendar_sync_worker.poke()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,73 @@
+# backend/app/api/events_router.py
+
+import asyncio
+import json
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+
+from ..schemas.user_schema import Principal, StreamTicket
+from ..services import auth_service, event_service
+
+router = APIRouter(
+    prefix="/events",
+    tags=["Events"]
+)
+
+HEARTBEAT_SECONDS = 15 # Keeps proxies from closing an idle stream
+
+def _format_sse(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+
+@router.post("/ticket", response_model=StreamTicket)
+async def create_stream_ticket(
+    current_user: Principal = Depends(auth_service.get_current_principal)
+):
+    """
+    Trades the access token (Authorization header) for a single-use,
+    short-lived ticket to open the event stream with.
+    """
+    return StreamTicket(
+        ticket=auth_service.create_stream_ticket(current_user.id),
+        expires_in=auth_service.STREAM_TICKET_EXPIRE_SECONDS
+    )
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    user_id: int = Depends(auth_service.get_stream_user_id)
+):
+    """
+    Server-Sent Events stream of the current user's live updates:
+    task.created / task.updated / task.deleted, calendar.synced,
+    achievement.unlocked and user.updated. Task events carry the new
+    change version, so the client can pull the rows with GET /tasks/changes
+    instead of polling.
+
+    EventSource cannot send headers, so from the browser get a ticket with
+    POST /events/ticket first and connect with ?ticket=... (a new ticket
+    for every reconnect).
+    """
+    queue = event_service.event_hub.subscribe(user_id)
+
+    async def event_generator():
+        try:
+            # Tell the browser how long to wait before reconnecting
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _format_sse(event)
+        finally:
+            event_service.event_hub.unsubscribe(user_id, queue)
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no", # Disable proxy buffering (nginx)
+        }
+    )
@@ -3,21 +3,24 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from ..core.database import get_db
-from ..models import user_model
 from ..schemas import gamification_schema
-from ..services import auth_service, gamification_service
+from ..schemas.user_schema import Principal
+from ..services import auth_service, gamification_service, change_service, replica_service
 
 router = APIRouter(
     prefix="/gamification",
     tags=["Gamification"],
-    dependencies=[Depends(auth_service.get_current_user)]
+    dependencies=[Depends(auth_service.get_current_principal)]
 )
 
-@router.get("/status", response_model=gamification_schema.GamificationStatus)
+@router.get(
+    "/status",
+    response_model=gamification_schema.GamificationStatus,
+    dependencies=[Depends(change_service.conditional_get)]
+)
 def get_user_gamification_status(
-    db: Session = Depends(get_db),
-    current_user: user_model.User = Depends(auth_service.get_current_user)
+    db: Session = Depends(replica_service.get_read_db),
+    current_user: Principal = Depends(auth_service.get_current_principal)
 ):
     """
     Retrieves the current user's gamification status,
@@ -4,21 +4,20 @@ from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
 
-from ..core.database import get_db
-from ..models import user_model
-from ..services import auth_service, insights_service # Import the new service
+from ..services import auth_service, insights_service, change_service, timezone_service, replica_service # Import the new service
 from ..schemas import insights_schema # <-- NEW IMPORT
+from ..schemas.user_schema import Principal
 
 router = APIRouter(
     prefix="/insights",
     tags=["Insights"],
-    dependencies=[Depends(auth_service.get_current_user)]
+    dependencies=[Depends(auth_service.get_current_principal)]
 )
 
 @router.get("/burndown", response_model=List[Dict[str, Any]])
 def get_burndown_data(
-    db: Session = Depends(get_db),
-    current_user: user_model.User = Depends(auth_service.get_current_user)
+    db: Session = Depends(replica_service.get_read_db),
+    current_user: Principal = Depends(auth_service.get_current_principal)
 ):
     """
     Retrieves data for the Predictive Progress (Burndown) Chart.
@@ -26,25 +25,36 @@ def get_burndown_data(
     """
     return insights_service.get_burndown_data(db, current_user.id)
 
-@router.get("/heatmap", response_model=List[Dict[str, Any]])
+@router.get(
+    "/heatmap",
+    response_model=List[Dict[str, Any]],
+    dependencies=[Depends(change_service.conditional_get)]
+)
 def get_heatmap_data(
-    db: Session = Depends(get_db),
-    current_user: user_model.User = Depends(auth_service.get_current_user)
+    db: Session = Depends(replica_service.get_read_db),
+    current_user: Principal = Depends(auth_service.get_current_principal)
 ):
     """
     Retrieves data for the Productivity Heatmap.
     Data is generated by aggregating task completion logs by day of week and hour of day.
     """
-    return insights_service.get_productivity_heatmap_data(db, current_user.id)
+    return insights_service.get_productivity_heatmap_data(
+        db, current_user.id, timezone_service.get_user_timezone_name(current_user)
+    )
 
 # --- NEW ENDPOINT ---
-@router.get("/progress-summary", response_model=insights_schema.DashboardProgressSummary)
+@router.get(
+    "/progress-summary",
+    response_model=insights_schema.DashboardProgressSummary,
+    dependencies=[Depends(change_service.conditional_get)]
+)
 def get_dashboard_progress_summary(
-    db: Session = Depends(get_db),
-    current_user: user_model.User = Depends(auth_service.get_current_user)
+    db: Session = Depends(replica_service.get_read_db),
+    current_user: Principal = Depends(auth_service.get_current_principal),
+    day_window: timezone_service.DayWindow = Depends(timezone_service.get_request_day_window)
 ):
     """
     Retrieves high-level progress stats for the main dashboard.
     """
-    return insights_service.get_dashboard_progress(db, current_user.id)
+    return insights_service.get_dashboard_progress(db, current_user.id, day_window)
 # --- END OF NEW ENDPOINT ---
\ No newline at end of file
@@ -1,26 +1,30 @@
 # backend/app/api/summary_router.py
 
 from fastapi import APIRouter, Depends, Query, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 import datetime # <-- Import datetime
+import logging
 
-from ..core.database import get_db
+from ..core.database import get_async_db
 from ..models import user_model, log_model # <-- Import log_model
 from ..schemas import summary_schema
-from ..services import auth_service, summary_service, insights_service # <-- Import insights_service
+from ..services import auth_service, summary_service, insights_service, timezone_service # <-- Import insights_service
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/summary",
     tags=["Summary"],
-    dependencies=[Depends(auth_service.get_current_user)]
+    dependencies=[Depends(auth_service.get_current_principal)]
 )
 
 @router.get("/weekly", response_model=summary_schema.WeeklySummary)
 async def get_weekly_summary(
     force_regenerate: bool = Query(False, description="Force a new summary to be generated, ignoring the cache."),
-    db: Session = Depends(get_db),
-    current_user: user_model.User = Depends(auth_service.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_model.User = Depends(auth_service.get_current_user_async)
 ):
     """
     Retrieves the user's weekly AI-generated summary.
@@ -38,27 +42,34 @@ async def get_weekly_summary(
         current_user.last_summary_text and
         current_user.last_summary_generated_at > (datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=summary_service.CACHE_DURATION_HOURS))
     ):
-        print(f"User {current_user.id}: Returning cached summary.")
+        logger.info("User %s: Returning cached summary.", current_user.id)
         return summary_schema.WeeklySummary(
             summary_html=current_user.last_summary_text,
             generated_at=current_user.last_summary_generated_at
         )
 
     # 2. If no valid cache, generate a new one
-    print(f"User {current_user.id}: Generating new summary (Force: {force_regenerate}).")
+    logger.info("User %s: Generating new summary (Force: %s).", current_user.id, force_regenerate)
 
     try:
         # --- FIX: Perform all DB queries BEFORE awaiting ---
         
         # A. Get heatmap data
-        heatmap_data = insights_service.get_productivity_heatmap_data(db, current_user.id)
+        # (a sync service; run_sync runs it on the async connection)
+        heatmap_data = await db.run_sync(
+            insights_service.get_productivity_heatmap_data,
+            current_user.id, timezone_service.get_user_timezone_name(current_user)
+        )
         
         # B. Get logs from the last 7 days
-        seven_days_ago = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=7)
-        recent_logs = db.query(log_model.UserLog).filter(
-            log_model.UserLog.user_id == current_user.id,
-            log_model.UserLog.timestamp >= seven_days_ago
-        ).order_by(log_model.UserLog.timestamp.desc()).all()
+        # (user_logs.timestamp is naive UTC)
+        seven_days_ago = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) - datetime.timedelta(days=7)
+        recent_logs = (await db.execute(
+            select(log_model.UserLog).filter(
+                log_model.UserLog.user_id == current_user.id,
+                log_model.UserLog.timestamp >= seven_days_ago
+            ).order_by(log_model.UserLog.timestamp.desc())
+        )).scalars().all()
         # --------------------------------------------------
 
         # Now, call the async service with the data (no db session)
@@ -73,8 +84,8 @@ async def get_weekly_summary(
         current_user.last_summary_generated_at = generated_at_time
         
         db.add(current_user)
-        db.commit()
-        db.refresh(current_user)
+        await db.commit()
+        await db.refresh(current_user)
         
         return summary_schema.WeeklySummary(
             summary_html=summary_html,
@@ -84,8 +95,6 @@ async def get_weekly_summary(
     except RuntimeError as e:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
     except Exception as e:
-        # Print the full error to the console for debugging
-        print(f"🚨 UNEXPECTED ERROR in /summary/weekly: {type(e).__name__} - {e}")
-        import traceback
-        traceback.print_exc()
+        # Log the full error (with traceback) for debugging
+        logger.exception("Unexpected error in /summary/weekly: %s - %s", type(e).__name__, e)
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"An unexpected error occurred: {str(e)}")
\ No newline at end of file
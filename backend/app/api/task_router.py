@@ -2,20 +2,19 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import or_, and_
 from sqlalchemy.orm.attributes import flag_modified
 from typing import List, Optional, Literal
 import datetime
-
-# --- MODIFICATION: Import zoneinfo ---
-from zoneinfo import ZoneInfo
-# -------------------------------------
+import logging
 
 # --- Import updated schemas and NEW service ---
-from ..core.database import get_db
+from ..core.database import get_db, get_async_db
 from ..models import user_model, task_model
 from ..schemas import task_schema
 from ..schemas.task_schema import TaskCreateManual 
+from ..schemas.user_schema import Principal
 
 # --- MODIFIED IMPORTS ---
 # We now import our NEW auth_service and NEW calendar_service
@@ -26,23 +25,30 @@ from ..services import (
     log_service, 
     gamification_service, 
     ml_service,
-    calendar_service  # <-- NEW
+    calendar_service,  # <-- NEW
+    change_service,
+    event_service,
+    replica_service,
+    timezone_service
 )
 # ------------------------
 from ..core.config_loader import settings
+from ..core import request_timing
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="/tasks",
     tags=["Tasks"],
     # --- MODIFICATION: Use the new auth dependency ---
-    dependencies=[Depends(auth_service.get_current_user)]
+    dependencies=[Depends(auth_service.get_current_principal)]
 )
 
 @router.post("/", response_model=task_schema.TaskRead, status_code=status.HTTP_201_CREATED)
 async def create_task(
     task_in: task_schema.TaskCreate,
-    db: Session = Depends(get_db),
-    current_user: user_model.User = Depends(auth_service.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_model.User = Depends(auth_service.get_current_user_async)
 ):
     """
     Create a new task using NLP, personalize it with ML,
@@ -51,13 +57,17 @@ async def create_task(
     
     # --- 1. NLP SERVICE: Parse the task ---
     try:
-        nlp_result = await nlp_service.parse_task_from_text(task_in.nlp_text)
+        with request_timing.span("nlp"):
+            nlp_result = await nlp_service.parse_task_from_text(
+                task_in.nlp_text,
+                timezone_name=timezone_service.get_user_timezone_name(current_user)
+            )
     except ValueError as e:
          raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"NLP Error: {str(e)}")
     except RuntimeError as e: 
          raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"NLP Service Unavailable: {str(e)}")
     except Exception as e: 
-        print(f"🚨 UNEXPECTED NLP ERROR: {type(e).__name__} - {e}")
+        logger.exception("Unexpected NLP error: %s - %s", type(e).__name__, e)
         error_detail = "An unexpected error occurred during task processing."
         if "API" in str(e):
             error_detail = f"AI Service request failed: {str(e)}"
@@ -121,17 +131,18 @@ async def create_task(
     )
 
     db.add(db_task)
-    db.commit()
-    db.refresh(db_task) 
+    await db.commit()
+    await db.refresh(db_task) 
     
     # --- 6. NEW: CALENDAR SYNC ---
     # After the task is created, sync it to Google Calendar
-    event_id = calendar_service.create_calendar_event(db=db, user=current_user, task=db_task)
+    with request_timing.span("calendar_sync"):
+        event_id = await calendar_service.create_calendar_event_async(db=db, user=current_user, task=db_task)
     if event_id:
         db_task.google_calendar_event_id = event_id
         db.add(db_task)
-        db.commit()
-        db.refresh(db_task)
+        await db.commit()
+        await db.refresh(db_task)
     # -----------------------------
     
     # --- 7. UPDATE TASK ID IN SUGGESTION (if needed) ---
@@ -144,8 +155,8 @@ async def create_task(
         db_task.task_metadata["smart_suggestion"]["payload"] = db_task.id
         flag_modified(db_task, "task_metadata") 
         db.add(db_task)
-        db.commit()
-        db.refresh(db_task)
+        await db.commit()
+        await db.refresh(db_task)
 
     return db_task
 
@@ -153,8 +164,8 @@ async def create_task(
 @router.post("/manual", response_model=task_schema.TaskRead, status_code=status.HTTP_201_CREATED)
 async def create_task_manual(
     task_in: TaskCreateManual,
-    db: Session = Depends(get_db),
-    current_user: user_model.User = Depends(auth_service.get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_model.User = Depends(auth_service.get_current_user_async)
 ):
     """
     Create a new task from manual user input, personalize it,
@@ -212,16 +223,17 @@ async def create_task_manual(
     )
 
     db.add(db_task)
-    db.commit()
-    db.refresh(db_task) 
+    await db.commit()
+    await db.refresh(db_task) 
     
     # --- 6. NEW: CALENDAR SYNC ---
-    event_id = calendar_service.create_calendar_event(db=db, user=current_user, task=db_task)
+    with request_timing.span("calendar_sync"):
+        event_id = await calendar_service.create_calendar_event_async(db=db, user=current_user, task=db_task)
     if event_id:
         db_task.google_calendar_event_id = event_id
         db.add(db_task)
-        db.commit()
-        db.refresh(db_task)
+        await db.commit()
+        await db.refresh(db_task)
     # -----------------------------
     
     # --- 7. UPDATE TASK ID IN SUGGESTION (if needed) ---
@@ -234,21 +246,26 @@ async def create_task_manual(
         db_task.task_metadata["smart_suggestion"]["payload"] = db_task.id
         flag_modified(db_task, "task_metadata")
         db.add(db_task)
-        db.commit()
-        db.refresh(db_task)
+        await db.commit()
+        await db.refresh(db_task)
 
     return db_task
 # --- END OF NEW ENDPOINT ---
 
 
-@router.get("/", response_model=List[task_schema.TaskRead])
+@router.get(
+    "/",
+    response_model=List[task_schema.TaskRead],
+    dependencies=[Depends(change_service.conditional_get)]
+)
 def read_tasks(
     status: str = Query('all', enum=['active', 'completed', 'all']),
     show: str = Query('today', enum=['today', 'upcoming', 'last7days', 'last28days']),
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: user_model.User = Depends(auth_service.get_current_user)
+    db: Session = Depends(replica_service.get_read_db),
+    current_user: Principal = Depends(auth_service.get_current_principal),
+    day_window: timezone_service.DayWindow = Depends(timezone_service.get_request_day_window)
 ):
     """
     Retrieve tasks for the current user, with filtering options.
@@ -262,23 +279,11 @@ def read_tasks(
         query = query.filter(task_model.Task.completed == True)
 
     # --- THIS IS THE FIX for the "Midnight Bug" ---
+    # "Today" is computed once per request, in the user's own timezone
+    today_start = day_window.today_start
+    today_end = day_window.today_end
     
-    # 1. Define the user's local timezone (IST)
-    try:
-        # Use 'Asia/Kolkata' for IST
-        USER_TIMEZONE = ZoneInfo("Asia/Kolkata") 
-    except Exception:
-        # Fallback if zoneinfo fails (shouldn't, but good to have)
-        USER_TIMEZONE = datetime.timezone(datetime.timedelta(hours=5, minutes=30))
-
-    # 2. Get the current time *in that timezone*
-    now_local = datetime.datetime.now(USER_TIMEZONE)
-    
-    # 3. Calculate "today" based on that local time
-    today_start = now_local.replace(hour=0, minute=0, second=0, microsecond=0)
-    today_end = today_start + datetime.timedelta(days=1)
-    
-    # 4. Filter by Date Range (show)
+    # Filter by Date Range (show)
     if show == 'today':
         query = query.filter(
             task_model.Task.due_date != None,
@@ -291,17 +296,15 @@ def read_tasks(
             task_model.Task.due_date >= today_end
         )
     elif show == 'last7days':
-        seven_days_ago = today_start - datetime.timedelta(days=7)
         query = query.filter(
             task_model.Task.due_date != None,
-            task_model.Task.due_date >= seven_days_ago,
+            task_model.Task.due_date >= day_window.days_before_today(7),
             task_model.Task.due_date < today_start
         )
     elif show == 'last28days':
-        twenty_eight_days_ago = today_start - datetime.timedelta(days=28)
         query = query.filter(
             task_model.Task.due_date != None,
-            task_model.Task.due_date >= twenty_eight_days_ago,
+            task_model.Task.due_date >= day_window.days_before_today(28),
             task_model.Task.due_date < today_start
         )
     # --- END OF FIX ---
@@ -321,11 +324,24 @@ def read_tasks(
     return tasks
 
 
+@router.get("/changes", response_model=task_schema.TaskChanges)
+def read_task_changes(
+    since: int = Query(0, ge=0, description="The 'version' returned by the previous call (0 for a full sync)."),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(auth_service.get_current_principal)
+):
+    """
+    Delta sync: returns only the tasks created, updated or deleted
+    since the client's last known version.
+    """
+    return change_service.get_task_changes(db, current_user, since)
+
+
 @router.get("/{task_id}", response_model=task_schema.TaskRead)
 def read_task(
     task_id: int,
     db: Session = Depends(get_db),
-    current_user: user_model.User = Depends(auth_service.get_current_user)
+    current_user: Principal = Depends(auth_service.get_current_principal)
 ):
     """
     Retrieve a specific task by its ID. (No changes)
@@ -395,7 +411,7 @@ def update_task(
         setattr(task, key, value)
         
     if needs_priority_recalc and task.task_metadata and "smart_suggestion" in task.task_metadata:
-        print("Clearing stale AI suggestion due to task edit.")
+        logger.debug("Clearing stale AI suggestion due to task edit.")
         task.task_metadata.pop("smart_suggestion", None)
         flag_modified(task, "task_metadata")
 
@@ -422,7 +438,9 @@ def update_task(
     if (action_type == 'logged_time' or action_type == 'completed_basic') and is_completing_task:
         log_action = 'completed'
         log_data['completion_time_minutes'] = completion_time_minutes if completion_time_minutes is not None else 0
-        gamification_service.update_gamification_stats(db=db, user=current_user)
+        unlocked_achievements = gamification_service.update_gamification_stats(db=db, user=current_user)
+        for achievement in unlocked_achievements:
+            event_service.publish(db, current_user.id, event_service.ACHIEVEMENT_UNLOCKED, achievement.model_dump())
         
     elif action_type == 'snoozed' and "due_date" in update_data:
         log_action = 'snoozed'
@@ -504,6 +522,7 @@ def delete_task(
     # --- NEW: Delete the calendar event *after* our DB is clear ---
     if event_id_to_delete:
         calendar_service.delete_calendar_event(db, current_user, event_id_to_delete)
+        db.commit() # Delivers the 'calendar.synced' push event
     # -------------------------------------------------------------
 
     return None
\ No newline at end of file
@@ -1,7 +1,7 @@
 # backend/app/core/config.py
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Annotated, Any, Literal
+from typing import Annotated, Any, Literal, Optional
 from pathlib import Path
 
 from pydantic import (
@@ -41,11 +41,29 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15 # Short-lived token
     REFRESH_TOKEN_EXPIRE_DAYS: int = 90   # Long-lived persistent token
+    # Key for the HMAC-SHA256 digest of stored refresh tokens.
+    # If unset, a key is derived from JWT_SECRET_KEY.
+    REFRESH_TOKEN_HASH_KEY: Optional[str] = None
+    # In-process cache of authenticated users (see user_cache_service)
+    AUTH_USER_CACHE_TTL_SECONDS: float = 30.0
+    AUTH_USER_CACHE_MAX_ENTRIES: int = 10000
     # -------------------------------------
     
     # --- NEW: Google OAuth Credentials ---
     GOOGLE_CLIENT_ID: str
     GOOGLE_CLIENT_SECRET: str
+    # Google endpoints (overridable to point at scripts/mock_google_api.py)
+    GOOGLE_TOKEN_URI: str = "https://oauth2.googleapis.com/token"
+    GOOGLE_API_BASE_URL: str = "https://www.googleapis.com"
+    GOOGLE_CERTS_URL: str = "https://www.googleapis.com/oauth2/v1/certs"
+    # ---------------------------------
+
+    # --- Google Calendar Pull Sync ---
+    CALENDAR_SYNC_ENABLED: bool = True
+    CALENDAR_SYNC_INTERVAL_SECONDS: int = 900  # Poll each connected user at most this often
+    # Public HTTPS URL of POST /calendar/notifications. When set, Google pushes
+    # change notifications there and users are synced right away.
+    GOOGLE_CALENDAR_WEBHOOK_URL: Optional[str] = None
     # ---------------------------------
 
     @computed_field
@@ -68,6 +86,55 @@ class Settings(BaseSettings):
     POSTGRESQL_DATABASE: str
     GEMINI_API_KEY: str
 
+    # --- Read Replica (optional) ---
+    # When set, read-only endpoints and the ML readers query this server
+    # (same database, user and password as the primary).
+    POSTGRESQL_REPLICA_SERVER: Optional[str] = None
+    POSTGRESQL_REPLICA_PORT: Optional[int] = None  # Defaults to POSTGRESQL_PORT
+    # After a user's own write, their reads stay on the primary this long,
+    # so they never see the replica's slightly older data
+    DB_REPLICA_READ_YOUR_WRITES_SECONDS: float = 5.0
+    # -------------------------------
+
+    # --- Database Connection Pool (per worker, per engine) ---
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10                 # Extra connections allowed under burst load
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0     # How long a checkout waits for a free connection
+    DB_POOL_RECYCLE_SECONDS: int = 1800       # Replace connections older than this
+    DB_POOL_PRE_PING: bool = True             # Test connections on checkout (drops dead ones)
+    DB_STATEMENT_TIMEOUT_MS: int = 30000      # Postgres cancels statements running longer
+    DB_IDLE_IN_TRANSACTION_TIMEOUT_MS: int = 60000 # ...and ends sessions idle inside a transaction
+    # ----------------------------------------------------------
+
+    # --- Logging (see core/logging_config.py) ---
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: Literal["json", "text"] = "json"   # "text" is easier to read in a local terminal
+    LOG_MODULE_LEVELS: str = ""                    # e.g. "app.services.nlp_service=DEBUG,sqlalchemy.engine=WARNING"
+    LOG_DEBUG_SAMPLE_RATE: float = 0.01            # Share of requests whose DEBUG records are kept
+    LOG_QUEUE_SIZE: int = 10000                    # Records waiting to be written; more are dropped, not waited on
+    # ---------------------------------------------
+
+    # --- Per-request Stage Timing (see core/request_timing.py) ---
+    SERVER_TIMING_ENABLED: bool = True             # Add a Server-Timing header to every response
+    SERVER_TIMING_LOG_THRESHOLD_MS: float = 2000.0 # Log the stage breakdown of requests slower than this
+    # --------------------------------------------------------------
+
+    # --- Sampling Profiler (see core/profiler.py) ---
+    # Token for the operator endpoints under /admin (X-Admin-Token header);
+    # unset = those endpoints are disabled
+    ADMIN_API_TOKEN: Optional[str] = None
+    PROFILER_SAMPLE_INTERVAL_MS: float = 5.0  # Stack snapshot interval
+    PROFILER_MAX_SECONDS: int = 60            # Longest profile, however it was started
+    PROFILER_SIGNAL_SECONDS: int = 30         # Length of a profile started with SIGUSR2
+    PROFILER_OUTPUT_DIR: str = "/tmp/profiles" # Where SIGUSR2 and automatic profiles are written
+    PROFILER_AUTO_SAMPLE_RATE: float = 0.0    # Share of requests watched for slowness (0 = off)
+    PROFILER_AUTO_THRESHOLD_MS: float = 1000.0 # A watched request still running after this gets profiled
+    # ------------------------------------------------
+
+    # --- Date Parsing (see services/date_phrase_service.py) ---
+    DATEPARSER_LANGUAGES: str = "en" # Comma-separated languages dateparser tries ("" = detect among all of them)
+    # ----------------------------------------------------------
+
     @computed_field  # type: ignore[misc]
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> PostgresDsn:
@@ -80,4 +147,30 @@ class Settings(BaseSettings):
             path=self.POSTGRESQL_DATABASE,
         )
 
+    @computed_field  # type: ignore[misc]
+    @property
+    def SQLALCHEMY_REPLICA_DATABASE_URI(self) -> Optional[PostgresDsn]:
+        if not self.POSTGRESQL_REPLICA_SERVER:
+            return None
+        return MultiHostUrl.build(
+            scheme="postgresql+psycopg2",
+            username=self.POSTGRESQL_USERNAME,
+            password=self.POSTGRESQL_PASSWORD,
+            host=self.POSTGRESQL_REPLICA_SERVER,
+            port=self.POSTGRESQL_REPLICA_PORT or self.POSTGRESQL_PORT,
+            path=self.POSTGRESQL_DATABASE,
+        )
+
+    @computed_field  # type: ignore[misc]
+    @property
+    def SQLALCHEMY_ASYNC_DATABASE_URI(self) -> PostgresDsn:
+        return MultiHostUrl.build(
+            scheme="postgresql+asyncpg",
+            username=self.POSTGRESQL_USERNAME,
+            password=self.POSTGRESQL_PASSWORD,
+            host=self.POSTGRESQL_SERVER,
+            port=self.POSTGRESQL_PORT,
+            path=self.POSTGRESQL_DATABASE,
+        )
+
 # (This file correctly does NOT create the settings instance)
\ No newline at end of file
@@ -1,12 +1,143 @@
 # backend/app/core/database.py
 
+import logging
+import threading
+import time
+from typing import Any, Dict
+
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from .config_loader import settings # <-- IMPORT CORRECTION
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+logger = logging.getLogger(__name__)
+
+# --- Configuration Constants ---
+SLOW_CHECKOUT_WARNING_SECONDS = 1.0 # Log a checkout that waited this long for a free connection
+# -------------------------------
+
+
+# --- 1. Pool Metrics ---
+# Every checkout is timed, so pool exhaustion shows up as wait time (and
+# timeouts) instead of as unexplained slow requests. See get_pool_metrics().
+
+class PoolStats:
+    """Checkout counters for one engine's pool (thread-safe)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.timeouts = 0
+
+    def record(self, waited: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+sync_pool_stats = PoolStats("sync")
+async_pool_stats = PoolStats("async")
+replica_pool_stats = PoolStats("replica")
+
+
+class _TimedPoolMixin:
+    """Times how long each checkout waited for a free connection."""
+    stats: PoolStats
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            waited = time.perf_counter() - started
+            self.stats.record(waited, timed_out=True)
+            logger.error("DB pool '%s' exhausted after %.1fs: %s", self.stats.name, waited, self.status())
+            raise
+        waited = time.perf_counter() - started
+        self.stats.record(waited, timed_out=False)
+        if waited >= SLOW_CHECKOUT_WARNING_SECONDS:
+            logger.warning("DB pool '%s' checkout waited %.2fs: %s", self.stats.name, waited, self.status())
+        return connection
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    stats = sync_pool_stats
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    stats = async_pool_stats
+
+class TimedReplicaQueuePool(_TimedPoolMixin, QueuePool):
+    stats = replica_pool_stats
+
+
+# --- 2. Engines ---
+# Each engine gets its own pool of DB_POOL_SIZE (+ DB_MAX_OVERFLOW) per
+# worker. The statement and idle-in-transaction timeouts are set on every
+# connection, so a runaway query or a request stuck mid-transaction gives
+# its connection back instead of pinning it.
+
+_POOL_ARGS: Dict[str, Any] = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
+_SERVER_SETTINGS = {
+    "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS),
+    "idle_in_transaction_session_timeout": str(settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS),
+}
+
+def _psycopg2_options(server_settings: Dict[str, str]) -> Dict[str, str]:
+    return {"options": " ".join(f"-c {key}={value}" for key, value in server_settings.items())}
+
+# --- Sync engine (psycopg2) ---
+# Used by the sync ('def') endpoints, which FastAPI runs in a thread pool,
+# by background threads (calendar sync) and by Alembic/scripts.
+
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    poolclass=TimedQueuePool,
+    connect_args=_psycopg2_options(_SERVER_SETTINGS),
+    **_POOL_ARGS
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# --- Read replica engine (psycopg2, optional) ---
+# For read-only endpoints and the ML readers, so heavy analytic queries do
+# not compete with writes for the primary's CPU. Which requests may use it
+# is decided by replica_service.get_read_db. Replica connections are
+# read-only; without a replica configured this is simply the primary.
+if settings.SQLALCHEMY_REPLICA_DATABASE_URI:
+    replica_engine = create_engine(
+        str(settings.SQLALCHEMY_REPLICA_DATABASE_URI),
+        poolclass=TimedReplicaQueuePool,
+        connect_args=_psycopg2_options({**_SERVER_SETTINGS, "default_transaction_read_only": "on"}),
+        **_POOL_ARGS
+    )
+else:
+    replica_engine = engine
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+
+# --- Async engine (asyncpg) ---
+# Used by the 'async def' endpoints, so their queries never block the event loop.
+# expire_on_commit=False: an expired attribute would need a lazy load, which
+# an AsyncSession cannot do implicitly; endpoints refresh() what they return.
+async_engine = create_async_engine(
+    str(settings.SQLALCHEMY_ASYNC_DATABASE_URI),
+    poolclass=TimedAsyncQueuePool,
+    connect_args={"server_settings": _SERVER_SETTINGS},
+    **_POOL_ARGS
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 class Base(DeclarativeBase):
     pass
 
@@ -16,4 +147,35 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# --- 3. Reading the Metrics ---
+
+def _pool_snapshot(pool: QueuePool, stats: PoolStats) -> Dict[str, float]:
+    return {
+        # Gauges
+        "size": pool.size(),
+        "in_use": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0), # QueuePool counts up from -pool_size
+        # Counters
+        "checkouts": stats.checkouts,
+        "timeouts": stats.timeouts,
+        "wait_seconds_total": round(stats.wait_seconds_total, 6),
+        "wait_seconds_max": round(stats.wait_seconds_max, 6),
+    }
+
+def get_pool_metrics() -> Dict[str, Dict[str, float]]:
+    """Current pool gauges and checkout counters of each engine (this worker only)."""
+    metrics = {
+        "sync": _pool_snapshot(engine.pool, sync_pool_stats),
+        "async": _pool_snapshot(async_engine.sync_engine.pool, async_pool_stats),
+    }
+    if replica_engine is not engine:
+        metrics["replica"] = _pool_snapshot(replica_engine.pool, replica_pool_stats)
+    return metrics
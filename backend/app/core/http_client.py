@@ -0,0 +1,40 @@
+# backend/app/core/http_client.py
+
+import asyncio
+from typing import Optional
+
+import httpx
+
+# --- Configuration Constants ---
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+HTTP_LIMITS = httpx.Limits(
+    max_connections=100,          # Per worker, across all outbound hosts
+    max_keepalive_connections=20,
+    keepalive_expiry=60,          # Seconds an idle connection is kept for reuse
+)
+# -------------------------------
+
+# --- Shared Async HTTP Client ---
+# One pooled client per worker, so outbound calls (Google Calendar, OAuth)
+# reuse open TLS connections instead of handshaking on every request.
+# It is closed in main.py's lifespan.
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    # Pooled connections belong to the loop that opened them; scripts that
+    # call asyncio.run() more than once get a fresh client per loop
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS)
+        _client_loop = loop
+    return _client
+
+async def close_http_client() -> None:
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        _client_loop = None
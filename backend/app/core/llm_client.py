@@ -0,0 +1,56 @@
+# backend/app/core/llm_client.py
+
+import logging
+from typing import Any, Dict, Optional
+
+from .config_loader import settings
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration Constants ---
+GEMINI_MODEL_NAME = 'gemini-2.5-flash-preview-09-2025'
+# -------------------------------
+
+# --- Shared Gemini Client ---
+# google.generativeai takes about a second to import, so it is imported
+# and configured once per worker, in main.py's lifespan (init_llm_client),
+# and not when the services are imported. Each service asks for its model
+# by purpose ("parse", "summary", "split"); the models are built on first
+# use and shared. Scripts that skip the lifespan get the same setup on
+# their first get_model() call.
+
+_configured = False
+_models: Dict[str, Any] = {}
+
+def init_llm_client() -> bool:
+    """Configures the Gemini API (idempotent). False if it cannot be used."""
+    global _configured
+    if _configured:
+        return True
+    try:
+        if not settings.GEMINI_API_KEY:
+            raise ValueError("GEMINI_API_KEY is not set in environment variables.")
+        import google.generativeai as genai
+        genai.configure(api_key=settings.GEMINI_API_KEY)
+        _configured = True
+        logger.info("Gemini API configured successfully.")
+    except ValueError as e:
+        logger.error("Gemini API configuration error: %s", e)
+    except Exception as e:
+        logger.critical("Failed to configure Gemini API: %s", e)
+    return _configured
+
+def get_model(purpose: str, system_instruction: Optional[str] = None) -> Optional[Any]:
+    """The shared GenerativeModel for 'purpose', or None if Gemini is not configured."""
+    model = _models.get(purpose)
+    if model is None and init_llm_client():
+        import google.generativeai as genai
+        model = _models[purpose] = genai.GenerativeModel(
+            model_name=GEMINI_MODEL_NAME,
+            system_instruction=system_instruction
+        )
+    return model
+
+def set_model(purpose: str, model: Any) -> None:
+    """Replaces the model used for 'purpose' (benchmarks use local fakes)."""
+    _models[purpose] = model
@@ -0,0 +1,245 @@
+# backend/app/core/logging_config.py
+
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import re
+import sys
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from .config_loader import settings
+
+# --- Configuration Constants ---
+REQUEST_ID_HEADER = "x-request-id"
+MAX_INCOMING_REQUEST_ID_LENGTH = 128 # Longer client-supplied ids are cut to this length
+# Chatty third-party loggers (one INFO line per outbound request, per pool
+# reset); LOG_MODULE_LEVELS can still turn them back up
+DEFAULT_MODULE_LEVELS = {
+    "httpx": "WARNING",
+    "httpcore": "WARNING",
+    "app.core.database.TimedQueuePool": "WARNING",
+    "app.core.database.TimedAsyncQueuePool": "WARNING",
+    "app.core.database.TimedReplicaQueuePool": "WARNING",
+}
+# Query parameters whose values are masked in uvicorn's access log
+REDACTED_QUERY_PARAMS = ("access_token", "ticket")
+# -------------------------------
+
+# --- Structured Logging ---
+# Every module logs through logging.getLogger(__name__). setup_logging()
+# (called first thing in main.py) sends all records through a bounded queue
+# to a background thread, which formats them as JSON lines and writes them
+# to stdout, so a request thread never waits on the log pipeline. When the
+# queue is full, records are dropped (and counted) instead of blocking.
+#
+# - LOG_LEVEL: root level; LOG_MODULE_LEVELS overrides it per logger,
+#   e.g. "app.services.nlp_service=DEBUG,sqlalchemy.engine=WARNING"
+# - LOG_DEBUG_SAMPLE_RATE: the share of requests whose DEBUG records are
+#   kept (chosen per request, so a sampled request keeps its whole trail)
+# - every record carries the request_id of the request it was logged in
+#   (RequestIdMiddleware), also sent back as the X-Request-ID header
+
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+_debug_sampled_var: contextvars.ContextVar[Optional[bool]] = contextvars.ContextVar("debug_sampled", default=None)
+
+# Attributes every LogRecord has; anything else was passed via extra={...}
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "request_id"}
+
+_SECRET_QUERY_PARAM = re.compile(r'\b((?:' + "|".join(REDACTED_QUERY_PARAMS) + r')=)[^&\s"]+')
+
+
+# --- 1. Filters and Formatter ---
+
+class RequestContextFilter(logging.Filter):
+    """Stamps the current request id onto the record, and samples DEBUG records."""
+
+    def __init__(self, debug_sample_rate: float):
+        super().__init__()
+        self.debug_sample_rate = debug_sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        if record.levelno > logging.DEBUG or self.debug_sample_rate >= 1.0:
+            return True
+        sampled = _debug_sampled_var.get()
+        if sampled is None: # Outside a request: sample each record on its own
+            sampled = random.random() < self.debug_sample_rate
+        return sampled
+
+class QuerySecretFilter(logging.Filter):
+    """Masks credentials in logged URLs (uvicorn's access log prints the full query string)."""
+
+    @staticmethod
+    def _redact(value):
+        return _SECRET_QUERY_PARAM.sub(r"\1[REDACTED]", value) if isinstance(value, str) else value
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.msg = self._redact(record.msg)
+        if isinstance(record.args, tuple):
+            record.args = tuple(self._redact(arg) for arg in record.args)
+        return True
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with the fields passed via extra={...}."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.request_id:
+            entry["request_id"] = record.request_id
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text: # Rendered by DroppingQueueHandler.prepare()
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+TEXT_FORMAT = "%(asctime)s %(levelname)-7s %(name)s [%(request_id)s] %(message)s"
+
+
+# --- 2. Non-blocking Queue Handler ---
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """A QueueHandler that never blocks: full queue -> the record is dropped."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only resolve the message here (cheap); JSON formatting happens on
+        # the listener thread. Drop the args, which may not be thread-safe
+        # to format later.
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return
+        if self.dropped:
+            with self._lock:
+                dropped, self.dropped = self.dropped, 0
+            notice = logging.LogRecord(
+                "app.logging", logging.WARNING, __file__, 0,
+                f"Log queue was full: dropped {dropped} log records.", None, None
+            )
+            notice.request_id = None
+            try:
+                self.queue.put_nowait(notice)
+            except queue.Full:
+                with self._lock:
+                    self.dropped += dropped
+
+def _parse_module_levels(spec: str) -> Dict[str, str]:
+    levels = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, level = item.split("=", 1)
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+# --- 3. Setup ---
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def setup_logging() -> None:
+    """Configures the root logger (idempotent)."""
+    global _listener
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    handler = DroppingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+    handler.addFilter(RequestContextFilter(settings.LOG_DEBUG_SAMPLE_RATE))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(settings.LOG_LEVEL.upper())
+    module_levels = {**DEFAULT_MODULE_LEVELS, **_parse_module_levels(settings.LOG_MODULE_LEVELS)}
+    for name, level in module_levels.items():
+        logging.getLogger(name).setLevel(level)
+
+    # Route uvicorn's own loggers through the same pipeline
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        logging.getLogger(name).handlers = []
+        logging.getLogger(name).propagate = True
+    logging.getLogger("uvicorn.access").addFilter(QuerySecretFilter())
+
+    _listener = logging.handlers.QueueListener(handler.queue, output, respect_handler_level=False)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+def shutdown_logging() -> None:
+    """Flushes the queue and stops the writer thread (runs at exit)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+# --- 4. Request Id Middleware ---
+
+class RequestIdMiddleware:
+    """
+    Pure ASGI middleware: takes the caller's X-Request-ID (or makes one up),
+    makes it visible to every log record of the request, decides whether
+    the request's DEBUG records are sampled, and echoes the id back.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER.encode():
+                request_id = value.decode("latin-1")[:MAX_INCOMING_REQUEST_ID_LENGTH] or None
+                break
+        request_id = request_id or uuid.uuid4().hex
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(REQUEST_ID_HEADER.encode(), request_id.encode("latin-1"))]
+            await send(message)
+
+        # Sync endpoints run in a thread pool with a copy of this context,
+        # so their records carry the id too
+        request_token = request_id_var.set(request_id)
+        sampled_token = _debug_sampled_var.set(random.random() < settings.LOG_DEBUG_SAMPLE_RATE)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _debug_sampled_var.reset(sampled_token)
+            request_id_var.reset(request_token)
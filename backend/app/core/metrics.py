@@ -0,0 +1,214 @@
+# backend/app/core/metrics.py
+
+import time
+from contextlib import ContextDecorator, contextmanager
+from typing import Iterator
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, REGISTRY
+from sqlalchemy import event
+
+from . import database, request_timing
+
+# --- Prometheus Metrics ---
+# Served on GET /metrics (see main.py). Each worker process keeps its own
+# numbers; Prometheus scrapes and sums them per instance.
+#
+# - http_*: per route (the route template, e.g. /tasks/{task_id}), from
+#   MetricsMiddleware
+# - external_call_duration_seconds: every call to Gemini, Google OAuth and
+#   Google Calendar, via track_dependency()
+# - db_query_duration_seconds: every SQL statement, per engine
+# - db_pool_*: the connection pools (database.get_pool_metrics())
+# - ml_stage_duration_seconds: the ML/NLP steps of task creation
+# - date_phrase_resolutions_total: how due-date phrases were resolved
+#   (date_phrase_service)
+#
+# The same timings also feed the current request's Server-Timing header
+# (see request_timing.py).
+
+# --- Configuration Constants ---
+# Buckets in seconds: from a cache hit up to a slow Gemini call
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+UNMATCHED_ROUTE = "<unmatched>" # Label for 404s, so unknown paths cannot explode label cardinality
+# -------------------------------
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled.",
+    ["method", "route", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time to handle an HTTP request (until the response is sent).",
+    ["method", "route"], buckets=LATENCY_BUCKETS
+)
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests being handled right now (including open event streams).",
+    ["method"] # The route is only known once the router has matched it
+)
+EXTERNAL_LATENCY = Histogram(
+    "external_call_duration_seconds", "Time spent calling an external service.",
+    ["dependency", "operation", "outcome"], buckets=LATENCY_BUCKETS
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds", "Time to execute one SQL statement.",
+    ["engine"], buckets=LATENCY_BUCKETS
+)
+ML_STAGE_LATENCY = Histogram(
+    "ml_stage_duration_seconds", "Time spent in one ML/NLP stage.",
+    ["stage"], buckets=LATENCY_BUCKETS
+)
+DATE_PHRASE_RESOLUTIONS = Counter(
+    "date_phrase_resolutions_total", "Due-date phrases resolved, by method (asap, rule or dateparser).",
+    ["method"]
+)
+
+
+# --- 1. Timing Helpers ---
+
+@contextmanager
+def track_dependency(dependency: str, operation: str) -> Iterator[None]:
+    """
+    Times a call to an external service (works around 'await' too):
+
+        with metrics.track_dependency("google_calendar", "insert_event"):
+            event = await ...
+    """
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        elapsed = time.perf_counter() - started
+        EXTERNAL_LATENCY.labels(dependency, operation, outcome).observe(elapsed)
+        request_timing.record(dependency, elapsed)
+
+class ml_stage(ContextDecorator):
+    """Times an ML stage; usable as a 'with' block or as a decorator."""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._started = 0.0
+
+    def _recreate_cm(self):
+        # A fresh timer per call of a decorated function (calls may overlap)
+        return ml_stage(self.stage)
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self._started
+        ML_STAGE_LATENCY.labels(self.stage).observe(elapsed)
+        request_timing.record(self.stage, elapsed)
+        return False
+
+
+# --- 2. HTTP Middleware ---
+
+def _route_label(scope) -> str:
+    # The router leaves the matched route in the scope (nested routers
+    # included), so the label is the route template, not the raw path
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+class MetricsMiddleware:
+    """Pure ASGI middleware (does not buffer streaming responses such as SSE)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500 # If the app raises before it starts a response
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight = HTTP_IN_FLIGHT.labels(method)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            route = _route_label(scope)
+            HTTP_LATENCY.labels(method, route).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(method, route, str(status_code)).inc()
+
+
+# --- 3. Database ---
+
+def _instrument_engine(sync_engine, name: str) -> None:
+    histogram = DB_QUERY_LATENCY.labels(name)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _stop_timer(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started_at"].pop()
+        histogram.observe(elapsed)
+        request_timing.record("db", elapsed)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _drop_timer(exception_context):
+        # A failed statement never reaches after_cursor_execute
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started_at"):
+            histogram.observe(time.perf_counter() - conn.info["query_started_at"].pop())
+
+_instrument_engine(database.engine, "primary")
+_instrument_engine(database.async_engine.sync_engine, "async")
+if database.replica_engine is not database.engine:
+    _instrument_engine(database.replica_engine, "replica")
+
+
+class _PoolCollector:
+    """Reads the pool gauges and checkout counters at scrape time."""
+
+    def collect(self):
+        gauges = {
+            name: GaugeMetricFamily(f"db_pool_{name}", help_text, labels=["pool"])
+            for name, help_text in (
+                ("size", "Configured pool size."),
+                ("in_use", "Connections checked out right now."),
+                ("idle", "Connections idle in the pool."),
+                ("overflow", "Connections open beyond the pool size."),
+            )
+        }
+        checkouts = CounterMetricFamily("db_pool_checkouts", "Connections checked out.", labels=["pool"])
+        timeouts = CounterMetricFamily("db_pool_checkout_timeouts", "Checkouts that gave up waiting.", labels=["pool"])
+        wait = CounterMetricFamily("db_pool_checkout_wait_seconds", "Total time spent waiting for a connection.", labels=["pool"])
+        wait_max = GaugeMetricFamily("db_pool_checkout_wait_max_seconds", "Longest wait for a connection.", labels=["pool"])
+
+        for pool, stats in database.get_pool_metrics().items():
+            for name, family in gauges.items():
+                family.add_metric([pool], stats[name])
+            checkouts.add_metric([pool], stats["checkouts"])
+            timeouts.add_metric([pool], stats["timeouts"])
+            wait.add_metric([pool], stats["wait_seconds_total"])
+            wait_max.add_metric([pool], stats["wait_seconds_max"])
+
+        yield from gauges.values()
+        yield from (checkouts, timeouts, wait, wait_max)
+
+REGISTRY.register(_PoolCollector())
+
+
+# --- 4. Exposition ---
+
+def render_latest() -> bytes:
+    """All metrics in the Prometheus text format."""
+    return generate_latest(REGISTRY)
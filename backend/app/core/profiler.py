@@ -0,0 +1,212 @@
+# backend/app/core/profiler.py
+
+import asyncio
+import datetime
+import logging
+import os
+import random
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+from .config_loader import settings
+from .logging_config import request_id_var
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration Constants ---
+SAMPLE_INTERVAL_SECONDS = settings.PROFILER_SAMPLE_INTERVAL_MS / 1000
+MAX_PROFILE_SECONDS = settings.PROFILER_MAX_SECONDS
+OUTPUT_DIR = Path(settings.PROFILER_OUTPUT_DIR)
+AUTO_SAMPLE_RATE = settings.PROFILER_AUTO_SAMPLE_RATE
+AUTO_THRESHOLD_SECONDS = settings.PROFILER_AUTO_THRESHOLD_MS / 1000
+MAX_STACK_DEPTH = 128
+# Long-lived streams (SSE) always outlast the threshold; never auto-profile them
+UNPROFILED_PATH_PREFIXES = ("/events/",)
+# -------------------------------
+
+# --- Sampling Profiler ---
+# A statistical profiler that can be switched on in a running worker: a
+# background thread snapshots every thread's Python stack each
+# SAMPLE_INTERVAL_SECONDS (sys._current_frames()) and counts identical
+# stacks. The result is in the "collapsed stack" format that flamegraph.pl,
+# speedscope and inferno read:
+#
+#     MainThread;run (asyncio/base_events.py:1);parse (dateparser/date.py:40) 17
+#
+# Time in C code (bcrypt, sklearn, pydantic-core) is attributed to the
+# Python function that called it. Three ways to start it:
+#
+# - POST /admin/profile?seconds=N (admin_router), returns the file
+# - SIGUSR2 to the worker: profiles PROFILER_SIGNAL_SECONDS, writes the
+#   file to PROFILER_OUTPUT_DIR (works even when the worker is too busy
+#   to answer HTTP)
+# - automatically: SlowRequestProfilerMiddleware profiles a sampled share
+#   of the requests that are still running after PROFILER_AUTO_THRESHOLD_MS
+#
+# Only one profile runs per worker at a time.
+
+
+class ProfilerBusy(Exception):
+    """Another profile is already running in this worker."""
+
+
+def _frame_label(code) -> str:
+    path = Path(code.co_filename)
+    return f"{code.co_name} ({path.parent.name}/{path.name}:{code.co_firstlineno})"
+
+class SamplingProfiler:
+    """Counts the stacks of all threads (but its own) until stop()."""
+
+    _running = threading.Lock() # One profile per process
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL_SECONDS):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        if not self._running.acquire(blocking=False):
+            raise ProfilerBusy()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self._running.release()
+        return self
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                labels = []
+                while frame is not None and len(labels) < MAX_STACK_DEPTH:
+                    labels.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                labels.append(thread_names.get(thread_id, str(thread_id)))
+                self.stacks[";".join(reversed(labels))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """The samples in collapsed-stack format, most frequent first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+# --- 1. Time-bounded Profiles ---
+
+async def profile_for(seconds: float) -> SamplingProfiler:
+    """Profiles the worker for `seconds` without blocking the event loop."""
+    profiler = SamplingProfiler().start()
+    try:
+        await asyncio.sleep(min(seconds, MAX_PROFILE_SECONDS))
+    finally:
+        profiler.stop()
+    return profiler
+
+def write_profile(profiler: SamplingProfiler, label: str) -> Path:
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = OUTPUT_DIR / f"profile-{os.getpid()}-{stamp}-{label}.collapsed"
+    path.write_text(profiler.collapsed())
+    return path
+
+
+# --- 2. Signal Trigger ---
+
+def _profile_in_background(seconds: float) -> None:
+    try:
+        profiler = SamplingProfiler().start()
+    except ProfilerBusy:
+        logger.warning("SIGUSR2 ignored: a profile is already running.")
+        return
+    time.sleep(seconds)
+    profiler.stop()
+    path = write_profile(profiler, "signal")
+    logger.info("Wrote %d-sample profile to %s", profiler.samples, path)
+
+def install_signal_handler() -> None:
+    """SIGUSR2 -> profile this worker for PROFILER_SIGNAL_SECONDS."""
+    # Signal handlers can only be set from the main thread (not, e.g., under TestClient)
+    if not hasattr(signal, "SIGUSR2") or threading.current_thread() is not threading.main_thread():
+        return
+    seconds = min(settings.PROFILER_SIGNAL_SECONDS, MAX_PROFILE_SECONDS)
+    signal.signal(signal.SIGUSR2, lambda signum, frame: threading.Thread(
+        target=_profile_in_background, args=(seconds,), name="profile-signal", daemon=True
+    ).start())
+
+
+# --- 3. Automatic Profiling of Slow Requests ---
+
+class SlowRequestProfilerMiddleware:
+    """
+    Pure ASGI middleware. For a sampled share of requests, arms a timer; if
+    the request is still running after AUTO_THRESHOLD_SECONDS, the worker
+    is profiled until it finishes (at most MAX_PROFILE_SECONDS) and the
+    profile is written to PROFILER_OUTPUT_DIR, named by request id.
+    Streaming routes (UNPROFILED_PATH_PREFIXES) are never watched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["path"].startswith(UNPROFILED_PATH_PREFIXES)
+            or random.random() >= AUTO_SAMPLE_RATE
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profiler: Optional[SamplingProfiler] = None
+        capped: Optional[asyncio.Task] = None
+
+        async def finish_profiling():
+            # Runs once: when the request ends, or at the MAX_PROFILE_SECONDS cap
+            nonlocal profiler
+            finished, profiler = profiler, None
+            if finished is None:
+                return
+            finished.stop()
+            label = request_id_var.get() or "request"
+            path = await asyncio.to_thread(write_profile, finished, label)
+            logger.info("Slow %s %s profiled (%d samples): %s", scope["method"], scope["path"], finished.samples, path)
+
+        def cap_profiling():
+            nonlocal capped
+            capped = loop.create_task(finish_profiling()) # Keep a reference until it is done
+
+        def start_profiling():
+            nonlocal profiler, cap_timer
+            try:
+                profiler = SamplingProfiler().start()
+            except ProfilerBusy:
+                return
+            cap_timer = loop.call_later(MAX_PROFILE_SECONDS, cap_profiling)
+
+        loop = asyncio.get_running_loop()
+        cap_timer: Optional[asyncio.TimerHandle] = None
+        timer = loop.call_later(AUTO_THRESHOLD_SECONDS, start_profiling)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            timer.cancel()
+            if cap_timer is not None:
+                cap_timer.cancel()
+            await finish_profiling()
+            if capped is not None:
+                await capped
@@ -0,0 +1,125 @@
+# backend/app/core/request_timing.py
+
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+from .config_loader import settings
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration Constants ---
+SLOW_REQUEST_LOG_SECONDS = settings.SERVER_TIMING_LOG_THRESHOLD_MS / 1000
+# -------------------------------
+
+# --- Per-request Stage Timing ---
+# ServerTimingMiddleware gives each request a RequestTimings recorder, and
+# the code the request runs adds time to named stages: every SQL statement
+# ("db"), every external call (by dependency: "gemini", "google_oauth",
+# "google_calendar") and every ML stage ("date_parse", "personalization",
+# "priority", ...), through the hooks in core/metrics.py, plus any
+# span("...") block. The totals go back in a Server-Timing header, e.g.
+#
+#     Server-Timing: gemini;dur=812.4, date_parse;dur=31.0, db;dur=9.8;desc="7 queries", total;dur=871.2
+#
+# which browsers show in the network panel, and requests slower than
+# SERVER_TIMING_LOG_THRESHOLD_MS are logged with the same breakdown.
+# Outside a request (or with SERVER_TIMING_ENABLED off) record() and span()
+# only do one context variable lookup.
+
+
+class RequestTimings:
+    """Total time and count per stage, in the order stages first ran."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, List[float]] = {} # name -> [seconds, count]
+
+    def add(self, name: str, seconds: float) -> None:
+        stage = self.stages.setdefault(name, [0.0, 0])
+        stage[0] += seconds
+        stage[1] += 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_dict(self) -> Dict[str, float]:
+        """Stage -> milliseconds, plus the total."""
+        breakdown = {name: round(seconds * 1000, 1) for name, (seconds, _) in self.stages.items()}
+        breakdown["total"] = round(self.elapsed() * 1000, 1)
+        return breakdown
+
+    def header_value(self) -> str:
+        entries = []
+        for name, (seconds, count) in self.stages.items():
+            entry = f"{name};dur={seconds * 1000:.1f}"
+            if name == "db":
+                entry += f';desc="{count} queries"'
+            entries.append(entry)
+        entries.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(entries)
+
+
+_current: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar("request_timings", default=None)
+
+
+# --- 1. Recording ---
+
+def record(name: str, seconds: float) -> None:
+    """Adds time to a stage of the current request (no-op outside one)."""
+    timings = _current.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Times a block as a stage of the current request."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - started)
+
+
+# --- 2. Middleware ---
+
+class ServerTimingMiddleware:
+    """Pure ASGI middleware: one recorder per request, reported in Server-Timing."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", timings.header_value().encode("latin-1"))
+                ]
+                if timings.elapsed() >= SLOW_REQUEST_LOG_SECONDS:
+                    route = getattr(scope.get("route"), "path", scope["path"])
+                    logger.warning(
+                        "Slow request: %s %s took %.0f ms (%s)",
+                        scope["method"], route, timings.elapsed() * 1000, timings.header_value(),
+                        extra={"timings_ms": timings.as_dict()}
+                    )
+            await send(message)
+
+        # Sync endpoints run in a thread pool with a copy of this context;
+        # the copy points at the same recorder
+        token = _current.set(timings)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
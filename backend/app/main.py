@@ -1,16 +1,49 @@
 # backend/app/main.py
 
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+# Set up logging before anything else is imported, so that import-time
+# messages (e.g. the Gemini setup) go through it too
+from .core.logging_config import setup_logging, RequestIdMiddleware
+setup_logging()
+
 # --- MODIFIED IMPORT ---
-from .api import auth_router, task_router, insights_router, ai_tools_router, gamification_router, summary_router
+from .api import auth_router, task_router, insights_router, ai_tools_router, gamification_router, summary_router, events_router, calendar_router, admin_router
 # ---------------------
 
+# Registers the before_flush hook that bumps users.change_version (used for ETags)
+from .services import change_service, event_service, calendar_sync_service, date_phrase_service
+from .core import http_client, llm_client, metrics, profiler, request_timing
+from .core.database import async_engine, get_pool_metrics
+from .core.config_loader import settings
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # --- Startup ---
+    http_client.get_http_client() # Open the shared outbound connection pool
+    llm_client.init_llm_client() # Import and configure Gemini once, for every service
+    profiler.install_signal_handler() # SIGUSR2 -> profile this worker
+    await asyncio.to_thread(date_phrase_service.warm_up) # Load dateparser's data before the first request
+    await event_service.event_hub.start() # LISTEN for push events from every worker
+    if settings.CALENDAR_SYNC_ENABLED:
+        await calendar_sync_service.calendar_sync_worker.start() # Pull Google Calendar changes
+    yield
+    # --- Shutdown ---
+    await calendar_sync_service.calendar_sync_worker.stop()
+    await event_service.event_hub.stop()
+    await http_client.close_http_client()
+    await async_engine.dispose()
+
+
 app = FastAPI(
     title="AI Task Manager API",
     description="The backend API for the AI-Powered Task Management System.",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # --- Define our origins ---
@@ -29,6 +62,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --- Request metrics and request ids (outermost, so they cover everything) ---
+if settings.PROFILER_AUTO_SAMPLE_RATE > 0:
+    app.add_middleware(profiler.SlowRequestProfilerMiddleware)
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(request_timing.ServerTimingMiddleware)
+app.add_middleware(metrics.MetricsMiddleware)
+app.add_middleware(RequestIdMiddleware)
+
 # --- Include Routers ---
 app.include_router(auth_router.router)
 app.include_router(task_router.router)
@@ -36,6 +77,9 @@ app.include_router(insights_router.router)
 app.include_router(ai_tools_router.router)
 app.include_router(gamification_router.router) 
 app.include_router(summary_router.router) # <-- NEW ROUTER INCLUDED
+app.include_router(events_router.router)
+app.include_router(calendar_router.router)
+app.include_router(admin_router.router)
 # ------------------------
 
 
@@ -44,4 +88,25 @@ async def read_root():
     """
     A simple root endpoint to confirm the API is running.
     """
-    return {"message": "Welcome to the AI Task Manager API! 🚀"}
\ No newline at end of file
+    return {"message": "Welcome to the AI Task Manager API! 🚀"}
+
+@app.get(
+    "/health/db-pool",
+    tags=["Root"],
+    dependencies=[Depends(admin_router.require_admin_token)],
+    include_in_schema=False
+)
+def read_db_pool_metrics():
+    """
+    This worker's DB connection pool state: connections in use, idle and
+    in overflow, plus how many checkouts had to wait (and for how long)
+    or timed out. Use it to tell pool exhaustion apart from slow queries.
+    Operators only (X-Admin-Token, like /admin).
+    """
+    return get_pool_metrics()
+
+
+@app.get("/metrics", include_in_schema=False)
+def read_metrics():
+    """Prometheus scrape endpoint (this worker's metrics)."""
+    return Response(content=metrics.render_latest(), media_type=metrics.CONTENT_TYPE)
@@ -0,0 +1,18 @@
+# backend/app/models/stream_ticket_model.py
+
+from __future__ import annotations
+import datetime
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+from ..core.database import Base
+
+class StreamTicketUse(Base):
+    """
+    Records that an event-stream ticket was redeemed, so it cannot be used
+    a second time on any worker (see auth_service.get_stream_user_id).
+    Rows are deleted once the ticket has expired anyway.
+    """
+    __tablename__ = "stream_ticket_uses"
+
+    jti: Mapped[str] = mapped_column(String(32), primary_key=True)
+    expires_at: Mapped[datetime.datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
@@ -3,13 +3,16 @@
 from __future__ import annotations
 from typing import Optional, List
 import datetime
-from sqlalchemy import Integer, String, Boolean, DateTime, Float, ForeignKey, Text
+from sqlalchemy import Integer, BigInteger, String, Boolean, DateTime, Float, ForeignKey, Text, Index
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from ..core.database import Base 
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_owner_id_change_version", "owner_id", "change_version"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String, index=True, nullable=False)
@@ -31,6 +34,11 @@ class Task(Base):
     google_calendar_event_id: Mapped[Optional[str]] = mapped_column(String, nullable=True, index=True)
     # -------------------------------------
     
+    # --- DELTA SYNC FIELD ---
+    # The owner's users.change_version at the time of this task's last write
+    change_version: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False, server_default='0')
+    # ------------------------
+
     owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
     
     # Relationships
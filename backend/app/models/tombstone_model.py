@@ -0,0 +1,29 @@
+# backend/app/models/tombstone_model.py
+
+from __future__ import annotations
+import datetime
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from ..core.database import Base
+
+class TaskTombstone(Base):
+    """
+    Records that a task was deleted, so delta-sync clients
+    (GET /tasks/changes) can drop it from their local store.
+    """
+    __tablename__ = "task_tombstones"
+    __table_args__ = (
+        Index("ix_task_tombstones_owner_id_change_version", "owner_id", "change_version"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+
+    # No FK to tasks: the task row is gone by the time we read this
+    task_id: Mapped[int] = mapped_column(nullable=False)
+    owner_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+
+    change_version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    deleted_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.datetime.now(datetime.timezone.utc)
+    )
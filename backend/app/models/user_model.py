@@ -3,7 +3,7 @@
 from __future__ import annotations
 from typing import List, Optional
 import datetime
-from sqlalchemy import Column, Integer, String, Boolean, Date, JSON, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, Date, JSON, Text, DateTime, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from ..core.database import Base 
 
@@ -42,6 +42,27 @@ class User(Base):
     last_summary_generated_at: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     # --------------------------------
 
+    # --- TIMEZONE ---
+    # IANA name used for "today"/streak day boundaries (see timezone_service)
+    timezone: Mapped[str] = mapped_column(String, default="Asia/Kolkata", nullable=False, server_default='Asia/Kolkata')
+    # ----------------
+
+    # --- CHANGE TRACKING ---
+    # Bumped on every task/log write (see change_service); used for ETags
+    change_version: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False, server_default='0')
+    # -----------------------
+
+    # --- GOOGLE CALENDAR PULL SYNC ---
+    # Google's incremental-sync cursor, when we last pulled changes, and our
+    # push-notification channel: its IDs (to stop it once it is replaced)
+    # and when it runs out (see calendar_sync_service)
+    google_calendar_sync_token: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    google_calendar_synced_at: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+    google_calendar_channel_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    google_calendar_channel_resource_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    google_calendar_channel_expires_at: Mapped[Optional[datetime.datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    # ---------------------------------
+
     # Relationships (Unchanged)
     tasks: Mapped[List["Task"]] = relationship(back_populates="owner")
     logs: Mapped[List["UserLog"]] = relationship(back_populates="user")
\ No newline at end of file
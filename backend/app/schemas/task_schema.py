@@ -47,4 +47,12 @@ class TaskRead(TaskBase):
     # smart_suggestion: Optional[Dict[str, Any]] = None
     # -------------------------------------------------
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+# --- Delta Sync Schema ---
+
+# Response for GET /tasks/changes
+class TaskChanges(BaseModel):
+    version: int  # Send this back as ?since= on the next call
+    tasks: List[TaskRead] = []  # Created or updated since the client's version
+    deleted_ids: List[int] = []  # Tombstones: remove these from the local store
@@ -18,6 +18,7 @@ class UserRead(UserBase):
     # --- NEW FIELD ---
     has_finalized_signup: bool
     # -----------------
+    timezone: str
     
     model_config = ConfigDict(from_attributes=True)
 
@@ -29,6 +30,25 @@ class UserReadWithStatus(UserRead):
     model_config = ConfigDict(from_attributes=True)
 
 
+# --- Authenticated Principal ---
+# A read-only snapshot of the logged-in user. Read endpoints use it
+# instead of a live ORM User, so it can be served from the in-process
+# user cache without touching the database.
+class Principal(BaseModel):
+    id: int
+    email: str
+    full_name: Optional[str] = None
+    is_active: bool
+    has_finalized_signup: bool
+    timezone: str
+    change_version: int
+    current_streak: int
+    longest_streak: int
+    achievements: Optional[List[str]] = None
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+
 # --- Token Schemas ---
 
 # Schema for the data hidden inside the JWT
@@ -40,6 +60,14 @@ class Token(BaseModel):
     access_token: str
     token_type: str
 
+class StreamTicket(BaseModel):
+    ticket: str      # Opens GET /events/stream?ticket=... once
+    expires_in: int  # Seconds
+
 # --- NEW SCHEMA FOR FINALIZE STEP ---
 class FinalizeSignup(BaseModel):
-    accepts_terms: bool = Field(..., description="User accepts Terms and Conditions")
\ No newline at end of file
+    accepts_terms: bool = Field(..., description="User accepts Terms and Conditions")
+
+# --- Schema for the timezone setting ---
+class TimezoneUpdate(BaseModel):
+    timezone: str = Field(..., description="IANA timezone name, e.g. 'Europe/Berlin'")
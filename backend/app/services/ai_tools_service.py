@@ -1,11 +1,13 @@
 # backend/app/services/ai_tools_service.py
 
-import google.generativeai as genai
 import json
+import logging
 from typing import List, Dict, Any
-from ..core.config_loader import settings
+from ..core import llm_client, metrics
 from ..models.task_model import Task
 
+logger = logging.getLogger(__name__)
+
 # --- Define the JSON Schema for the Splitter Output ---
 SPLITTER_JSON_SCHEMA = {
     "type": "OBJECT",
@@ -42,45 +44,32 @@ Example Output:
 }
 """
 
-# --- Configure Gemini API Client ---
-# We configure a new client here for this specific tool
-try:
-    if not settings.GEMINI_API_KEY:
-        raise ValueError("GEMINI_API_KEY is not set in environment variables.")
-    genai.configure(api_key=settings.GEMINI_API_KEY)
-    
-    gemini_model = genai.GenerativeModel(
-        model_name='gemini-2.5-flash-preview-09-2025',
-        system_instruction=SYSTEM_PROMPT  # <-- THE FIX IS HERE
-    )
-    print("✅ Gemini AI Tools Service configured successfully.")
-except Exception as e:
-    print(f"❌ CRITICAL ERROR: Failed to configure Gemini AI Tools Service: {e}")
-    gemini_model = None
-
 
 async def split_task_into_subtasks(task: Task) -> List[str]:
     """
     Uses the Gemini API to split a parent task into a list of sub-task titles.
     """
+    # The splitter's instructions are the model's system instruction
+    gemini_model = llm_client.get_model("split", system_instruction=SYSTEM_PROMPT)
     if gemini_model is None:
         raise RuntimeError("Gemini AI Tools Service is not initialized.")
 
     # Combine title and description for full context
     full_task_text = f"Title: {task.title}\nDescription: {task.description or ''}"
     
-    print(f"--- Sending to Task Splitter AI: '{full_task_text}' ---")
+    logger.debug("Sending to Task Splitter AI: %r", full_task_text)
     
     try:
-        response = await gemini_model.generate_content_async(
-            contents=full_task_text,
-            generation_config={
-                "response_mime_type": "application/json",
-                "response_schema": SPLITTER_JSON_SCHEMA
-            },
-            # <-- IT HAS BEEN REMOVED FROM HERE
-            request_options={"timeout": 60}
-        )
+        with metrics.track_dependency("gemini", "split_task"):
+            response = await gemini_model.generate_content_async(
+                contents=full_task_text,
+                generation_config={
+                    "response_mime_type": "application/json",
+                    "response_schema": SPLITTER_JSON_SCHEMA
+                },
+                # <-- IT HAS BEEN REMOVED FROM HERE
+                request_options={"timeout": 60}
+            )
         
         json_text = response.candidates[0].content.parts[0].text
         parsed_json = json.loads(json_text)
@@ -90,9 +79,9 @@ async def split_task_into_subtasks(task: Task) -> List[str]:
         if not sub_tasks:
             raise ValueError("AI failed to generate any sub-tasks.")
             
-        print(f"--- Received {len(sub_tasks)} sub-tasks from AI ---")
+        logger.debug("Received %d sub-tasks from AI", len(sub_tasks))
         return sub_tasks
 
     except Exception as e:
-        print(f"🚨 ERROR: Gemini Task Splitter call failed: {type(e).__name__} - {e}")
+        logger.error("Gemini Task Splitter call failed: %s - %s", type(e).__name__, e)
         raise RuntimeError(f"AI Task Splitter request failed: {e}")
\ No newline at end of file
@@ -1,25 +1,36 @@
 # backend/app/services/auth_service.py
 
+import asyncio
 import datetime
+import hashlib
+import hmac
+import re
+import secrets
+import time
+from functools import lru_cache
 from typing import Optional, Dict, Any, List
-from passlib.context import CryptContext
 from jose import JWTError, jwt
 from pydantic import EmailStr
-import httpx
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
-from google_auth_oauthlib.flow import Flow # <-- Still need this import
+from google.auth import jwt as google_jwt
 
 # --- Import our app's modules ---
 from ..core.config_loader import settings
 from ..models.user_model import User
-from ..schemas.user_schema import TokenData, FinalizeSignup
-from ..core.database import get_db
+from ..models.stream_ticket_model import StreamTicketUse
+from ..schemas.user_schema import TokenData, FinalizeSignup, Principal
+from ..core.database import get_db, get_async_db, AsyncSessionLocal
+from ..core.http_client import get_http_client
+from ..core import metrics
+from . import user_cache_service
 # --------------------------------
 
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
+from starlette.concurrency import run_in_threadpool
 
 # --- Re-purpose OAuth2 scheme ---
 # This will now be used to validate *our* app's JWT (the access token)
@@ -28,41 +39,90 @@ oauth2_scheme = OAuth2PasswordBearer(
     auto_error=False
 )
 
-# --- Password Hashing Setup ---
-# We still need this for ONE thing: to hash and verify our own refresh tokens.
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# --- Legacy Hashing Setup ---
+# Refresh tokens used to be stored as bcrypt hashes. We only keep bcrypt
+# to verify (and then upgrade) those old hashes; see _find_user_by_refresh_token.
+# passlib is imported on the first legacy hash, not at startup.
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # --- JWT Token Settings (from our config) ---
 SECRET_KEY = settings.JWT_SECRET_KEY
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
+STREAM_TICKET_EXPIRE_SECONDS = 30 # Long enough to open the EventSource right after asking
 
 # --- Google Scopes ---
 GOOGLE_CALENDAR_SCOPE = "https://www.googleapis.com/auth/calendar.events"
 GOOGLE_PROFILE_SCOPES = "https://www.googleapis.com/auth/userinfo.email https://www.googleapis.com/auth/userinfo.profile"
 
-# --- Password Hashing (for our refresh token) ---
-def verify_token_hash(plain_token: str, hashed_token: str) -> bool:
-    """Verifies a plain-text token against a hashed token."""
-    return pwd_context.verify(plain_token, hashed_token)
+# --- Refresh Token Hashing ---
+# Refresh tokens are long random JWTs, so a slow password hash buys nothing.
+# We store a keyed HMAC-SHA256 digest instead: it is microseconds to compute,
+# and because it is deterministic we can find the user by its value (indexed).
+REFRESH_TOKEN_HASH_PREFIX = "hmac-sha256$"
+_REFRESH_TOKEN_HASH_KEY = (
+    settings.REFRESH_TOKEN_HASH_KEY.encode("utf-8")
+    if settings.REFRESH_TOKEN_HASH_KEY
+    else hmac.new(SECRET_KEY.encode("utf-8"), b"refresh-token-hash", hashlib.sha256).digest()
+)
 
 def get_token_hash(token: str) -> str:
-    """Hashes a plain-text token."""
-    return pwd_context.hash(token)
+    """Returns the stored form of a refresh token."""
+    digest = hmac.new(_REFRESH_TOKEN_HASH_KEY, token.encode("utf-8"), hashlib.sha256).hexdigest()
+    return f"{REFRESH_TOKEN_HASH_PREFIX}{digest}"
+
+def verify_token_hash(plain_token: str, hashed_token: str) -> bool:
+    """Verifies a plain-text token against a stored hash (HMAC or legacy bcrypt)."""
+    if hashed_token.startswith(REFRESH_TOKEN_HASH_PREFIX):
+        return hmac.compare_digest(get_token_hash(plain_token), hashed_token)
+    return get_pwd_context().verify(plain_token, hashed_token)
+
+def _find_user_by_refresh_token(db: Session, token: str, user_id: int) -> Optional[User]:
+    """
+    Finds the user whose stored refresh token matches 'token'.
+    - Current hashes: one indexed lookup on the digest, then a constant-time compare.
+    - Legacy bcrypt hashes: verified once and upgraded to the HMAC form in place,
+      so each user pays the bcrypt cost on their first refresh only.
+    """
+    token_hash = get_token_hash(token)
+
+    user = db.query(User).filter(User.our_app_refresh_token == token_hash).first()
+    if user:
+        if user.id == user_id and hmac.compare_digest(user.our_app_refresh_token, token_hash):
+            return user
+        return None
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if (
+        user and 
+        user.our_app_refresh_token and
+        not user.our_app_refresh_token.startswith(REFRESH_TOKEN_HASH_PREFIX) and
+        get_pwd_context().verify(token, user.our_app_refresh_token)
+    ):
+        user.our_app_refresh_token = token_hash
+        db.add(user)
+        db.commit()
+        return user
+
+    return None
 
 # --- 1. Google Auth URL Creation (THE FIX IS HERE) ---
 def create_google_auth_url(scopes: List[str], redirect_uri: str) -> str:
     """
     Creates the Google OAuth consent screen URL using client IDs from config.
     """
+    from google_auth_oauthlib.flow import Flow # Only needed here; slow to import
     flow = Flow.from_client_config(
         client_config={
             "web": {
                 "client_id": settings.GOOGLE_CLIENT_ID,
                 "client_secret": settings.GOOGLE_CLIENT_SECRET,
                 "auth_uri": "https://accounts.google.com/o/oauth2/auth",
-                "token_uri": "https://oauth2.googleapis.com/token",
+                "token_uri": settings.GOOGLE_TOKEN_URI,
                 "redirect_uris": [redirect_uri],
             }
         },
@@ -85,10 +145,12 @@ def create_google_auth_url(scopes: List[str], redirect_uri: str) -> str:
 async def exchange_google_code_for_tokens(code: str, redirect_uri: str) -> Dict[str, Any]:
     """
     Exchanges the one-time Google auth code for Google's tokens.
+    Uses the app's shared connection pool, so back-to-back logins
+    skip the TLS handshake.
     """
-    async with httpx.AsyncClient() as client:
-        token_response = await client.post(
-            "https://oauth2.googleapis.com/token",
+    with metrics.track_dependency("google_oauth", "exchange_code"):
+        token_response = await get_http_client().post(
+            settings.GOOGLE_TOKEN_URI,
             data={
                 "code": code,
                 "client_id": settings.GOOGLE_CLIENT_ID,
@@ -97,24 +159,88 @@ async def exchange_google_code_for_tokens(code: str, redirect_uri: str) -> Dict[
                 "grant_type": "authorization_code",
             },
         )
-        token_data = token_response.json()
-        if "error" in token_data:
-            raise HTTPException(status_code=400, detail=f"Google token exchange failed: {token_data['error_description']}")
-        return token_data
+    token_data = token_response.json()
+    if "error" in token_data:
+        raise HTTPException(status_code=400, detail=f"Google token exchange failed: {token_data['error_description']}")
+    return token_data
 
 # --- 3. Get Google User Profile ---
-def get_google_user_profile(google_tokens: Dict[str, Any]) -> Dict[str, Any]:
+
+# --- Google Signing Cert Cache ---
+# Google rotates the keys that sign ID tokens every few days and says how
+# long to keep them in the Cache-Control header. We fetch them once per
+# max-age (per worker) instead of on every login.
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+CERTS_DEFAULT_TTL_SECONDS = 300 # If Google sends no usable max-age
+CERTS_MIN_REFETCH_SECONDS = 30  # Rate limit for refetches on an unknown key ID
+
+class GoogleCertCache:
+    def __init__(self, url: str):
+        self._url = url
+        self._certs: Dict[str, str] = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    @staticmethod
+    def _ttl_from_headers(headers) -> float:
+        match = re.search(r"max-age=(\d+)", headers.get("cache-control", ""))
+        if not match:
+            return CERTS_DEFAULT_TTL_SECONDS
+        try:
+            age = int(headers.get("age", 0))
+        except ValueError:
+            age = 0
+        return max(int(match.group(1)) - age, 0)
+
+    async def _refresh(self) -> None:
+        with metrics.track_dependency("google_oauth", "certs"):
+            response = await get_http_client().get(self._url)
+            response.raise_for_status()
+        self._certs = response.json()
+        self._fetched_at = time.monotonic()
+        self._expires_at = self._fetched_at + self._ttl_from_headers(response.headers)
+
+    async def get_certs(self, key_id: Optional[str] = None) -> Dict[str, str]:
+        """
+        Returns {key_id: PEM certificate}. Refetches when the cached set has
+        expired, or when it lacks 'key_id' (Google rotated its keys early).
+        Concurrent logins wait on one fetch instead of each making their own.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        def _needs_refresh() -> bool:
+            if time.monotonic() >= self._expires_at:
+                return True
+            unknown_key = key_id is not None and key_id not in self._certs
+            return unknown_key and time.monotonic() - self._fetched_at >= CERTS_MIN_REFETCH_SECONDS
+
+        if _needs_refresh():
+            async with self._lock:
+                if _needs_refresh():
+                    await self._refresh()
+        return self._certs
+
+google_certs = GoogleCertCache(settings.GOOGLE_CERTS_URL)
+
+def _verify_google_id_token(token: str, certs: Dict[str, str]) -> Dict[str, Any]:
+    """The CPU-bound part (RSA signature check); run it off the event loop."""
+    id_info = google_jwt.decode(token, certs=certs, audience=settings.GOOGLE_CLIENT_ID)
+    if id_info.get("iss") not in GOOGLE_ISSUERS:
+        raise ValueError(f"Wrong issuer: {id_info.get('iss')}")
+    return id_info
+
+async def get_google_user_profile(google_tokens: Dict[str, Any]) -> Dict[str, Any]:
     """
     Decodes the Google ID token to get the user's profile info.
     """
     try:
-        id_info = id_token.verify_oauth2_token(
-            google_tokens["id_token"],
-            google_requests.Request(),
-            settings.GOOGLE_CLIENT_ID
-        )
-        return id_info
-    except ValueError as e:
+        token = google_tokens["id_token"]
+        key_id = jwt.get_unverified_header(token).get("kid")
+        certs = await google_certs.get_certs(key_id)
+        return await run_in_threadpool(_verify_google_id_token, token, certs)
+    except (ValueError, JWTError) as e:
         raise HTTPException(status_code=401, detail=f"Invalid Google token: {e}")
 
 # --- 4. Find or Create User in *Our* DB (Refinement) ---
@@ -213,13 +339,10 @@ def refresh_app_token(db: Session, token: str) -> str:
             raise HTTPException(status_code=401, detail="Invalid token type")
         
         user_id = int(payload.get("sub"))
-        user = db.query(User).filter(User.id == user_id).first()
-        
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
         
         # Check if the token in the DB matches the one sent
-        if not user.our_app_refresh_token or not verify_token_hash(token, user.our_app_refresh_token):
+        user = _find_user_by_refresh_token(db, token, user_id)
+        if not user:
             raise HTTPException(status_code=401, detail="Refresh token does not match or has been revoked")
 
         # Issue a new *access* token
@@ -239,9 +362,9 @@ def logout_user(db: Session, token: str):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         user_id = int(payload.get("sub"))
-        user = db.query(User).filter(User.id == user_id).first()
+        user = _find_user_by_refresh_token(db, token, user_id)
         
-        if user and user.our_app_refresh_token and verify_token_hash(token, user.our_app_refresh_token):
+        if user:
             user.our_app_refresh_token = None # Invalidate the token
             db.add(user)
             db.commit()
@@ -261,17 +384,12 @@ def _create_jwt(data: dict, expires_delta: Optional[datetime.timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-# --- Get Current User (The Dependency) ---
-# This is the function that will protect all our API endpoints
-async def get_current_user(
-    request: Request,
-    db: Session = Depends(get_db)
-) -> User:
+# --- Helper: Access Token -> User ID ---
+def _decode_access_token(token: Optional[str]) -> int:
     """
-    Dependency to get the current user from our app's JWT access token.
+    Validates our app's access token and returns the user ID inside it.
+    Raises the standard 401 on any problem.
     """
-    token = await oauth2_scheme(request) # Extracts token from "Authorization: Bearer"
-    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -292,10 +410,160 @@ async def get_current_user(
         token_data = TokenData(user_id=int(user_id))
     except (JWTError, ValueError):
         raise credentials_exception
-    
-    user = db.query(User).filter(User.id == token_data.user_id).first()
+
+    return token_data.user_id
+
+# --- Helper: Load a Principal (cached) ---
+async def _load_principal(user_id: int) -> Optional[Principal]:
+    """
+    Returns the user's cached snapshot, or loads it with a short async
+    session of its own (so the lookup never holds the request's DB
+    connection, and never blocks the event loop).
+    """
+    principal = user_cache_service.user_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    generation = user_cache_service.user_cache.generation
+    async with AsyncSessionLocal() as db:
+        user = await db.get(User, user_id)
+        if user is None:
+            return None
+        principal = Principal.model_validate(user)
+
+    user_cache_service.user_cache.put(principal, generation)
+    return principal
+
+# --- Get Current Principal (Read-Only Dependency) ---
+# This is the function that will protect all our API endpoints
+async def get_current_principal(request: Request) -> Principal:
+    """
+    Dependency to get a read-only snapshot of the current user from our
+    app's JWT access token. Served from the in-process user cache, so
+    read endpoints usually cost no DB query for authentication.
+    """
+    token = await oauth2_scheme(request) # Extracts token from "Authorization: Bearer"
+    user_id = _decode_access_token(token)
+
+    principal = await _load_principal(user_id)
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # We allow them to be "current_user" so they can access the finalize-signup endpoint
+    return principal
+
+# --- Get Current User (For Endpoints That Write) ---
+def get_current_user(
+    principal: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Dependency to get the current user as a live ORM object in the
+    request's session, for endpoints that modify the user or need
+    fields the Principal does not carry (e.g. Google tokens).
+    FastAPI resolves each dependency once per request, so the token is
+    only decoded once even when the router already depends on it.
+    """
+    user = db.get(User, principal.id)
     if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+# --- Get Current User (For Async Endpoints That Write) ---
+async def get_current_user_async(
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """
+    get_current_user for 'async def' endpoints: the user is loaded into
+    the request's AsyncSession, so the endpoint can modify and commit it
+    without blocking the event loop.
+    """
+    user = await db.get(User, principal.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+# --- Stream Tickets ---
+# Browsers' EventSource cannot send headers, and a URL ends up in access
+# logs and proxy logs, so the event stream does not take the access token
+# in its query string. The client trades its access token for a ticket
+# (POST /events/ticket) and opens the stream with '?ticket=...'. A ticket
+# only opens a stream, expires after STREAM_TICKET_EXPIRE_SECONDS and
+# works once, on any worker: redeeming it inserts its id into
+# stream_ticket_uses, and a second insert of the same id finds it there.
+
+def create_stream_ticket(user_id: int) -> str:
+    return _create_jwt(
+        data={"sub": str(user_id), "type": "stream", "jti": secrets.token_hex(16)},
+        expires_delta=datetime.timedelta(seconds=STREAM_TICKET_EXPIRE_SECONDS)
+    )
+
+async def _redeem_stream_ticket(ticket: str) -> int:
+    """Returns the user ID of an unused, unexpired ticket (then marks it used); 401 otherwise."""
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        payload = jwt.decode(ticket, SECRET_KEY, algorithms=[ALGORITHM])
+        if payload.get("type") != "stream" or not payload.get("jti"):
+            raise credentials_exception
+        user_id = int(payload["sub"])
+        expires_at = datetime.datetime.fromtimestamp(payload["exp"], datetime.timezone.utc)
+    except (JWTError, KeyError, TypeError, ValueError):
         raise credentials_exception
-    
-    # We allow them to be "current_user" so they can access the finalize-signup endpoint
-    return user
\ No newline at end of file
+
+    async with AsyncSessionLocal() as db:
+        # Expired tickets are rejected by jwt.decode, so their rows can go
+        await db.execute(delete(StreamTicketUse).where(
+            StreamTicketUse.expires_at < datetime.datetime.now(datetime.timezone.utc)
+        ))
+        first_use = await db.scalar(
+            pg_insert(StreamTicketUse)
+            .values(jti=payload["jti"], expires_at=expires_at)
+            .on_conflict_do_nothing()
+            .returning(StreamTicketUse.jti)
+        )
+        await db.commit()
+    if first_use is None:
+        raise credentials_exception
+    return user_id
+
+# --- Get Current User ID for Long-Lived Streams ---
+async def get_stream_user_id(
+    request: Request,
+    ticket: Optional[str] = None
+) -> int:
+    """
+    Like get_current_user, but for event streams:
+    - The caller authenticates with the Authorization header or, from a
+      browser's EventSource, with a single-use '?ticket=' (see above).
+    - It never takes the request's DB session (the lookup uses the user
+      cache, or its own short session), so an open stream does not hold a
+      pooled DB connection for its whole lifetime.
+    """
+    token = await oauth2_scheme(request)
+    user_id = _decode_access_token(token) if token or not ticket else await _redeem_stream_ticket(ticket)
+
+    principal = await _load_principal(user_id)
+    if principal is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user_id
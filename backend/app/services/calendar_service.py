@@ -1,56 +1,189 @@
 # backend/app/services/calendar_service.py
 
 import datetime
-from typing import Optional, Dict, Any
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Dict, Any, Awaitable, Callable, List, Literal, Tuple
 
 # --- Google API Imports ---
+import httplib2
+import requests
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build, Resource
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.errors import HttpError
 from google.auth.transport.requests import Request as GoogleAuthRequest
+# googleapiclient's discovery and http modules are slow to import; they are
+# imported where the API client is built and where batches are sent
+if TYPE_CHECKING:
+    from googleapiclient.discovery import Resource
+    from googleapiclient.http import HttpRequest
 # --------------------------
 
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from ..core.config_loader import settings
+from ..core import metrics
 from ..models.user_model import User
 from ..models.task_model import Task
+from . import event_service, google_calendar_client
+from .google_calendar_client import BatchCall, CalendarAPIError
+
+logger = logging.getLogger(__name__)
 
 # This is the scope our tokens will have
 CALENDAR_SCOPE = ['https://www.googleapis.com/auth/calendar.events']
 
+# --- Configuration Constants ---
+CREDENTIALS_CACHE_MAX_USERS = 1000 # Per worker; least recently used users are dropped first
+BATCH_MAX_OPERATIONS = google_calendar_client.BATCH_MAX_CALLS
+DEFAULT_EVENT_DESCRIPTION = "Created by AI Task Manager" # Used when a task has no description
+# -------------------------------
+
+
+# --- 1. Shared Transports & Client ---
+# Token refreshes go through one pooled requests.Session. API calls use an
+# httplib2.Http per thread (httplib2 is not thread-safe, and sync endpoints
+# run in a thread pool), which keeps its connection to Google alive.
+
+_token_transport = GoogleAuthRequest(session=requests.Session())
+_thread_local = threading.local()
+
+def _get_thread_http() -> httplib2.Http:
+    http = getattr(_thread_local, "http", None)
+    if http is None:
+        http = _thread_local.http = httplib2.Http(timeout=30)
+    return http
+
+@lru_cache(maxsize=1)
+def _get_calendar_service() -> "Resource":
+    """
+    Builds the Google Calendar API service object once per process, from the
+    discovery document bundled with the client library (no network call).
+    It holds no credentials: each request is executed with the user's own
+    authorized transport (see _execute).
+    """
+    from googleapiclient.discovery import build # Slow to import; only the sync API path needs it
+    return build(
+        'calendar', 'v3',
+        http=httplib2.Http(),
+        cache_discovery=False,
+        static_discovery=True,
+        client_options={"api_endpoint": f"{settings.GOOGLE_API_BASE_URL}{google_calendar_client.CALENDAR_API_PATH}/"}
+    )
+
+def _execute(request: "HttpRequest", creds: Credentials) -> Dict[str, Any]:
+    """Runs a Calendar API request as the user these credentials belong to."""
+    # methodId is e.g. 'calendar.events.insert'
+    with metrics.track_dependency("google_calendar", request.methodId.removeprefix("calendar.")):
+        return request.execute(http=AuthorizedHttp(creds, http=_get_thread_http()))
+
+
+# --- 2. Per-User Access Token Cache ---
+# An access token is valid for about an hour, so we keep each user's
+# Credentials around and only call oauth2.googleapis.com once it is
+# (nearly) expired, instead of on every create/update/delete.
+
+_creds_cache: "OrderedDict[int, Tuple[str, Credentials]]" = OrderedDict()
+_creds_lock = threading.Lock()
+_token_stats = {"refreshes": 0, "refreshes_avoided": 0}
+
+def get_token_cache_stats() -> Dict[str, int]:
+    """Token refreshes made vs. avoided by this worker since it started."""
+    with _creds_lock:
+        return {**_token_stats, "cached_users": len(_creds_cache)}
+
+def forget_google_creds(user_id: int) -> None:
+    with _creds_lock:
+        _creds_cache.pop(user_id, None)
+
+def _get_cached_creds(user: User) -> Optional[Credentials]:
+    """Returns the user's cached Credentials if their access token is still good."""
+    with _creds_lock:
+        cached = _creds_cache.get(user.id)
+        # A new refresh token (the user re-connected Google) invalidates the entry
+        if cached is None or cached[0] != user.google_oauth_refresh_token:
+            return None
+        _creds_cache.move_to_end(user.id)
+        creds = cached[1]
+        # 'valid' is False a few minutes *before* expiry, so we never send a token about to lapse
+        if not creds.valid:
+            return None
+        _token_stats["refreshes_avoided"] += 1
+        return creds
+
+def _remember_creds(user: User, creds: Credentials) -> None:
+    with _creds_lock:
+        _token_stats["refreshes"] += 1
+        _creds_cache[user.id] = (user.google_oauth_refresh_token, creds)
+        _creds_cache.move_to_end(user.id)
+        while len(_creds_cache) > CREDENTIALS_CACHE_MAX_USERS:
+            _creds_cache.popitem(last=False)
+        avoided = _token_stats["refreshes_avoided"]
+
+    logger.info("User %s: Refreshed Google access token (%s refreshes avoided so far).", user.id, avoided)
+
+def _build_creds(user: User, token: Optional[str] = None, expiry: Optional[datetime.datetime] = None) -> Credentials:
+    return Credentials(
+        token=token,  # None means "use the refresh token to get one"
+        expiry=expiry,
+        refresh_token=user.google_oauth_refresh_token,
+        token_uri=settings.GOOGLE_TOKEN_URI,
+        client_id=settings.GOOGLE_CLIENT_ID,
+        client_secret=settings.GOOGLE_CLIENT_SECRET,
+        scopes=CALENDAR_SCOPE
+    )
+
 def _get_google_creds(user: User) -> Optional[Credentials]:
     """
-    Helper function to build Google Credentials from a user's stored
-    refresh token. Returns None if the user has no token.
+    Returns Google Credentials with a valid access token for the user,
+    refreshing it only when needed. Returns None if the user has no token
+    or the refresh fails.
     """
     if not user.google_oauth_refresh_token:
-        print(f"User {user.id} has no Google refresh token. Skipping calendar sync.")
+        logger.info("User %s has no Google refresh token. Skipping calendar sync.", user.id)
         return None
-        
+
+    creds = _get_cached_creds(user)
+    if creds:
+        return creds
+
     try:
-        creds = Credentials(
-            token=None,  # No access token, we will use the refresh token
-            refresh_token=user.google_oauth_refresh_token,
-            token_uri="https://oauth2.googleapis.com/token",
-            client_id=settings.GOOGLE_CLIENT_ID,
-            client_secret=settings.GOOGLE_CLIENT_SECRET,
-            scopes=CALENDAR_SCOPE
-        )
-        
+        creds = _build_creds(user)
         # We must "refresh" the credentials to get a new, short-lived access token
-        if not creds.valid or creds.expired:
-            creds.refresh(GoogleAuthRequest())
-            
-        return creds
+        with metrics.track_dependency("google_oauth", "refresh_token"):
+            creds.refresh(_token_transport)
     except Exception as e:
-        print(f"🚨 Error refreshing Google credentials for user {user.id}: {e}")
+        logger.error("Error refreshing Google credentials for user %s: %s", user.id, e)
         # This can happen if the user revoked access.
+        forget_google_creds(user.id)
+        return None
+
+    _remember_creds(user, creds)
+    return creds
+
+async def _get_google_creds_async(user: User) -> Optional[Credentials]:
+    """Non-blocking _get_google_creds (the refresh goes through httpx)."""
+    if not user.google_oauth_refresh_token:
+        logger.info("User %s has no Google refresh token. Skipping calendar sync.", user.id)
         return None
 
-def _get_calendar_service(creds: Credentials) -> Resource:
-    """Builds the Google Calendar API service object."""
-    # cache_discovery=False is recommended in production environments
-    return build('calendar', 'v3', credentials=creds, cache_discovery=False)
+    creds = _get_cached_creds(user)
+    if creds:
+        return creds
+
+    try:
+        token, expiry = await google_calendar_client.refresh_access_token(user.google_oauth_refresh_token)
+    except Exception as e:
+        logger.error("Error refreshing Google credentials for user %s: %s", user.id, e)
+        forget_google_creds(user.id)
+        return None
+
+    creds = _build_creds(user, token=token, expiry=expiry)
+    _remember_creds(user, creds)
+    return creds
 
 def _create_event_body(task: Task) -> Dict[str, Any]:
     """
@@ -72,11 +205,11 @@ def _create_event_body(task: Task) -> Dict[str, Any]:
     # 3. Calculate start time (30 mins before) and format it
     start_time = (task.due_date - datetime.timedelta(minutes=30)).isoformat()
     
-    print(f"--- Creating event body with timezone: {tz_name} ---")
+    logger.debug("Creating event body with timezone: %s", tz_name)
     
     event_body = {
         'summary': task.title,
-        'description': task.description or "Created by AI Task Manager",
+        'description': task.description or DEFAULT_EVENT_DESCRIPTION,
         'start': {
             'dateTime': start_time,
             'timeZone': tz_name, # Use the dynamic timezone
@@ -92,6 +225,26 @@ def _create_event_body(task: Task) -> Dict[str, Any]:
     return event_body
     # -----------------------
 
+def _publish_sync_completed(
+    db: Session,
+    user: User,
+    operation: str,
+    event_id: Optional[str],
+    task_id: Optional[int] = None
+) -> None:
+    """
+    Pushes a 'calendar.synced' event to the user's open streams.
+    It is delivered when the caller commits; a push failure never fails the sync.
+    """
+    try:
+        event_service.publish(db, user.id, event_service.CALENDAR_SYNCED, {
+            "operation": operation,
+            "task_id": task_id,
+            "google_calendar_event_id": event_id,
+        })
+    except Exception as e:
+        logger.warning("Could not publish calendar sync event for user %s: %s", user.id, e)
+
 # --- PUBLIC SERVICE FUNCTIONS ---
 
 def create_calendar_event(db: Session, user: User, task: Task) -> Optional[str]:
@@ -107,20 +260,21 @@ def create_calendar_event(db: Session, user: User, task: Task) -> Optional[str]:
         return None # User has no token or it failed to refresh
 
     try:
-        service = _get_calendar_service(creds)
+        service = _get_calendar_service()
         event_body = _create_event_body(task)
         
         # 'primary' is the user's main calendar
-        event = service.events().insert(calendarId='primary', body=event_body).execute()
+        event = _execute(service.events().insert(calendarId='primary', body=event_body), creds)
         
         event_id = event.get('id')
-        print(f"✅ User {user.id}: Created Google Calendar event {event_id} for task {task.id}")
+        logger.info("User %s: Created Google Calendar event %s for task %s", user.id, event_id, task.id)
+        _publish_sync_completed(db, user, "created", event_id, task.id)
         return event_id
         
     except HttpError as e:
-        print(f"🚨 User {user.id}: Failed to create calendar event for task {task.id}. Error: {e}")
+        logger.error("User %s: Failed to create calendar event for task %s. Error: %s", user.id, task.id, e)
     except Exception as e:
-        print(f"🚨 User {user.id}: An unexpected error occurred in create_calendar_event: {e}")
+        logger.error("User %s: An unexpected error occurred in create_calendar_event: %s", user.id, e)
     
     return None
 
@@ -142,31 +296,32 @@ def update_calendar_event(db: Session, user: User, task: Task) -> Optional[str]:
         
     # If the task doesn't have an event ID, create a new event
     if not task.google_calendar_event_id:
-        print(f"User {user.id}: Task {task.id} has no event_id. Calling create_calendar_event.")
+        logger.info("User %s: Task %s has no event_id. Calling create_calendar_event.", user.id, task.id)
         return create_calendar_event(db, user, task)
 
     try:
-        service = _get_calendar_service(creds)
+        service = _get_calendar_service()
         event_body = _create_event_body(task)
         
-        event = service.events().update(
+        event = _execute(service.events().update(
             calendarId='primary', 
             eventId=task.google_calendar_event_id, 
             body=event_body
-        ).execute()
+        ), creds)
         
         event_id = event.get('id')
-        print(f"✅ User {user.id}: Updated Google Calendar event {event_id} for task {task.id}")
+        logger.info("User %s: Updated Google Calendar event %s for task %s", user.id, event_id, task.id)
+        _publish_sync_completed(db, user, "updated", event_id, task.id)
         return event_id
 
     except HttpError as e:
         if e.resp.status == 404:
             # The event was deleted in Google Calendar. Create a new one.
-            print(f"User {user.id}: Event {task.google_calendar_event_id} not found. Creating a new one.")
+            logger.info("User %s: Event %s not found. Creating a new one.", user.id, task.google_calendar_event_id)
             return create_calendar_event(db, user, task)
-        print(f"🚨 User {user.id}: Failed to update calendar event for task {task.id}. Error: {e}")
+        logger.error("User %s: Failed to update calendar event for task %s. Error: %s", user.id, task.id, e)
     except Exception as e:
-        print(f"🚨 User {user.id}: An unexpected error occurred in update_calendar_event: {e}")
+        logger.error("User %s: An unexpected error occurred in update_calendar_event: %s", user.id, e)
     
     return task.google_calendar_event_id # Return the old ID if update failed
 
@@ -183,20 +338,424 @@ def delete_calendar_event(db: Session, user: User, google_calendar_event_id: str
         return
 
     try:
-        service = _get_calendar_service(creds)
+        service = _get_calendar_service()
         
-        service.events().delete(
+        _execute(service.events().delete(
             calendarId='primary', 
             eventId=google_calendar_event_id
-        ).execute()
+        ), creds)
         
-        print(f"✅ User {user.id}: Deleted Google Calendar event {google_calendar_event_id}")
+        logger.info("User %s: Deleted Google Calendar event %s", user.id, google_calendar_event_id)
+        _publish_sync_completed(db, user, "deleted", google_calendar_event_id)
         
     except HttpError as e:
         if e.resp.status == 404:
             # Event is already gone, which is fine
-            print(f"User {user.id}: Event {google_calendar_event_id} was already deleted.")
+            logger.info("User %s: Event %s was already deleted.", user.id, google_calendar_event_id)
+        else:
+            logger.error("User %s: Failed to delete calendar event. Error: %s", user.id, e)
+    except Exception as e:
+        logger.error("User %s: An unexpected error occurred in delete_calendar_event: %s", user.id, e)
+
+
+# --- READING CHANGES (used by calendar_sync_service) ---
+
+class SyncTokenExpired(Exception):
+    """Google no longer accepts the sync token (HTTP 410); a full sync is needed."""
+
+def list_event_changes(creds: Credentials, sync_token: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Returns (events, next_sync_token) for the user's primary calendar.
+    With a sync token only the events changed since it was issued are
+    returned (deleted ones with status 'cancelled'); without one, this is
+    the initial full listing.
+    """
+    service = _get_calendar_service()
+    events: List[Dict[str, Any]] = []
+    page_token = None
+
+    while True:
+        params: Dict[str, Any] = {"calendarId": "primary", "maxResults": 250, "pageToken": page_token}
+        if sync_token:
+            params["syncToken"] = sync_token
+            params["showDeleted"] = True
+        try:
+            page = _execute(service.events().list(**params), creds)
+        except HttpError as e:
+            if e.resp.status == 410:
+                raise SyncTokenExpired() from e
+            raise
+
+        events.extend(page.get("items", []))
+        page_token = page.get("nextPageToken")
+        if not page_token:
+            return events, page.get("nextSyncToken")
+
+@dataclass
+class WatchChannel:
+    """A push-notification channel on a user's primary calendar."""
+    id: str
+    resource_id: str # Google's ID for the watched calendar; needed to stop the channel
+    expires_at: Optional[datetime.datetime] # Google caps a channel at about a week
+
+def watch_calendar_events(creds: Credentials, channel_id: str, address: str, token: str) -> WatchChannel:
+    """Asks Google to POST to 'address' whenever the primary calendar changes."""
+    channel = _execute(_get_calendar_service().events().watch(
+        calendarId='primary',
+        body={"id": channel_id, "type": "web_hook", "address": address, "token": token}
+    ), creds)
+    expiration_ms = channel.get("expiration")
+    return WatchChannel(
+        id=channel.get("id", channel_id),
+        resource_id=channel["resourceId"],
+        expires_at=datetime.datetime.fromtimestamp(int(expiration_ms) / 1000, tz=datetime.timezone.utc) if expiration_ms else None
+    )
+
+def stop_watch_channel(creds: Credentials, channel_id: str, resource_id: str) -> None:
+    """Tells Google to stop sending notifications for a channel."""
+    _execute(_get_calendar_service().channels().stop(body={"id": channel_id, "resourceId": resource_id}), creds)
+
+
+# --- ASYNC SERVICE FUNCTIONS ---
+# The same three operations for async routes. They go through
+# google_calendar_client (httpx) and take the route's AsyncSession, so
+# they never block the event loop.
+
+async def _call_async(user: User, creds: Credentials, call: Callable[[str], Awaitable[Any]]) -> Any:
+    """Runs call(access_token), retrying once with a fresh token on a 401."""
+    try:
+        return await call(creds.token)
+    except CalendarAPIError as e:
+        if e.status_code != 401:
+            raise
+        # The access token was revoked before its expiry; get a new one
+        forget_google_creds(user.id)
+        creds = await _get_google_creds_async(user)
+        if not creds:
+            raise
+        return await call(creds.token)
+
+async def create_calendar_event_async(db: AsyncSession, user: User, task: Task) -> Optional[str]:
+    """
+    Creates a new Google Calendar event for a task.
+    Returns the new event_id if successful.
+    """
+    if not task.due_date:
+        return None
+
+    creds = await _get_google_creds_async(user)
+    if not creds:
+        return None
+
+    try:
+        event_body = _create_event_body(task)
+        event = await _call_async(user, creds, lambda token: google_calendar_client.insert_event(token, event_body))
+
+        event_id = event.get('id')
+        logger.info("User %s: Created Google Calendar event %s for task %s", user.id, event_id, task.id)
+        await db.run_sync(_publish_sync_completed, user, "created", event_id, task.id)
+        return event_id
+
+    except CalendarAPIError as e:
+        logger.error("User %s: Failed to create calendar event for task %s. Error: %s", user.id, task.id, e)
+    except Exception as e:
+        logger.error("User %s: An unexpected error occurred in create_calendar_event_async: %s", user.id, e)
+
+    return None
+
+async def update_calendar_event_async(db: AsyncSession, user: User, task: Task) -> Optional[str]:
+    """
+    Updates an existing Google Calendar event.
+    If no event ID exists, it tries to create one.
+    """
+    if not task.due_date:
+        if task.google_calendar_event_id:
+            return await delete_calendar_event_async(db, user, task.google_calendar_event_id)
+        return None
+
+    creds = await _get_google_creds_async(user)
+    if not creds:
+        return None
+
+    if not task.google_calendar_event_id:
+        logger.info("User %s: Task %s has no event_id. Calling create_calendar_event_async.", user.id, task.id)
+        return await create_calendar_event_async(db, user, task)
+
+    try:
+        event_body = _create_event_body(task)
+        event = await _call_async(
+            user, creds,
+            lambda token: google_calendar_client.update_event(token, task.google_calendar_event_id, event_body)
+        )
+
+        event_id = event.get('id')
+        logger.info("User %s: Updated Google Calendar event %s for task %s", user.id, event_id, task.id)
+        await db.run_sync(_publish_sync_completed, user, "updated", event_id, task.id)
+        return event_id
+
+    except CalendarAPIError as e:
+        if e.status_code == 404:
+            logger.info("User %s: Event %s not found. Creating a new one.", user.id, task.google_calendar_event_id)
+            return await create_calendar_event_async(db, user, task)
+        logger.error("User %s: Failed to update calendar event for task %s. Error: %s", user.id, task.id, e)
+    except Exception as e:
+        logger.error("User %s: An unexpected error occurred in update_calendar_event_async: %s", user.id, e)
+
+    return task.google_calendar_event_id
+
+async def delete_calendar_event_async(db: AsyncSession, user: User, google_calendar_event_id: str) -> None:
+    """
+    Deletes an event from the user's Google Calendar.
+    Returns None.
+    """
+    if not google_calendar_event_id:
+        return
+
+    creds = await _get_google_creds_async(user)
+    if not creds:
+        return
+
+    try:
+        await _call_async(user, creds, lambda token: google_calendar_client.delete_event(token, google_calendar_event_id))
+        logger.info("User %s: Deleted Google Calendar event %s", user.id, google_calendar_event_id)
+        await db.run_sync(_publish_sync_completed, user, "deleted", google_calendar_event_id)
+
+    except CalendarAPIError as e:
+        if e.status_code == 404:
+            logger.info("User %s: Event %s was already deleted.", user.id, google_calendar_event_id)
         else:
-            print(f"🚨 User {user.id}: Failed to delete calendar event. Error: {e}")
+            logger.error("User %s: Failed to delete calendar event. Error: %s", user.id, e)
     except Exception as e:
-        print(f"🚨 User {user.id}: An unexpected error occurred in delete_calendar_event: {e}")
\ No newline at end of file
+        logger.error("User %s: An unexpected error occurred in delete_calendar_event_async: %s", user.id, e)
+
+
+# --- BATCH OPERATIONS ---
+# Bulk changes (e.g. splitting a task into sub-tasks) send their calendar
+# calls through Google's batch endpoint: up to BATCH_MAX_OPERATIONS calls
+# share one HTTP round-trip, and each call still succeeds or fails on its own.
+
+@dataclass
+class CalendarOperation:
+    """One calendar change to make for a task (or a bare event ID, for deletes)."""
+    action: Literal["create", "update", "delete"]
+    task: Optional[Task] = None
+    event_id: Optional[str] = None # Only needed for deletes; creates/updates use the task's
+
+@dataclass
+class CalendarOperationResult:
+    operation: CalendarOperation
+    ok: bool
+    # The event ID the task should keep, with the same meaning as the return
+    # values of create/update_calendar_event (None after a delete)
+    event_id: Optional[str] = None
+    error: Optional[str] = None
+
+def _plan_operation(operation: CalendarOperation) -> Tuple[str, Optional[str]]:
+    """
+    Resolves what an operation really needs to do (the same rules as the
+    single-event functions above). Returns (action, event_id) where action is
+    'insert', 'update', 'delete' or 'skip'.
+    """
+    task = operation.task
+    if operation.action == "delete":
+        event_id = operation.event_id or (task.google_calendar_event_id if task else None)
+        return ("delete", event_id) if event_id else ("skip", None)
+
+    if task is None:
+        raise ValueError(f"A '{operation.action}' calendar operation needs a task.")
+    if not task.due_date:
+        # Removing a due date removes the event
+        if operation.action == "update" and task.google_calendar_event_id:
+            return "delete", task.google_calendar_event_id
+        return "skip", None
+    if operation.action == "update" and task.google_calendar_event_id:
+        return "update", task.google_calendar_event_id
+    return "insert", None
+
+def _error_status(exception: Optional[Exception]) -> Optional[int]:
+    if isinstance(exception, HttpError):
+        return exception.resp.status
+    if isinstance(exception, CalendarAPIError):
+        return exception.status_code
+    return None
+
+def _batch_call(action: str, event_id: Optional[str], task: Optional[Task]) -> BatchCall:
+    if action == "insert":
+        return BatchCall("POST", google_calendar_client.events_path(), _create_event_body(task))
+    if action == "update":
+        return BatchCall("PUT", google_calendar_client.events_path(event_id), _create_event_body(task))
+    return BatchCall("DELETE", google_calendar_client.events_path(event_id))
+
+def _run_batch(
+    service: "Resource",
+    creds: Credentials,
+    calls: List[Tuple[int, str, Optional[str], Optional[Task]]]
+) -> Dict[int, Tuple[Optional[Dict[str, Any]], Optional[Exception]]]:
+    """
+    Sends (index, action, event_id, task) calls in batches of
+    BATCH_MAX_OPERATIONS. Returns {index: (response, exception)}.
+    """
+    outcomes: Dict[int, Tuple[Optional[Dict[str, Any]], Optional[Exception]]] = {}
+
+    def _on_response(request_id: str, response, exception) -> None:
+        outcomes[int(request_id)] = (response, exception)
+
+    from googleapiclient.http import BatchHttpRequest
+
+    for start in range(0, len(calls), BATCH_MAX_OPERATIONS):
+        chunk = calls[start:start + BATCH_MAX_OPERATIONS]
+        batch = BatchHttpRequest(
+            callback=_on_response,
+            batch_uri=settings.GOOGLE_API_BASE_URL + google_calendar_client.BATCH_PATH
+        )
+        for index, action, event_id, task in chunk:
+            if action == "insert":
+                request = service.events().insert(calendarId='primary', body=_create_event_body(task))
+            elif action == "update":
+                request = service.events().update(calendarId='primary', eventId=event_id, body=_create_event_body(task))
+            else:
+                request = service.events().delete(calendarId='primary', eventId=event_id)
+            batch.add(request, request_id=str(index))
+
+        try:
+            with metrics.track_dependency("google_calendar", "batch"):
+                batch.execute(http=AuthorizedHttp(creds, http=_get_thread_http()))
+        except Exception as e:
+            # The batch request itself failed, so none of its calls ran
+            for index, _, _, _ in chunk:
+                outcomes.setdefault(index, (None, e))
+
+    return outcomes
+
+async def _run_batch_async(
+    user: User,
+    creds: Credentials,
+    calls: List[Tuple[int, str, Optional[str], Optional[Task]]]
+) -> Dict[int, Tuple[Optional[Dict[str, Any]], Optional[Exception]]]:
+    """Non-blocking _run_batch, over the shared httpx client."""
+    outcomes: Dict[int, Tuple[Optional[Dict[str, Any]], Optional[Exception]]] = {}
+
+    for start in range(0, len(calls), BATCH_MAX_OPERATIONS):
+        chunk = calls[start:start + BATCH_MAX_OPERATIONS]
+        batch_calls = [_batch_call(action, event_id, task) for _, action, event_id, task in chunk]
+        try:
+            chunk_outcomes = await _call_async(
+                user, creds, lambda token: google_calendar_client.batch(token, batch_calls)
+            )
+        except Exception as e:
+            chunk_outcomes = [(None, e)] * len(chunk)
+        for (index, _, _, _), outcome in zip(chunk, chunk_outcomes):
+            outcomes[index] = outcome
+
+    return outcomes
+
+def _prepare_batch(
+    operations: List[CalendarOperation]
+) -> Tuple[List[CalendarOperationResult], List[Tuple[int, str, Optional[str], Optional[Task]]]]:
+    """Plans every operation; ones with nothing to do (e.g. no due date) succeed as-is."""
+    results = [CalendarOperationResult(operation=op, ok=False) for op in operations]
+    calls = []
+    for index, operation in enumerate(operations):
+        action, event_id = _plan_operation(operation)
+        if action == "skip":
+            results[index].ok = True
+        else:
+            calls.append((index, action, event_id, operation.task))
+    return results, calls
+
+def _fail_without_creds(results: List[CalendarOperationResult], calls) -> List[CalendarOperationResult]:
+    for index, _, _, task in calls:
+        results[index].event_id = task.google_calendar_event_id if task else None
+        results[index].error = "No valid Google credentials"
+    return results
+
+def _apply_outcomes(
+    db: Session,
+    user: User,
+    calls,
+    outcomes,
+    results: List[CalendarOperationResult],
+    retry_missing_updates: bool = True
+) -> List[Tuple[int, str, Optional[str], Optional[Task]]]:
+    """
+    Records each call's outcome on its result and publishes the sync events.
+    Returns the updates whose event was gone (404), to be re-created.
+    """
+    recreate = []
+    for index, action, event_id, task in calls:
+        response, exception = outcomes.get(index, (None, RuntimeError("No response in batch")))
+        result = results[index]
+        not_found = _error_status(exception) == 404
+
+        if exception is None or (action == "delete" and not_found):
+            # A delete of an event that is already gone is fine
+            result.ok = True
+            result.event_id = (response or {}).get('id') if action != "delete" else None
+            _publish_sync_completed(
+                db, user,
+                {"insert": "created", "update": "updated", "delete": "deleted"}[action],
+                result.event_id or event_id,
+                task.id if task else None
+            )
+        elif action == "update" and not_found and retry_missing_updates:
+            # The event was deleted in Google Calendar. Create a new one.
+            recreate.append((index, "insert", None, task))
+        else:
+            logger.error("User %s: Batched calendar %s failed for task %s. Error: %s", user.id, action, task.id if task else '-', exception)
+            result.error = str(exception)
+            # Like update_calendar_event, keep the old ID if an update failed
+            result.event_id = event_id if action != "insert" and not not_found else None
+    return recreate
+
+def _log_batch_summary(user: User, calls, results: List[CalendarOperationResult]) -> None:
+    succeeded = sum(1 for result in results if result.ok)
+    logger.info("User %s: Batched %s calendar calls (%s/%s operations succeeded).", user.id, len(calls), succeeded, len(results))
+
+def batch_calendar_operations(
+    db: Session,
+    user: User,
+    operations: List[CalendarOperation]
+) -> List[CalendarOperationResult]:
+    """
+    Applies many calendar changes for one user with as few HTTP requests
+    as possible. Returns one result per operation, in the same order.
+    A failed operation never fails the others.
+    """
+    results, calls = _prepare_batch(operations)
+    if not calls:
+        return results
+
+    creds = _get_google_creds(user)
+    if not creds:
+        return _fail_without_creds(results, calls)
+
+    service = _get_calendar_service()
+    recreate = _apply_outcomes(db, user, calls, _run_batch(service, creds, calls), results)
+    if recreate:
+        _apply_outcomes(db, user, recreate, _run_batch(service, creds, recreate), results, retry_missing_updates=False)
+
+    _log_batch_summary(user, calls, results)
+    return results
+
+async def batch_calendar_operations_async(
+    db: AsyncSession,
+    user: User,
+    operations: List[CalendarOperation]
+) -> List[CalendarOperationResult]:
+    """Non-blocking batch_calendar_operations, for async routes."""
+    results, calls = _prepare_batch(operations)
+    if not calls:
+        return results
+
+    creds = await _get_google_creds_async(user)
+    if not creds:
+        return _fail_without_creds(results, calls)
+
+    outcomes = await _run_batch_async(user, creds, calls)
+    recreate = await db.run_sync(_apply_outcomes, user, calls, outcomes, results)
+    if recreate:
+        outcomes = await _run_batch_async(user, creds, recreate)
+        await db.run_sync(_apply_outcomes, user, recreate, outcomes, results, retry_missing_updates=False)
+
+    _log_batch_summary(user, calls, results)
+    return results
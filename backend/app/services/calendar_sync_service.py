@@ -0,0 +1,346 @@
+# backend/app/services/calendar_sync_service.py
+
+import asyncio
+import datetime
+import hashlib
+import hmac
+import logging
+import uuid
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import flag_modified
+
+from ..core.config_loader import settings
+from ..core.database import SessionLocal
+from ..models.user_model import User
+from ..models.task_model import Task
+from . import calendar_service, priority_service
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration Constants ---
+SYNC_INTERVAL = datetime.timedelta(seconds=settings.CALENDAR_SYNC_INTERVAL_SECONDS)
+POLL_SECONDS = 30                                 # How often the worker looks for users that are due
+CLAIM_BATCH_SIZE = 20                             # Users claimed per poll (per worker)
+MAX_CONCURRENT_SYNCS = 4                          # Per worker; each sync runs in a thread
+CHANNEL_RENEW_BEFORE = datetime.timedelta(days=1) # Re-register push channels this long before expiry
+EVENT_ID_CHUNK_SIZE = 1000                        # Event IDs per task lookup query
+# -------------------------------
+
+# --- Two-way Calendar Sync (Google -> tasks) ---
+# We already push task changes to Google. This pulls the other direction:
+# each connected user keeps a Calendar 'syncToken', so every pull only
+# returns events changed since the last one. Changed events are matched to
+# tasks through the indexed tasks.google_calendar_event_id:
+# - moved or renamed in Google -> the task's due date / title follow
+# - deleted in Google          -> the task is kept but unlinked
+# Our own writes come back in the feed too. Google echoes them in whole
+# seconds and drops our placeholder description, so the comparison below
+# allows for both; nothing is written (and no change_version bump happens)
+# for them.
+
+
+# --- 1. Mapping Events Back to Tasks ---
+
+def _event_due_date(event: Dict[str, Any]) -> Optional[datetime.datetime]:
+    """Our events end at the task's due date (see calendar_service._create_event_body)."""
+    end = (event.get("end") or {}).get("dateTime")
+    if not end:
+        return None # All-day events carry no time we could map to a due date
+    try:
+        return datetime.datetime.fromisoformat(end)
+    except ValueError:
+        return None
+
+def _same_instant(a: datetime.datetime, b: Optional[datetime.datetime]) -> bool:
+    """Equal to the second, in UTC (Google drops the microseconds we send)."""
+    if b is None:
+        return False
+    def _normalize(value: datetime.datetime) -> datetime.datetime:
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return value.astimezone(datetime.timezone.utc).replace(microsecond=0)
+    return _normalize(a) == _normalize(b)
+
+def _apply_event_to_task(task: Task, event: Dict[str, Any]) -> Optional[str]:
+    """
+    Copies what the user changed in Google onto the task.
+    Returns 'unlinked', 'updated', or None when the task already matches.
+    """
+    if event.get("status") == "cancelled":
+        task.google_calendar_event_id = None
+        return "unlinked"
+
+    changed = False
+
+    title = event.get("summary")
+    if title and title != task.title:
+        task.title = title
+        changed = True
+
+    description = event.get("description") or None
+    if description == calendar_service.DEFAULT_EVENT_DESCRIPTION:
+        description = None
+    if description != (task.description or None):
+        task.description = description
+        changed = True
+
+    due_date = _event_due_date(event)
+    if due_date and not _same_instant(due_date, task.due_date):
+        task.due_date = due_date
+        # Same re-scoring as a due date edit in the app
+        priority_result = priority_service.calculate_priority_score(
+            due_date=task.due_date,
+            importance=task.importance
+        )
+        task.priority_score = float(priority_result["total_score"])
+        if task.task_metadata is None:
+            task.task_metadata = {}
+        task.task_metadata.pop("smart_suggestion", None)
+        task.task_metadata["priority_breakdown"] = priority_result["breakdown"]
+        flag_modified(task, "task_metadata")
+        changed = True
+
+    return "updated" if changed else None
+
+
+# --- 2. Push Channels ---
+
+def make_channel_token(user_id: int) -> str:
+    """The token Google echoes back on every notification; proves which user it is for."""
+    signature = hmac.new(
+        settings.JWT_SECRET_KEY.encode("utf-8"),
+        f"calendar-channel:{user_id}".encode("utf-8"),
+        hashlib.sha256
+    ).hexdigest()[:32]
+    return f"{user_id}.{signature}"
+
+def read_channel_token(token: Optional[str]) -> Optional[int]:
+    """Returns the user ID inside a channel token, or None if it is not ours."""
+    try:
+        user_id = int((token or "").split(".", 1)[0])
+    except ValueError:
+        return None
+    return user_id if hmac.compare_digest(make_channel_token(user_id), token) else None
+
+def _renew_watch_channel(user: User, creds) -> Dict[str, Any]:
+    """
+    Registers a new push channel if we have none or it is about to expire,
+    and stops the one it replaces (otherwise both notify us until the old
+    one expires). Returns the channel columns to store on the user.
+    """
+    current = {
+        "google_calendar_channel_id": user.google_calendar_channel_id,
+        "google_calendar_channel_resource_id": user.google_calendar_channel_resource_id,
+        "google_calendar_channel_expires_at": user.google_calendar_channel_expires_at,
+    }
+    if not settings.GOOGLE_CALENDAR_WEBHOOK_URL:
+        return current
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    expires_at = user.google_calendar_channel_expires_at
+    if expires_at and expires_at - now > CHANNEL_RENEW_BEFORE:
+        return current
+
+    try:
+        channel = calendar_service.watch_calendar_events(
+            creds,
+            channel_id=uuid.uuid4().hex,
+            address=settings.GOOGLE_CALENDAR_WEBHOOK_URL,
+            token=make_channel_token(user.id)
+        )
+    except Exception as e:
+        # Not fatal: polling still picks the changes up
+        logger.warning("Could not register calendar push channel for user %s: %s", user.id, e)
+        return current
+
+    # Channels from before we stored their IDs cannot be stopped; they run out within a week
+    old_id, old_resource_id = user.google_calendar_channel_id, user.google_calendar_channel_resource_id
+    if old_id and old_resource_id and (expires_at is None or expires_at > now):
+        try:
+            calendar_service.stop_watch_channel(creds, old_id, old_resource_id)
+        except Exception as e:
+            # Not fatal either: until it expires it only causes extra syncs
+            logger.warning("Could not stop old calendar push channel %s for user %s: %s", old_id, user.id, e)
+
+    return {
+        "google_calendar_channel_id": channel.id,
+        "google_calendar_channel_resource_id": channel.resource_id,
+        "google_calendar_channel_expires_at": channel.expires_at,
+    }
+
+
+# --- 3. Syncing One User ---
+
+def sync_user_calendar(db: Session, user: User) -> Dict[str, int]:
+    """
+    Pulls the user's calendar changes since their last sync and applies
+    them to their tasks. Commits, and returns a small summary.
+    """
+    summary = {"events": 0, "tasks_updated": 0, "tasks_unlinked": 0}
+
+    creds = calendar_service._get_google_creds(user)
+    if not creds:
+        return summary
+
+    try:
+        events, next_sync_token = calendar_service.list_event_changes(creds, user.google_calendar_sync_token)
+    except calendar_service.SyncTokenExpired:
+        logger.info("User %s: Calendar sync token expired. Running a full sync.", user.id)
+        events, next_sync_token = calendar_service.list_event_changes(creds, None)
+    summary["events"] = len(events)
+
+    events_by_id = {event["id"]: event for event in events if event.get("id")}
+    event_ids = list(events_by_id)
+    for start in range(0, len(event_ids), EVENT_ID_CHUNK_SIZE):
+        tasks = db.query(Task).filter(
+            Task.owner_id == user.id,
+            Task.google_calendar_event_id.in_(event_ids[start:start + EVENT_ID_CHUNK_SIZE])
+        ).all()
+        for task in tasks:
+            outcome = _apply_event_to_task(task, events_by_id[task.google_calendar_event_id])
+            if outcome:
+                summary[f"tasks_{outcome}"] += 1
+
+    channel_values = _renew_watch_channel(user, creds)
+
+    # A plain UPDATE: sync bookkeeping is not a user change (no cache
+    # invalidation, no 'user.updated' event)
+    db.execute(
+        update(User)
+        .where(User.id == user.id)
+        .values(
+            google_calendar_sync_token=next_sync_token,
+            google_calendar_synced_at=func.now(),
+            **channel_values
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    if summary["tasks_updated"] or summary["tasks_unlinked"]:
+        logger.info(
+            "User %s: Calendar sync applied %d updates, %d unlinks (%d changed events).",
+            user.id, summary["tasks_updated"], summary["tasks_unlinked"], summary["events"]
+        )
+    return summary
+
+def request_sync(db: Session, user_id: int) -> None:
+    """Makes the user due for a sync right away (e.g. after a push notification)."""
+    db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(google_calendar_synced_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+# --- 4. Background Worker ---
+
+def _claim_due_users(limit: int) -> List[int]:
+    """
+    Atomically picks users whose sync is due and stamps them as synced now.
+    SKIP LOCKED lets every API worker run this loop without two of them
+    ever syncing the same user at once.
+    """
+    db = SessionLocal()
+    try:
+        due_before = datetime.datetime.now(datetime.timezone.utc) - SYNC_INTERVAL
+        due_users = (
+            select(User.id)
+            .where(
+                User.google_oauth_refresh_token.isnot(None),
+                or_(User.google_calendar_synced_at.is_(None), User.google_calendar_synced_at < due_before)
+            )
+            .order_by(User.google_calendar_synced_at.asc().nullsfirst())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        user_ids = db.execute(
+            update(User)
+            .where(User.id.in_(due_users.scalar_subquery()))
+            .values(google_calendar_synced_at=func.now())
+            .returning(User.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+        db.commit()
+        return list(user_ids)
+    finally:
+        db.close()
+
+def _sync_user_by_id(user_id: int) -> None:
+    db = SessionLocal()
+    try:
+        user = db.get(User, user_id)
+        if user is not None:
+            sync_user_calendar(db, user)
+    except Exception as e:
+        db.rollback()
+        logger.error("User %s: Calendar sync failed: %s", user_id, e)
+    finally:
+        db.close()
+
+class CalendarSyncWorker:
+    """
+    Runs in every API worker (started in main.py's lifespan). Each pass
+    claims a few due users and syncs them in threads, so the event loop
+    never waits on Google or the DB.
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def poke(self) -> None:
+        """Starts the next pass now instead of after POLL_SECONDS. Safe from any thread."""
+        if self._loop and self._wakeup:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self) -> None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_SYNCS)
+
+        async def _sync(user_id: int) -> None:
+            async with semaphore:
+                await asyncio.to_thread(_sync_user_by_id, user_id)
+
+        while True:
+            user_ids: List[int] = []
+            try:
+                user_ids = await asyncio.to_thread(_claim_due_users, CLAIM_BATCH_SIZE)
+                if user_ids:
+                    await asyncio.gather(*(_sync(user_id) for user_id in user_ids))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("Calendar sync pass failed: %s", e)
+
+            if len(user_ids) == CLAIM_BATCH_SIZE:
+                continue # More users are due; keep going
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+
+# --- Global Worker (started in main.py's lifespan) ---
+calendar_sync_worker = CalendarSyncWorker()
@@ -0,0 +1,207 @@
+# backend/app/services/change_service.py
+
+import hashlib
+from collections import defaultdict
+from typing import Any, Dict
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from ..models.user_model import User
+from ..models.task_model import Task
+from ..models.log_model import UserLog
+from ..models.tombstone_model import TaskTombstone
+from ..schemas.user_schema import Principal
+from ..services import auth_service, event_service, replica_service, timezone_service, user_cache_service
+
+# --- Per-user change version ---
+# Every flush that writes a Task or a UserLog bumps the owner's
+# `users.change_version`. Read endpoints turn that number into an ETag,
+# so an idle dashboard can be answered with a 304 from the user row alone,
+# and delta-sync clients use it as their "since" cursor.
+
+def _collect_changes(session: Session) -> Dict[int, Dict[str, list]]:
+    """
+    Groups every Task/UserLog that this flush will write by owner.
+    Only tasks are kept per user; a log write just needs the owner's bump.
+    """
+    changes: Dict[int, Dict[str, list]] = defaultdict(lambda: {"created": [], "updated": [], "deleted": []})
+
+    for obj in session.new:
+        if isinstance(obj, Task) and obj.owner_id is not None:
+            changes[obj.owner_id]["created"].append(obj)
+        elif isinstance(obj, UserLog) and obj.user_id is not None:
+            changes[obj.user_id]  # Nothing to stamp, but the owner still gets a bump
+
+    for obj in session.dirty:
+        # 'dirty' also holds objects whose attributes were set to the same value
+        if isinstance(obj, Task) and obj.owner_id is not None and session.is_modified(obj):
+            changes[obj.owner_id]["updated"].append(obj)
+
+    for obj in session.deleted:
+        if isinstance(obj, Task) and obj.owner_id is not None:
+            changes[obj.owner_id]["deleted"].append(obj)
+
+    return changes
+
+
+def bump_change_version(session: Session, user_id: int) -> int:
+    """
+    Atomically increments the user's change version and returns the new value.
+    The UPDATE takes the user's row lock, so concurrent writers for the
+    same user get strictly increasing versions.
+    """
+    new_version = session.connection().execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(change_version=User.change_version + 1)
+        .returning(User.change_version)
+    ).scalar_one()
+
+    # The cached auth snapshot carries the version, so drop it on commit (other
+    # workers drop theirs on the task.* event; no separate user.updated)
+    user_cache_service.mark_user_changed(session, user_id, notify=False)
+
+    # Keep an already-loaded User in sync without marking it dirty
+    loaded_user = session.identity_map.get(session.identity_key(User, user_id))
+    if loaded_user is not None:
+        set_committed_value(loaded_user, "change_version", new_version)
+
+    return new_version
+
+
+@event.listens_for(Session, "before_flush")
+def _bump_versions_before_flush(session: Session, flush_context, instances) -> None:
+    changes = _collect_changes(session)
+    pending_events = session.info.setdefault("pending_task_events", [])
+
+    # Sorted, so two flushes touching the same users always lock them in the same order
+    for user_id in sorted(changes):
+        new_version = bump_change_version(session, user_id)
+
+        # Stamp written tasks and leave tombstones for deleted ones (GET /tasks/changes)
+        for task in changes[user_id]["created"] + changes[user_id]["updated"]:
+            task.change_version = new_version
+        for task in changes[user_id]["deleted"]:
+            session.add(TaskTombstone(
+                task_id=task.id,
+                owner_id=user_id,
+                change_version=new_version
+            ))
+
+        # New tasks only get their IDs during the flush, so the
+        # push events are published from after_flush below
+        for event_type, key in (
+            (event_service.TASK_CREATED, "created"),
+            (event_service.TASK_UPDATED, "updated"),
+            (event_service.TASK_DELETED, "deleted"),
+        ):
+            for task in changes[user_id][key]:
+                pending_events.append((user_id, event_type, task, new_version))
+
+
+@event.listens_for(Session, "after_flush")
+def _publish_task_events_after_flush(session: Session, flush_context) -> None:
+    pending_events = session.info.pop("pending_task_events", [])
+    for user_id, event_type, task, version in pending_events:
+        event_service.publish(session, user_id, event_type, {"task_id": task.id, "version": version})
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_task_events_after_rollback(session: Session) -> None:
+    # A failed flush must not leak its events into the next transaction
+    session.info.pop("pending_task_events", None)
+
+
+# --- Conditional GET (ETag / If-None-Match) ---
+
+def build_etag(request: Request, user: Principal, change_version: int, day_window: timezone_service.DayWindow) -> str:
+    """
+    Builds a weak ETag from the user's change version plus everything else
+    the response depends on: the route, its query string, and the user's
+    timezone and current local day (date-windowed results roll over at midnight).
+    """
+    fingerprint = "|".join([
+        request.url.path,
+        str(sorted(request.query_params.multi_items())),
+        user.timezone,
+        day_window.local_date.isoformat(),
+    ])
+    digest = hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()[:16]
+    return f'W/"{user.id}-{change_version}-{digest}"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Compare weakly: the W/ prefix is ignored (RFC 9110, section 13.1.2)
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def conditional_get(
+    request: Request,
+    response: Response,
+    db: Session = Depends(replica_service.get_read_db),
+    current_user: Principal = Depends(auth_service.get_current_principal),
+    day_window: timezone_service.DayWindow = Depends(timezone_service.get_request_day_window)
+) -> None:
+    """
+    Route dependency for polled read endpoints.
+    Raises a 304 when the client's If-None-Match is still current,
+    otherwise stamps the ETag on the response the endpoint is about to build.
+    """
+    # The version comes from the session that serves the body (FastAPI hands
+    # the endpoint the same get_read_db session), not from the Principal: on
+    # a lagging replica the body is older than the primary's version, and an
+    # old body under the new ETag would be revalidated with 304s until the
+    # next write. Read before the body, so the body is never older than it.
+    change_version = db.query(User.change_version).filter(User.id == current_user.id).scalar() or 0
+    etag = build_etag(request, current_user, change_version, day_window)
+    headers = {
+        "ETag": etag,
+        # Let the browser store the body but always revalidate before reuse
+        "Cache-Control": "private, no-cache",
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+
+
+# --- Delta Sync ---
+
+def get_task_changes(db: Session, user: Principal, since: int) -> Dict[str, Any]:
+    """
+    Returns the user's tasks written after version `since`, plus the IDs of
+    tasks deleted after it, and the version the client should send next time.
+    """
+    # Read the cursor *before* the rows: anything committed in between is
+    # simply sent again on the next call, never skipped.
+    current_version = db.query(User.change_version).filter(User.id == user.id).scalar() or 0
+
+    changed_tasks = db.query(Task).filter(
+        Task.owner_id == user.id,
+        Task.change_version > since
+    ).order_by(Task.change_version.asc()).all()
+
+    deleted_ids = [
+        row.task_id for row in db.query(TaskTombstone.task_id).filter(
+            TaskTombstone.owner_id == user.id,
+            TaskTombstone.change_version > since
+        ).order_by(TaskTombstone.change_version.asc()).all()
+    ]
+
+    # A task that was written and then deleted after 'since' only needs the tombstone
+    deleted_set = set(deleted_ids)
+    changed_tasks = [task for task in changed_tasks if task.id not in deleted_set]
+
+    return {
+        "version": current_version,
+        "tasks": changed_tasks,
+        "deleted_ids": deleted_ids,
+    }
@@ -0,0 +1,233 @@
+# backend/app/services/date_phrase_service.py
+
+import datetime
+import logging
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple, Optional
+
+from ..core import metrics
+from ..core.config_loader import settings
+from . import timezone_service
+
+if TYPE_CHECKING:
+    from dateparser.date import DateDataParser
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration Constants ---
+ASAP_DELAY = datetime.timedelta(minutes=30)
+DEFAULT_DUE_HOUR = 17 # "friday" (no time given) means Friday 5 PM
+PART_OF_DAY_HOURS = {"morning": 9, "afternoon": 14, "noon": 12, "evening": 18, "night": 18} # "afternoon" before "noon"
+PLAN_CACHE_SIZE = 4096
+# None lets dateparser detect the language among all of its locales (slow)
+DATEPARSER_LANGUAGES = [lang.strip() for lang in settings.DATEPARSER_LANGUAGES.split(",") if lang.strip()] or None
+# Parsed once at startup, so the first requests do not pay for loading dateparser's data
+WARMUP_PHRASES = ("tomorrow 5pm", "friday 3pm", "october 30 at 2pm", "next month")
+# -------------------------------
+
+# --- Due-Date Phrase Resolution ---
+# Gemini hands us a simplified due-date phrase ("tomorrow 5pm", "friday
+# 3pm", "EOD"). The same few hundred phrases come back all day, and
+# dateparser needs milliseconds for each (seconds for the first one), so:
+#
+# 1. Everything that depends only on the phrase (the EOD/time-only/
+#    ambiguous-time rewrites, and what "friday" with no time means) is
+#    worked out once per distinct phrase and memoized as a DuePlan.
+# 2. The common relative forms ("today", "tomorrow", weekdays, "next
+#    <weekday>", optionally with a time or part of day, "in N hours/days",
+#    "next week") become a RelativeDate, which is resolved against the
+#    user's "now" with plain date arithmetic.
+# 3. Only phrases the rules do not know go to dateparser, through one
+#    shared DateDataParser per timezone, limited to DATEPARSER_LANGUAGES
+#    and warmed up at startup (warm_up()). dateparser.parse() with
+#    settings builds a new parser, and detects the language, every call.
+#
+# The rules give the same dates as dateparser with PREFER_DATES_FROM
+# 'future' (e.g. "friday" on a Friday is next week's Friday).
+
+
+class RelativeDate(NamedTuple):
+    """A recognized phrase, as an offset from the user's current time."""
+    days: int = 0                                # Calendar days ahead ("tomorrow" = 1)
+    weekday: Optional[int] = None                # The next such weekday (0 = Monday), always after today
+    delta: Optional[datetime.timedelta] = None   # "in 3 hours", "next week": exactly this far from now
+    time: Optional[datetime.time] = None         # An explicit clock time
+    date_only: bool = False                      # No time: midnight (else the current time, like dateparser)
+
+class DuePlan(NamedTuple):
+    """Everything about a phrase that does not depend on the current time."""
+    asap: bool
+    relative: Optional[RelativeDate]
+    text: str                    # The rewritten phrase, for dateparser
+    default_hour: Optional[int]  # Hour for a date-only result (None if the phrase had a time)
+
+
+# --- 1. Precompiled Patterns ---
+
+_ASAP = re.compile(r'\b(immediately|asap)\b')
+_EOD = re.compile(r'eod', re.IGNORECASE)
+_TIME_ONLY = re.compile(r'^(at\s*)?\d{1,2}(:\d{2})?(\s*(am|pm))?\s*$')
+_DAY_WORDS = re.compile(r'monday|tuesday|wednesday|thursday|friday|saturday|sunday|today|tomorrow|next week')
+_TIME_OF_DAY_WORDS = re.compile(r'morning|afternoon|evening', re.IGNORECASE)
+_AM_PM_TIME = re.compile(r'\d(\s*am|\s*pm|:\d{2})')
+_EXPLICIT_TIME = re.compile(r'\d{1,2}(\s*am|\s*pm|\s*o\'clock|:\d{2})')
+
+_WEEKDAYS = {
+    "monday": 0, "mon": 0, "tuesday": 1, "tues": 1, "tue": 1, "wednesday": 2, "wed": 2,
+    "thursday": 3, "thurs": 3, "thu": 3, "friday": 4, "fri": 4, "saturday": 5, "sat": 5,
+    "sunday": 6, "sun": 6,
+}
+_RELATIVE_DAY = re.compile(
+    r"^(?:(?P<day>today|tomorrow)|(?:next\s+)?(?P<weekday>" + "|".join(sorted(_WEEKDAYS, key=len, reverse=True)) + r"))"
+    r"(?:\s+(?P<part>" + "|".join(PART_OF_DAY_HOURS) + r"))?"
+    r"(?:\s+(?:at\s*)?(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<meridiem>am|pm)?)?$"
+)
+_RELATIVE_OFFSET = re.compile(r"^(?:in\s+(?P<count>\d+)\s+(?P<unit>minute|hour|day|week)s?|(?P<next_week>next\s+week))$")
+_PUNCTUATION = re.compile(r"[,.!]+(?=\s|$)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+# --- 2. Planning (memoized per phrase) ---
+
+def _clock_time(hour: str, minute: Optional[str], meridiem: Optional[str]) -> Optional[datetime.time]:
+    if not meridiem and minute is None: # A bare number ("tomorrow 9") is not a time
+        return None
+    hour, minute = int(hour), int(minute or 0)
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem == "pm" else 0)
+    return datetime.time(hour, minute) if hour <= 23 and minute <= 59 else None
+
+def _recognize(phrase: str) -> Optional[RelativeDate]:
+    """The RelativeDate for a common phrase, or None if dateparser has to read it."""
+    normalized = _WHITESPACE.sub(" ", _PUNCTUATION.sub("", phrase.lower())).strip()
+
+    offset = _RELATIVE_OFFSET.match(normalized)
+    if offset:
+        if offset.group("next_week"):
+            return RelativeDate(delta=datetime.timedelta(weeks=1))
+        return RelativeDate(delta=datetime.timedelta(**{offset.group("unit") + "s": int(offset.group("count"))}))
+
+    match = _RELATIVE_DAY.match(normalized)
+    if not match:
+        return None
+    clock = None
+    if match.group("hour"):
+        clock = _clock_time(match.group("hour"), match.group("minute"), match.group("meridiem"))
+        if clock is None:
+            return None
+    if match.group("weekday"):
+        return RelativeDate(weekday=_WEEKDAYS[match.group("weekday")], time=clock, date_only=True)
+    return RelativeDate(
+        days=1 if match.group("day") == "tomorrow" else 0,
+        time=clock,
+        date_only=match.group("part") is not None,
+    )
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def plan_due_date(description: str) -> DuePlan:
+    desc_lower = description.lower()
+
+    # "immediately"/"asap": 30 minutes from now
+    if _ASAP.search(desc_lower):
+        return DuePlan(asap=True, relative=None, text=description, default_hour=None)
+
+    text = description
+    # "EOD" (End of Day) is 5 PM
+    if 'eod' in desc_lower:
+        text = _EOD.sub('5:00 PM', text)
+        desc_lower = text.lower()
+
+    # A time on its own ("5pm") is today
+    if _TIME_ONLY.match(desc_lower) and not _DAY_WORDS.search(desc_lower):
+        text = f"today {text}"
+
+    # Two time components ("tomorrow morning at 9 am"): the clock time wins
+    if _TIME_OF_DAY_WORDS.search(desc_lower) and _AM_PM_TIME.search(desc_lower):
+        text = _TIME_OF_DAY_WORDS.sub('', text).strip()
+
+    # A date without a time ("friday", "monday morning") gets a sensible hour
+    original_lower = description.lower()
+    default_hour = None
+    if not _EXPLICIT_TIME.search(original_lower) and "eod" not in original_lower:
+        default_hour = next(
+            (hour for word, hour in PART_OF_DAY_HOURS.items() if word in original_lower), DEFAULT_DUE_HOUR
+        )
+
+    return DuePlan(asap=False, relative=_recognize(text), text=text, default_hour=default_hour)
+
+
+# --- 3. Resolution ---
+
+def _resolve_relative(relative: RelativeDate, now: datetime.datetime) -> datetime.datetime:
+    if relative.delta is not None:
+        return now + relative.delta
+    days = relative.days if relative.weekday is None else ((relative.weekday - now.weekday()) % 7 or 7)
+    date = now.date() + datetime.timedelta(days=days)
+    if relative.time is not None:
+        clock = relative.time
+    elif relative.date_only:
+        clock = datetime.time(0, 0)
+    else:
+        clock = now.time()
+    # combine() with the zone gives the right UTC offset for that date (DST)
+    return datetime.datetime.combine(date, clock, tzinfo=now.tzinfo)
+
+@lru_cache(maxsize=128)
+def _get_date_parser(timezone_name: str) -> "DateDataParser":
+    from dateparser.date import DateDataParser # Slow to import: loaded by warm_up() or the first fallback
+    return DateDataParser(
+        languages=DATEPARSER_LANGUAGES,
+        settings={
+            'PREFER_DATES_FROM': 'future',
+            'TIMEZONE': timezone_name, # Read "5pm" as the user's 5pm
+            'RETURN_AS_TIMEZONE_AWARE': True,
+            'STRICT_PARSING': False
+        }
+    )
+
+def parse_with_dateparser(text: str, timezone_name: str) -> Optional[datetime.datetime]:
+    """dateparser's reading of 'text' (future dates preferred), aware in 'timezone_name'; None if unreadable."""
+    try:
+        with metrics.ml_stage("date_parse"):
+            return _get_date_parser(timezone_name).get_date_data(text)["date_obj"]
+    except Exception as e:
+        logger.warning("dateparser failed for %r: %s", text, e)
+        return None
+
+def warm_up(timezone_names=(timezone_service.DEFAULT_TIMEZONE,)) -> None:
+    """Loads dateparser's language data and builds the common parsers (call at startup)."""
+    for timezone_name in timezone_names:
+        for phrase in WARMUP_PHRASES:
+            parse_with_dateparser(phrase, timezone_name)
+
+def resolve_due_date(description: Optional[str], timezone_name: Optional[str]) -> Optional[datetime.datetime]:
+    """
+    Turns a due-date phrase into an aware datetime in the user's timezone,
+    or None if there is no phrase or it cannot be read.
+    """
+    if not description:
+        return None
+
+    plan = plan_due_date(description)
+    user_tz = timezone_service.resolve_timezone(timezone_name)
+    now = datetime.datetime.now(user_tz)
+
+    if plan.asap:
+        metrics.DATE_PHRASE_RESOLUTIONS.labels("asap").inc()
+        return now + ASAP_DELAY
+
+    if plan.relative is not None:
+        metrics.DATE_PHRASE_RESOLUTIONS.labels("rule").inc()
+        parsed = _resolve_relative(plan.relative, now)
+    else:
+        metrics.DATE_PHRASE_RESOLUTIONS.labels("dateparser").inc()
+        logger.debug("No rule for %r, parsing %r with dateparser.", description, plan.text)
+        tz_name = timezone_name if timezone_service.is_valid_timezone(timezone_name) else timezone_service.DEFAULT_TIMEZONE
+        parsed = parse_with_dateparser(plan.text, tz_name)
+
+    if parsed is not None and parsed.hour == 0 and parsed.minute == 0 and plan.default_hour is not None:
+        parsed = parsed.replace(hour=plan.default_hour)
+    return parsed
@@ -0,0 +1,175 @@
+# backend/app/services/event_service.py
+
+import asyncio
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..core.database import engine
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration Constants ---
+EVENTS_CHANNEL = "user_events"   # The Postgres NOTIFY channel shared by all workers
+SUBSCRIBER_QUEUE_SIZE = 100      # Per-stream backlog before events are dropped
+RECONNECT_DELAY_SECONDS = 5      # Wait between LISTEN reconnect attempts
+# -------------------------------
+
+# --- Event Types ---
+TASK_CREATED = "task.created"
+TASK_UPDATED = "task.updated"
+TASK_DELETED = "task.deleted"
+CALENDAR_SYNCED = "calendar.synced"
+ACHIEVEMENT_UNLOCKED = "achievement.unlocked"
+USER_UPDATED = "user.updated"
+# -------------------
+
+
+# --- 1. Publishing ---
+
+def publish(db: Session, user_id: int, event_type: str, data: Dict[str, Any]) -> None:
+    """
+    Queues an event for the user on the session's current transaction.
+    Postgres only delivers a NOTIFY when the transaction commits, so
+    events for rolled-back writes are never sent.
+    Payloads must stay small (Postgres caps them at 8000 bytes); clients
+    fetch the actual data via /tasks/changes.
+    """
+    payload = json.dumps({"user_id": user_id, "type": event_type, "data": data}, default=str)
+    db.connection().execute(select(func.pg_notify(EVENTS_CHANNEL, payload)))
+
+
+# --- 2. Receiving (one LISTEN connection per worker) ---
+
+class EventHub:
+    """
+    Holds this worker's LISTEN connection and fans each notification
+    out to the in-process streams of the user it belongs to.
+    Because every worker LISTENs, an event published by any worker
+    reaches the user's streams wherever they are connected.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = {}
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        self._conn = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+
+    # --- Lifecycle ---
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        try:
+            await self._connect()
+        except Exception as e:
+            logger.error("Event hub could not LISTEN on '%s': %s. Retrying in background.", EVENTS_CHANNEL, e)
+            self._schedule_reconnect()
+
+    async def stop(self) -> None:
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        self._disconnect()
+
+    async def _connect(self) -> None:
+        connect_args = engine.url.translate_connect_args(username="user", database="dbname")
+        conn = await asyncio.to_thread(psycopg2.connect, **connect_args)
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {EVENTS_CHANNEL};")
+
+        self._conn = conn
+        self._loop.add_reader(conn.fileno(), self._on_readable)
+        logger.info("Event hub listening on '%s'.", EVENTS_CHANNEL)
+
+    def _disconnect(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            self._loop.remove_reader(self._conn.fileno())
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+    def _schedule_reconnect(self) -> None:
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = self._loop.create_task(self._reconnect_loop())
+
+    async def _reconnect_loop(self) -> None:
+        while self._conn is None:
+            await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+            try:
+                await self._connect()
+            except Exception as e:
+                logger.error("Event hub reconnect failed: %s", e)
+
+    # --- Notifications ---
+
+    def _on_readable(self) -> None:
+        """Called by the event loop whenever the LISTEN socket has data."""
+        try:
+            self._conn.poll()
+        except Exception as e:
+            logger.error("Event hub lost its LISTEN connection: %s", e)
+            self._disconnect()
+            self._schedule_reconnect()
+            return
+
+        while self._conn.notifies:
+            notification = self._conn.notifies.pop(0)
+            self._dispatch(notification.payload)
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+            event["user_id"] = int(event["user_id"])
+            queues = self._subscribers.get(event["user_id"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed event payload: %s", payload[:200])
+            return
+
+        for listener in self._listeners:
+            try:
+                listener(event)
+            except Exception as e:
+                logger.exception("Event listener %s failed: %s", listener.__name__, e)
+
+        for queue in list(queues or ()):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A stalled client; it can catch up through /tasks/changes
+                pass
+
+    # --- Subscriptions ---
+
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Registers an in-process callback that sees every event on this
+        worker, whichever user it is for (e.g. for cache invalidation).
+        """
+        self._listeners.append(listener)
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+
+
+# --- Global Hub (started in main.py's lifespan) ---
+event_hub = EventHub()
@@ -8,6 +8,8 @@ from typing import List, Dict, Any, Optional # <-- IMPORT 'List' HERE
 from ..models.user_model import User
 from ..models.log_model import UserLog
 from ..schemas.gamification_schema import GamificationStatus, Achievement
+from ..schemas.user_schema import Principal
+from . import timezone_service
 
 # --- 1. Define All Possible Achievements ---
 # We store this as a master dictionary. The user's model will
@@ -74,7 +76,8 @@ def update_gamification_stats(db: Session, user: User) -> List[Achievement]:
     """
     
     # --- Part A: Update Streak ---
-    today = datetime.date.today()
+    # Streak days follow the user's own calendar, not the server's
+    today = timezone_service.get_day_window(user.timezone).local_date
     newly_unlocked_ids = []
 
     if user.last_active_day != today:
@@ -133,9 +136,10 @@ def update_gamification_stats(db: Session, user: User) -> List[Achievement]:
 
 # --- 3. Main Service Function to Get Status ---
 
-def get_gamification_status(user: User) -> GamificationStatus:
+def get_gamification_status(user: Principal) -> GamificationStatus:
     """
-    Gets the user's current gamification status.
+    Gets the user's current gamification status (from the cached Principal;
+    no database access needed).
     """
     unlocked_achievements = []
     if user.achievements:
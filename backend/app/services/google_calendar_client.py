@@ -0,0 +1,184 @@
+# backend/app/services/google_calendar_client.py
+
+import datetime
+import json
+import uuid
+from dataclasses import dataclass
+from email.parser import BytesParser
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from ..core.config_loader import settings
+from ..core.http_client import get_http_client
+from ..core import metrics
+
+# --- Async Google Calendar REST client ---
+# The non-blocking counterpart of googleapiclient for our async routes.
+# Every call goes through the app's shared, pooled httpx.AsyncClient.
+# Point settings.GOOGLE_API_BASE_URL / GOOGLE_TOKEN_URI at
+# scripts/mock_google_api.py to run against a local fake.
+
+# --- Configuration Constants ---
+CALENDAR_API_PATH = "/calendar/v3"
+BATCH_PATH = "/batch/calendar/v3"
+BATCH_MAX_CALLS = 50 # Google advises at most 50 calls per Calendar batch request
+# -------------------------------
+
+
+class CalendarAPIError(Exception):
+    """A non-2xx answer from Google (or a batch part that failed)."""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Google API returned {status_code}: {message}")
+        self.status_code = status_code
+
+
+@dataclass
+class BatchCall:
+    method: str                            # "POST", "PUT" or "DELETE"
+    path: str                              # e.g. events_path("abc123")
+    body: Optional[Dict[str, Any]] = None
+
+
+def events_path(event_id: Optional[str] = None) -> str:
+    """Path of the user's primary calendar events (or of one event)."""
+    path = f"{CALENDAR_API_PATH}/calendars/primary/events"
+    return f"{path}/{quote(event_id, safe='')}" if event_id else path
+
+
+# --- 1. Helpers ---
+
+def _parse_response(status_code: int, content: bytes) -> Optional[Dict[str, Any]]:
+    """Returns the JSON body, or raises CalendarAPIError for an error status."""
+    try:
+        data = json.loads(content) if content else None
+    except ValueError:
+        data = None
+
+    if status_code >= 400:
+        message = content[:200].decode("utf-8", "replace")
+        if isinstance(data, dict):
+            error = data.get("error")
+            message = error.get("message", message) if isinstance(error, dict) else data.get("error_description", error)
+        raise CalendarAPIError(status_code, str(message))
+    return data
+
+def _auth_headers(access_token: str) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {access_token}"}
+
+async def _request(operation: str, access_token: str, method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+    with metrics.track_dependency("google_calendar", operation):
+        response = await get_http_client().request(
+            method,
+            settings.GOOGLE_API_BASE_URL + path,
+            json=body,
+            headers=_auth_headers(access_token)
+        )
+        return _parse_response(response.status_code, response.content)
+
+
+# --- 2. OAuth Token Refresh ---
+
+async def refresh_access_token(refresh_token: str) -> Tuple[str, datetime.datetime]:
+    """
+    Trades a Google refresh token for a new access token.
+    Returns (access_token, expiry); the expiry is naive UTC, as google-auth expects.
+    """
+    with metrics.track_dependency("google_oauth", "refresh_token"):
+        response = await get_http_client().post(
+            settings.GOOGLE_TOKEN_URI,
+            data={
+                "grant_type": "refresh_token",
+                "refresh_token": refresh_token,
+                "client_id": settings.GOOGLE_CLIENT_ID,
+                "client_secret": settings.GOOGLE_CLIENT_SECRET,
+            },
+        )
+        data = _parse_response(response.status_code, response.content) or {}
+    if "access_token" not in data:
+        raise CalendarAPIError(response.status_code, "Token response has no access_token")
+
+    now_utc = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    expiry = now_utc + datetime.timedelta(seconds=int(data.get("expires_in", 3600)))
+    return data["access_token"], expiry
+
+
+# --- 3. Events ---
+
+async def insert_event(access_token: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    return await _request("events.insert", access_token, "POST", events_path(), body)
+
+async def update_event(access_token: str, event_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    return await _request("events.update", access_token, "PUT", events_path(event_id), body)
+
+async def delete_event(access_token: str, event_id: str) -> None:
+    await _request("events.delete", access_token, "DELETE", events_path(event_id))
+
+
+# --- 4. Batch ---
+
+def _serialize_batch(calls: List[BatchCall], boundary: str) -> bytes:
+    parts = []
+    for index, call in enumerate(calls):
+        body = json.dumps(call.body) if call.body is not None else ""
+        parts.append(
+            f"--{boundary}\r\n"
+            f"Content-Type: application/http\r\n"
+            f"Content-ID: <item{index}>\r\n\r\n"
+            f"{call.method} {call.path} HTTP/1.1\r\n"
+            f"Content-Type: application/json\r\n\r\n"
+            f"{body}\r\n"
+        )
+    parts.append(f"--{boundary}--")
+    return "".join(parts).encode("utf-8")
+
+def _parse_batch(content_type: str, content: bytes, count: int) -> List[Tuple[Optional[Dict[str, Any]], Optional[CalendarAPIError]]]:
+    """Splits a multipart/mixed batch response back into one (data, error) per call."""
+    missing = CalendarAPIError(502, "Missing from batch response")
+    outcomes: List[Tuple[Optional[Dict[str, Any]], Optional[CalendarAPIError]]] = [(None, missing)] * count
+
+    message = BytesParser().parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode("utf-8") + content)
+    for part in message.get_payload():
+        content_id = (part.get("Content-ID") or "").strip("<>")
+        try:
+            index = int(content_id.rsplit("item", 1)[1])
+        except (IndexError, ValueError):
+            continue
+
+        # Each part is a raw HTTP response: status line, headers, blank line, body
+        raw = part.get_payload(decode=True) or b""
+        head, _, body = raw.replace(b"\r\n", b"\n").partition(b"\n\n")
+        try:
+            status_code = int(head.split(b"\n", 1)[0].split()[1])
+            outcomes[index] = (_parse_response(status_code, body.strip()), None)
+        except CalendarAPIError as e:
+            outcomes[index] = (None, e)
+        except (IndexError, ValueError):
+            outcomes[index] = (None, CalendarAPIError(502, "Malformed batch part"))
+
+    return outcomes
+
+async def batch(access_token: str, calls: List[BatchCall]) -> List[Tuple[Optional[Dict[str, Any]], Optional[CalendarAPIError]]]:
+    """
+    Sends up to BATCH_MAX_CALLS calls in one HTTP request.
+    Returns one (data, error) per call, in order; a failed call does not
+    affect the others. Raises CalendarAPIError if the batch itself fails.
+    """
+    if len(calls) > BATCH_MAX_CALLS:
+        raise ValueError(f"A batch can hold at most {BATCH_MAX_CALLS} calls (got {len(calls)}).")
+    if not calls:
+        return []
+
+    boundary = uuid.uuid4().hex
+    with metrics.track_dependency("google_calendar", "batch"):
+        response = await get_http_client().post(
+            settings.GOOGLE_API_BASE_URL + BATCH_PATH,
+            content=_serialize_batch(calls, boundary),
+            headers={
+                **_auth_headers(access_token),
+                "Content-Type": f"multipart/mixed; boundary={boundary}",
+            },
+        )
+        if response.status_code >= 400:
+            _parse_response(response.status_code, response.content)
+    return _parse_batch(response.headers.get("content-type", ""), response.content, len(calls))
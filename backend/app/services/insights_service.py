@@ -5,22 +5,19 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func, cast, Date, extract, Boolean
 from typing import List, Dict, Any
 import json
-from zoneinfo import ZoneInfo # <-- NEW IMPORT
+import logging
 
 from ..models.task_model import Task
 from ..models.user_model import User
 from ..models.log_model import UserLog
 from ..schemas import insights_schema # <-- NEW IMPORT
+from .timezone_service import DayWindow
+
+logger = logging.getLogger(__name__)
 
 # --- Configuration Constants ---
 BURNDOWN_PERIOD_DAYS = 15 # The default projection period for the burndown chart
 HIGH_PRIORITY_THRESHOLD = 70 # Score >= 70 is 'High'
-try:
-    # Use 'Asia/Kolkata' for IST
-    USER_TIMEZONE = ZoneInfo("Asia/Kolkata") 
-except Exception:
-    # Fallback if zoneinfo fails
-    USER_TIMEZONE = datetime.timezone(datetime.timedelta(hours=5, minutes=30))
 # -------------------------------
 
 
@@ -63,11 +60,10 @@ def get_burndown_data(db: Session, user_id: int) -> List[Dict[str, Any]]:
         # Velocity = Total completed work / days of activity
         velocity = total_completed_work / days_of_activity
         
-    print(f"--- Burndown Calc: User {user_id} ---")
-    print(f"  Current Remaining Work: {current_remaining_work}")
-    print(f"  First Completion: {first_completion_time}")
-    print(f"  Daily Velocity: {velocity}")
-    print("-----------------------------------")
+    logger.debug(
+        "Burndown calc for user %s", user_id,
+        extra={"remaining_work": current_remaining_work, "first_completion": first_completion_time, "velocity": velocity}
+    )
 
 
     # --- 3. Define the Ideal Burndown ---
@@ -106,20 +102,24 @@ def get_burndown_data(db: Session, user_id: int) -> List[Dict[str, Any]]:
     return data
 
 
-def get_productivity_heatmap_data(db: Session, user_id: int) -> List[Dict[str, Any]]:
+def get_productivity_heatmap_data(db: Session, user_id: int, timezone_name: str = "UTC") -> List[Dict[str, Any]]:
     """
     Calculates the data for the Productivity Heatmap.
-    Analyzes completed tasks logged in user_logs to count completions by day/hour.
+    Analyzes completed tasks logged in user_logs to count completions by day/hour,
+    bucketed in the user's timezone.
     """
     
-    # --- FIX: Use timezone-aware datetime for comparison ---
-    sixty_days_ago = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=60)
-    # -----------------------------------------------------
+    # user_logs.timestamp is naive UTC, so compare with naive UTC
+    # (asyncpg, unlike psycopg2, rejects an aware value for it)
+    sixty_days_ago = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) - datetime.timedelta(days=60)
+
+    # user_logs.timestamp is naive UTC: mark it as UTC, then shift to the user's wall clock
+    local_timestamp = func.timezone(timezone_name, func.timezone('UTC', UserLog.timestamp))
 
     # Use the UserLog table for accurate action timestamps
     heatmap_data_query = db.query(
-        extract('dow', UserLog.timestamp).label('day_of_week'), # 0=Sunday, 6=Saturday
-        extract('hour', UserLog.timestamp).label('hour_of_day'),
+        extract('dow', local_timestamp).label('day_of_week'), # 0=Sunday, 6=Saturday
+        extract('hour', local_timestamp).label('hour_of_day'),
         func.count(UserLog.id).label('task_count')
     ).filter(
         UserLog.user_id == user_id,
@@ -152,16 +152,15 @@ def get_productivity_heatmap_data(db: Session, user_id: int) -> List[Dict[str, A
     return formatted_data
 
 # --- NEW FUNCTION ---
-def get_dashboard_progress(db: Session, user_id: int) -> insights_schema.DashboardProgressSummary:
+def get_dashboard_progress(db: Session, user_id: int, day_window: DayWindow) -> insights_schema.DashboardProgressSummary:
     """
     Calculates the progress stats for the main dashboard.
+    'day_window' is the user's local "today" (see timezone_service).
     """
     
     # --- 1. Today's Progress ---
-    # Get the current time *in the user's local timezone*
-    now_local = datetime.datetime.now(USER_TIMEZONE)
-    today_start = now_local.replace(hour=0, minute=0, second=0, microsecond=0)
-    today_end = today_start + datetime.timedelta(days=1)
+    today_start = day_window.today_start
+    today_end = day_window.today_end
     
     today_tasks_query = db.query(Task).filter(
         Task.owner_id == user_id,
@@ -175,7 +174,7 @@ def get_dashboard_progress(db: Session, user_id: int) -> insights_schema.Dashboa
     
     # --- 2. Weekly Progress ---
     # Use 'today_start' from above
-    week_end = today_start + datetime.timedelta(days=7)
+    week_end = day_window.days_after_today(7)
     
     week_tasks_query = db.query(Task).filter(
         Task.owner_id == user_id,
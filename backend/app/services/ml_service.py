@@ -1,19 +1,65 @@
 # backend/app/services/ml_service.py
 
-import joblib
+import calendar
 import json
+import logging
 import datetime 
-import dateparser 
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-from sklearn.pipeline import Pipeline
-from sklearn.exceptions import NotFittedError
-from sklearn.feature_extraction.text import TfidfVectorizer # We need this for type hinting
+from typing import TYPE_CHECKING, Dict, Any, Optional, List, NamedTuple
+
+from ..core import metrics
+
+# sklearn (and joblib) take seconds to import, so they are only imported
+# when the first user model is loaded (see _load_pipeline)
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+    from sklearn.feature_extraction.text import TfidfVectorizer # We need this for type hinting
+
+logger = logging.getLogger(__name__)
 
 # --- Constants ---
 ML_MODEL_PATH = Path(__file__).resolve().parent.parent.parent.parent / 'ml' / 'models'
 # -----------------
 
+class PeakWindow(NamedTuple):
+    """One hour of the week in which the user usually completes tasks (UTC)."""
+    weekday: int   # 0 = Monday
+    hour: int
+    weight: float  # Share of the user's completions in this window
+
+    @property
+    def label(self) -> str:
+        return f"{calendar.day_name[self.weekday]} {self.hour}:00"
+
+    def next_occurrence(self, now: datetime.datetime) -> datetime.datetime:
+        """The next start of this window after 'now' (aware, UTC)."""
+        days_ahead = (self.weekday - now.weekday()) % 7
+        start = now.replace(hour=self.hour, minute=0, second=0, microsecond=0) + datetime.timedelta(days=days_ahead)
+        return start if start > now else start + datetime.timedelta(weeks=1)
+
+def _load_pipeline(path: Path) -> "Pipeline":
+    import joblib
+    return joblib.load(path)
+
+_WEEKDAY_NUMBERS = {name.lower(): number for number, name in enumerate(calendar.day_name)}
+
+def _peak_window_table(profile: Dict[str, Any]) -> List[PeakWindow]:
+    """
+    The profile's peak windows, strongest first. Older profiles stored
+    them as strings ("Tuesday 14:00", strongest first); those still load.
+    """
+    windows = []
+    for rank, entry in enumerate(profile.get("peak_windows", [])):
+        try:
+            if isinstance(entry, str):
+                day, time_str = entry.split()
+                windows.append(PeakWindow(_WEEKDAY_NUMBERS[day.lower()], int(time_str.split(":")[0]), -rank))
+            else:
+                windows.append(PeakWindow(int(entry["weekday"]), int(entry["hour"]), float(entry.get("weight", 0.0))))
+        except (KeyError, ValueError, TypeError):
+            logger.warning("Skipping malformed peak window %r", entry)
+    return sorted(windows, key=lambda window: window.weight, reverse=True)
+
 class MLModelService:
     """
     Handles loading and running predictions for a specific user's models.
@@ -29,20 +75,22 @@ class MLModelService:
     
     def __init__(self, user_id: int):
         self.user_id = user_id
-        self.model_a_difficulty: Optional[Pipeline] = None
-        self.model_b_personalization: Optional[Pipeline] = None
-        self.model_c_friction: Optional[Pipeline] = None
+        self.model_a_difficulty: Optional["Pipeline"] = None
+        self.model_b_personalization: Optional["Pipeline"] = None
+        self.model_c_friction: Optional["Pipeline"] = None
         self.model_d_profile: Dict[str, Any] = {"peak_windows": []}
+        self.peak_windows: List[PeakWindow] = [] # Model D, parsed once
         
         # --- MODIFIED ---
         # We explicitly type these for clarity
-        self.vectorizer_a: Optional[TfidfVectorizer] = None
-        self.vectorizer_b: Optional[TfidfVectorizer] = None
-        self.vectorizer_c: Optional[TfidfVectorizer] = None
+        self.vectorizer_a: Optional["TfidfVectorizer"] = None
+        self.vectorizer_b: Optional["TfidfVectorizer"] = None
+        self.vectorizer_c: Optional["TfidfVectorizer"] = None
         # ----------------
         
         self._load_models()
 
+    @metrics.ml_stage("load_models")
     def _load_models(self):
         """Loads all available .pkl and .json models for the user."""
         
@@ -50,38 +98,38 @@ class MLModelService:
         try:
             path_a = ML_MODEL_PATH / f"user_{self.user_id}_difficulty.pkl"
             if path_a.exists():
-                self.model_a_difficulty = joblib.load(path_a)
+                self.model_a_difficulty = _load_pipeline(path_a)
                 # --- MODIFIED ---
                 # We save the vectorizer step for our relevance check
                 self.vectorizer_a = self.model_a_difficulty.named_steps.get('tfidf')
                 if self.vectorizer_a:
-                     print(f"Loaded Difficulty Model and Vectorizer for user {self.user_id}")
+                     logger.info("Loaded Difficulty Model and Vectorizer for user %s", self.user_id)
         except Exception as e:
-            print(f"Warning: Could not load Difficulty Model for user {self.user_id}: {e}")
+            logger.warning("Could not load Difficulty Model for user %s: %s", self.user_id, e)
 
         # Load Model B (Personalization)
         try:
             path_b = ML_MODEL_PATH / f"user_{self.user_id}_personalization.pkl"
             if path_b.exists():
-                self.model_b_personalization = joblib.load(path_b)
+                self.model_b_personalization = _load_pipeline(path_b)
                 # --- MODIFIED ---
                 self.vectorizer_b = self.model_b_personalization.named_steps.get('tfidf')
                 if self.vectorizer_b:
-                    print(f"Loaded Personalization Model and Vectorizer for user {self.user_id}")
+                    logger.info("Loaded Personalization Model and Vectorizer for user %s", self.user_id)
         except Exception as e:
-            print(f"Warning: Could not load Personalization Model for user {self.user_id}: {e}")
+            logger.warning("Could not load Personalization Model for user %s: %s", self.user_id, e)
 
         # Load Model C (Friction)
         try:
             path_c = ML_MODEL_PATH / f"user_{self.user_id}_friction.pkl"
             if path_c.exists():
-                self.model_c_friction = joblib.load(path_c)
+                self.model_c_friction = _load_pipeline(path_c)
                 # --- MODIFIED ---
                 self.vectorizer_c = self.model_c_friction.named_steps.get('tfidf')
                 if self.vectorizer_c:
-                    print(f"Loaded Friction Model and Vectorizer for user {self.user_id}")
+                    logger.info("Loaded Friction Model and Vectorizer for user %s", self.user_id)
         except Exception as e:
-            print(f"Warning: Could not load Friction Model for user {self.user_id}: {e}")
+            logger.warning("Could not load Friction Model for user %s: %s", self.user_id, e)
 
         # Load Model D (Profile)
         try:
@@ -89,12 +137,13 @@ class MLModelService:
             if path_d.exists():
                 with open(path_d, 'r') as f:
                     self.model_d_profile = json.load(f)
-                print(f"Loaded Productivity Profile for user {self.user_id}")
+                self.peak_windows = _peak_window_table(self.model_d_profile)
+                logger.info("Loaded Productivity Profile for user %s", self.user_id)
         except Exception as e:
-            print(f"Warning: Could not load Productivity Profile for user {self.user_id}: {e}")
+            logger.warning("Could not load Productivity Profile for user %s: %s", self.user_id, e)
 
     # --- NEW LOGIC (Step 2 from our plan) ---
-    def _is_task_relevant(self, task_title: str, vectorizer: Optional[TfidfVectorizer]) -> bool:
+    def _is_task_relevant(self, task_title: str, vectorizer: Optional["TfidfVectorizer"]) -> bool:
         """
         Checks if the task title is "relevant" to the model's vocabulary.
         """
@@ -104,7 +153,7 @@ class MLModelService:
         try:
             model_vocabulary = vectorizer.vocabulary_
         except AttributeError:
-            print("Warning: Vectorizer is not fitted or has no 'vocabulary_' attribute.")
+            logger.warning("Vectorizer is not fitted or has no 'vocabulary_' attribute.")
             return False # Vectorizer isn't fitted
 
         new_task_words = set(task_title.lower().split())
@@ -117,11 +166,12 @@ class MLModelService:
         relevance_score = len(known_words) / len(new_task_words)
         
         # This print is very useful for debugging:
-        # print(f"Relevance for '{task_title}': {relevance_score:.2f}")
+        # logger.debug("Relevance for %r: %.2f", task_title, relevance_score)
 
         return relevance_score >= self.RELEVANCE_THRESHOLD
     # ---------------------------------------
 
+    @metrics.ml_stage("personalization")
     def get_personalization(self, task_title: str) -> Dict[str, Any]:
         """
         Runs a new task title through all loaded models to get personalized scores.
@@ -131,6 +181,9 @@ class MLModelService:
             "new_importance": None, # None means "no change"
             "is_high_friction": False,
         }
+        if not (self.model_a_difficulty or self.model_b_personalization or self.model_c_friction):
+            return results # No trained models (yet): nothing to personalize
+        from sklearn.exceptions import NotFittedError # Already imported with the models
 
         # --- NEW LOGIC (Step 3 for Model A) ---
         # 1. Predict Difficulty (Model A) - WITH RELEVANCE CHECK
@@ -142,14 +195,14 @@ class MLModelService:
                 
                 boost = min( (predicted_minutes / 30) * 5, 20)
                 results["difficulty_boost"] = round(boost, 2)
-                print(f"Model A (Difficulty): Passed relevance. Predicted {predicted_minutes:.0f} mins.")
+                logger.debug("Model A (Difficulty): Passed relevance. Predicted %.0f mins.", predicted_minutes)
             except NotFittedError:
-                print(f"Warning: Difficulty Model for user {self.user_id} is not fitted.")
+                logger.warning("Difficulty Model for user %s is not fitted.", self.user_id)
             except Exception as e:
-                print(f"Error during difficulty prediction: {e}")
+                logger.error("Error during difficulty prediction: %s", e)
         elif self.model_a_difficulty:
             # This 'else' is important: the model exists, but the task failed the check
-            print(f"Model A (Difficulty): Failed relevance check for '{task_title}'. Skipping.")
+            logger.debug("Model A (Difficulty): Failed relevance check for %r. Skipping.", task_title)
         # ---------------------------------------
 
         # --- NEW LOGIC (Step 3 for Model B) ---
@@ -165,17 +218,17 @@ class MLModelService:
                     # Get the class with the highest probability
                     predicted_importance = self.model_b_personalization.classes_[probabilities.argmax()]
                     results["new_importance"] = int(predicted_importance)
-                    print(f"Model B (Importance): Passed checks. Predicted '{predicted_importance}' with {confidence:.2f} confidence.")
+                    logger.debug("Model B (Importance): Passed checks. Predicted %r with %.2f confidence.", predicted_importance, confidence)
                 else:
-                    print(f"Model B (Importance): Passed relevance, but FAILED confidence check ({confidence:.2f}). Skipping.")
+                    logger.debug("Model B (Importance): Passed relevance, but FAILED confidence check (%.2f). Skipping.", confidence)
 
             except NotFittedError:
-                    print(f"Warning: Personalization Model for user {self.user_id} is not fitted.")
+                    logger.warning("Personalization Model for user %s is not fitted.", self.user_id)
             except Exception as e:
                 # This can happen if the model was only trained on one class (e.g., user only ever set "5")
-                print(f"Error during importance prediction: {e}")
+                logger.error("Error during importance prediction: %s", e)
         elif self.model_b_personalization:
-            print(f"Model B (Importance): Failed relevance check for '{task_title}'. Skipping.")
+            logger.debug("Model B (Importance): Failed relevance check for %r. Skipping.", task_title)
         # ---------------------------------------
 
         # --- NEW LOGIC (Step 3 for Model C) ---
@@ -192,21 +245,22 @@ class MLModelService:
                     results["is_high_friction"] = (prediction == 1)
                     
                     if results["is_high_friction"]:
-                        print(f"Model C (Friction): Passed checks. Predicted HIGH friction with {confidence:.2f} confidence.")
+                        logger.debug("Model C (Friction): Passed checks. Predicted HIGH friction with %.2f confidence.", confidence)
                     else:
-                        print(f"Model C (Friction): Passed checks. Predicted LOW friction with {confidence:.2f} confidence.")
+                        logger.debug("Model C (Friction): Passed checks. Predicted LOW friction with %.2f confidence.", confidence)
                 else:
-                    print(f"Model C (Friction): Passed relevance, but FAILED confidence check ({confidence:.2f}). Skipping.")
+                    logger.debug("Model C (Friction): Passed relevance, but FAILED confidence check (%.2f). Skipping.", confidence)
             except NotFittedError:
-                    print(f"Warning: Friction Model for user {self.user_id} is not fitted.")
+                    logger.warning("Friction Model for user %s is not fitted.", self.user_id)
             except Exception as e:
-                print(f"Error during friction prediction: {e}")
+                logger.error("Error during friction prediction: %s", e)
         elif self.model_c_friction:
-            print(f"Model C (Friction): Failed relevance check for '{task_title}'. Skipping.")
+            logger.debug("Model C (Friction): Failed relevance check for %r. Skipping.", task_title)
         # ---------------------------------------
         
         return results
 
+    @metrics.ml_stage("smart_suggestion")
     def get_smart_suggestion(
         self, 
         task_id: int,
@@ -216,9 +270,8 @@ class MLModelService:
     ) -> Optional[Dict[str, Any]]: 
         """
         Generates a smart suggestion object based on ML output and our guardrails.
-        (No changes were needed to this function, as Model D is already safe)
+        Peak-window times are computed from the cached window table (no parsing).
         """
-        peak_windows = self.model_d_profile.get("peak_windows", [])
         suggestion_text = None
         suggestion_type = None
         suggestion_payload = None 
@@ -226,49 +279,36 @@ class MLModelService:
         # --- THIS IS THE NEW LOGIC BLOCK ---
 
         # 1. Check for "Hard Task" (Schedule) - THIS GETS HIGHEST PRIORITY
-        if is_hard and peak_windows:
-            try:
-                # --- NEW: Iterate through all peak windows ---
-                found_suitable_time = False
-                for time_str in peak_windows:
-                    suggested_time_obj = dateparser.parse(
-                        time_str, 
-                        settings={'PREFER_DATES_FROM': 'future', 'TIMEZONE': 'UTC', 'RETURN_AS_TIMEZONE_AWARE': True}
-                    )
-                    
-                    if not suggested_time_obj:
-                        continue # Try the next time
-
-                    # The Guardrail: Check if the peak time is before the deadline
-                    if task_due_date:
-                        # Make sure due_date is offset-aware for comparison
-                        aware_due_date = task_due_date.astimezone(datetime.timezone.utc) if task_due_date.tzinfo is None else task_due_date
-                        if suggested_time_obj > aware_due_date:
-                            # This peak time is too late, try the next one
-                            continue 
-                    
-                    # --- Found a valid time! ---
-                    suggestion_type = "schedule"
-                    suggestion_text = f"This seems like a high-effort task. You do your best work around {time_str}. Would you like to schedule it?"
-                    suggestion_payload = suggested_time_obj.isoformat()
-                    print(f"Suggestion: Task is Hard. Found valid peak time: {time_str}. Suggesting 'schedule'.")
-                    found_suitable_time = True
-                    break # Stop searching
-                
-                if not found_suitable_time:
-                    print(f"Guardrail: Task is hard, but no peak productivity times were found before its deadline.")
+        if is_hard and self.peak_windows:
+            now = datetime.datetime.now(datetime.timezone.utc)
+            aware_due_date = None
+            if task_due_date:
+                # Make sure due_date is offset-aware for comparison
+                aware_due_date = task_due_date.astimezone(datetime.timezone.utc) if task_due_date.tzinfo is None else task_due_date
 
-            except Exception as e:
-                print(f"Error during suggestion guardrail: {e}")
-                # Don't return, just fail scheduling
-                pass 
+            # Strongest window first; the first one that starts before the deadline wins
+            for window in self.peak_windows:
+                suggested_time_obj = window.next_occurrence(now)
+
+                # The Guardrail: Check if the peak time is before the deadline
+                if aware_due_date and suggested_time_obj > aware_due_date:
+                    continue # This peak time is too late, try the next one
+
+                # --- Found a valid time! ---
+                suggestion_type = "schedule"
+                suggestion_text = f"This seems like a high-effort task. You do your best work around {window.label}. Would you like to schedule it?"
+                suggestion_payload = suggested_time_obj.isoformat()
+                logger.debug("Suggestion: Task is Hard. Found valid peak time: %s. Suggesting 'schedule'.", window.label)
+                break # Stop searching
+            else:
+                logger.debug("Guardrail: Task is hard, but no peak productivity times were found before its deadline.")
         
         # 2. If no schedule suggestion was made, AND it's high friction, suggest "Split"
         if not suggestion_type and is_high_friction:
             suggestion_type = "split"
             suggestion_text = "This looks like a task you often avoid. Would you like to break it down into smaller sub-tasks?"
             suggestion_payload = task_id # Payload is the ID of the task to split
-            print("Suggestion: Task is High Friction (and not scheduled). Suggesting 'split'.")
+            logger.debug("Suggestion: Task is High Friction (and not scheduled). Suggesting 'split'.")
         
         # ---------------------------------------------------
         
@@ -291,7 +331,7 @@ def get_ml_service(user_id: int) -> MLModelService:
     Factory function to get a user's model service, loading or retrieving from cache.
     """
     if user_id not in model_cache:
-        print(f"No ML service in cache for user {user_id}. Loading models...")
+        logger.info("No ML service in cache for user %s. Loading models...", user_id)
         model_cache[user_id] = MLModelService(user_id)
     
     return model_cache[user_id]
\ No newline at end of file
@@ -1,34 +1,16 @@
 # backend/app/services/nlp_service.py
 
 import datetime
-import dateparser
-import google.generativeai as genai
 import json
-import re
+import logging
 import asyncio
 from typing import Optional, List, Dict, Any
 from fastapi import HTTPException
 
-# --- Import settings ---
-from ..core.config_loader import settings
+from ..core import llm_client, metrics
+from . import date_phrase_service, timezone_service
 
-# --- Configure Gemini API Client ---
-try:
-    if not settings.GEMINI_API_KEY:
-        raise ValueError("GEMINI_API_KEY is not set in environment variables.")
-    genai.configure(api_key=settings.GEMINI_API_KEY)
-    # --- Using your correct, preferred model ---
-    gemini_model = genai.GenerativeModel(
-        model_name='gemini-2.5-flash-preview-09-2025'
-    )
-    # ------------------------------------
-    print("✅ Gemini API configured successfully.")
-except ValueError as e:
-    print(f"❌ CONFIGURATION ERROR: {e}")
-    gemini_model = None
-except Exception as e:
-    print(f"❌ CRITICAL ERROR: Failed to configure Gemini API: {e}")
-    gemini_model = None
+logger = logging.getLogger(__name__)
 
 # --- Define the JSON Schema for Gemini's Output ---
 # This tells the model EXACTLY what structure we expect.
@@ -74,135 +56,54 @@ Respond ONLY with the valid JSON object matching the schema. Do not add any extr
 """
 
 # --- Main Parsing Function (Now Async) ---
-async def parse_task_from_text(text: str) -> Dict[str, Any]:
+async def parse_task_from_text(text: str, timezone_name: Optional[str] = None) -> Dict[str, Any]:
     """
     Parses a raw text string using the Gemini API (Flash model) with JSON mode.
     Extracts title, description, date description, metadata, and importance.
-    Parses the date description into a datetime object.
+    Parses the date description into a datetime object, reading relative
+    phrases ("tomorrow 5pm") in the user's timezone.
     """
+    gemini_model = llm_client.get_model("parse")
     if gemini_model is None:
         raise RuntimeError("Gemini API client is not initialized.")
 
     if not text or not text.strip():
         raise ValueError("Input text cannot be empty.")
 
-    print(f"--- Sending to Gemini: '{text}' ---")
+    user_tz = timezone_service.resolve_timezone(timezone_name)
+
+    logger.debug("Sending to Gemini: %r", text)
 
     try:
         # Make the asynchronous API call using JSON mode
-        response = await gemini_model.generate_content_async(
-            contents=text, # Pass the user text directly
-            generation_config={
-                "response_mime_type": "application/json",
-                "response_schema": GEMINI_JSON_SCHEMA
-            },
-             request_options={"timeout": 60} # Set a timeout (in seconds)
-        )
+        with metrics.track_dependency("gemini", "parse_task"):
+            response = await gemini_model.generate_content_async(
+                contents=text, # Pass the user text directly
+                generation_config={
+                    "response_mime_type": "application/json",
+                    "response_schema": GEMINI_JSON_SCHEMA
+                },
+                 request_options={"timeout": 60} # Set a timeout (in seconds)
+            )
 
         # Extract and parse the JSON response
         if not response.candidates or not response.candidates[0].content.parts:
              raise ValueError("Gemini API returned an empty response.")
 
         json_text = response.candidates[0].content.parts[0].text
-        print(f"--- Received from Gemini: {json_text} ---")
+        logger.debug("Received from Gemini: %s", json_text)
         parsed_json = json.loads(json_text)
 
         # --- Post-process the extracted data ---
 
-        # 1. Parse the date using dateparser
-        parsed_date: Optional[datetime.datetime] = None
-        due_date_desc = parsed_json.get("due_date_description")
-        
-        # --- MODIFICATION START ---
-        pre_processed_text = due_date_desc
-        
-        if pre_processed_text:
-            desc_lower = pre_processed_text.lower()
-            
-            # --- FIX 0: Handle "immediately" and "asap" (Your suggestion) ---
-            if re.search(r'\b(immediately|asap)\b', desc_lower):
-                # Set due date to 30 minutes from now (using local time)
-                parsed_date = datetime.datetime.now() + datetime.timedelta(minutes=30)
-                # Ensure it's timezone-aware
-                if parsed_date.tzinfo is None:
-                     parsed_date = parsed_date.astimezone()
-                print(f"--- 'ASAP/Immediately' detected. Setting due date to: {parsed_date} ---")
-                
-            # --- FIX 1: Handle "EOD" (End of Day) ---
-            elif 'eod' in desc_lower:
-                # Replace "EOD" with "5:00 PM" and let the parser handle the rest
-                pre_processed_text = re.sub(r'eod', '5:00 PM', pre_processed_text, flags=re.IGNORECASE)
-                print(f"--- 'EOD' detected. Parsing: '{pre_processed_text}' ---")
-                desc_lower = pre_processed_text.lower() # Update the lowercase version
-
-            # --- FIX 2: Handle "time-only" strings (Your suggestion) ---
-            time_only_regex = r'^(at\s*)?\d{1,2}(:\d{2})?(\s*(am|pm))?\s*$'
-            day_words_regex = r'monday|tuesday|wednesday|thursday|friday|saturday|sunday|today|tomorrow|next week'
-            
-            if parsed_date is None and re.match(time_only_regex, desc_lower) and not re.search(day_words_regex, desc_lower):
-                pre_processed_text = f"today {pre_processed_text}"
-                print(f"--- 'Time-only' detected. Parsing: '{pre_processed_text}' ---")
-
-            # --- FIX 3: Handle "ambiguous" strings (e.g., "tomorrow morning at 9 am") ---
-            time_of_day_words = r'morning|afternoon|evening'
-            am_pm_time = r'\d(\s*am|\s*pm|:\d{2})'
-            
-            if parsed_date is None and re.search(time_of_day_words, desc_lower) and re.search(am_pm_time, desc_lower):
-                pre_processed_text = re.sub(time_of_day_words, '', pre_processed_text, flags=re.IGNORECASE).strip()
-                print(f"--- Ambiguous time detected. Parsing: '{pre_processed_text}' ---")
-            
-            # --- Main Dateparser Call ---
-            if parsed_date is None:
-                try:
-                    # --- THIS IS THE FIX ---
-                    # We REMOVED 'TO_TIMEZONE': 'UTC'.
-                    # This makes dateparser return a datetime object that is
-                    # "aware" of the user's local timezone.
-                    parsed_date = dateparser.parse(
-                        pre_processed_text,
-                        settings={
-                            'PREFER_DATES_FROM': 'future',
-                            'RETURN_AS_TIMEZONE_AWARE': True,
-                            # 'TO_TIMEZONE': 'UTC',  <-- THIS WAS THE BUG
-                            'STRICT_PARSING': False 
-                        }
-                    )
-                    # -----------------------
-
-                    # --- FIX 4: Handle "day-only" strings (e.g., "tomorrow", "Friday", "Monday morning") ---
-                    if parsed_date and parsed_date.hour == 0 and parsed_date.minute == 0:
-                        original_desc_lower = due_date_desc.lower() if due_date_desc else ""
-                        has_explicit_time = re.search(r'\d{1,2}(\s*am|\s*pm|\s*o\'clock|:\d{2})', original_desc_lower)
-                        was_eod = "eod" in original_desc_lower
-
-                        if not has_explicit_time and not was_eod:
-                            if "morning" in original_desc_lower: 
-                                parsed_date = parsed_date.replace(hour=9)
-                            elif "noon" in original_desc_lower: 
-                                parsed_date = parsed_date.replace(hour=12)
-                            elif "afternoon" in original_desc_lower: 
-                                parsed_date = parsed_date.replace(hour=14)
-                            elif "evening" in original_desc_lower or "night" in original_desc_lower: 
-                                parsed_date = parsed_date.replace(hour=18)
-                            else:
-                                # --- THIS IS THE CHANGE ---
-                                # Default to 5 PM (17:00) instead of 9 AM
-                                parsed_date = parsed_date.replace(hour=17)
-                                # --------------------------
-                    # --- MODIFICATION END ---
-
-                except Exception as date_e:
-                    print(f"Warning: dateparser failed for '{due_date_desc}': {date_e}")
-                    parsed_date = None
+        # 1. Resolve the due-date phrase (see date_phrase_service)
+        parsed_date = date_phrase_service.resolve_due_date(parsed_json.get("due_date_description"), timezone_name)
 
         # --- THIS IS THE NEW DEFAULT DATE LOGIC ---
         if parsed_date is None:
-            print("--- No date/time found. Defaulting to today 5 PM. ---")
-            # Get today in local timezone
-            parsed_date = datetime.datetime.now().replace(hour=17, minute=0, second=0, microsecond=0)
-            # Ensure it's timezone-aware
-            if parsed_date.tzinfo is None:
-                parsed_date = parsed_date.astimezone()
+            logger.debug("No date/time found. Defaulting to today 5 PM.")
+            # Get today in the user's timezone
+            parsed_date = datetime.datetime.now(user_tz).replace(hour=17, minute=0, second=0, microsecond=0)
         # --- END NEW DEFAULT DATE LOGIC ---
 
         # 2. Assemble Metadata Dictionary
@@ -237,12 +138,12 @@ async def parse_task_from_text(text: str) -> Dict[str, Any]:
         final_importance = parsed_json.get("importance", 3)
         # Validate importance is within range
         if not isinstance(final_importance, int) or not (1 <= final_importance <= 5):
-            print(f"Warning: Received invalid importance '{final_importance}', defaulting to 3.")
+            logger.warning("Received invalid importance %r, defaulting to 3.", final_importance)
             final_importance = 3
         
         ask_completion_time = parsed_json.get("ask_completion_time", False)
         if not isinstance(ask_completion_time, bool):
-            print(f"Warning: Received invalid ask_completion_time '{ask_completion_time}', defaulting to False.")
+            logger.warning("Received invalid ask_completion_time %r, defaulting to False.", ask_completion_time)
             ask_completion_time = False
             
         # --- Return the dictionary expected by task_router ---
@@ -262,19 +163,19 @@ async def parse_task_from_text(text: str) -> Dict[str, Any]:
         }
 
     except json.JSONDecodeError as json_e:
-        print(f"🚨 ERROR: Failed to parse JSON response from Gemini: {json_e}")
-        print(f"Raw response text: {json_text if 'json_text' in locals() else 'N/A'}")
+        logger.error("Failed to parse JSON response from Gemini: %s", json_e)
+        logger.debug("Raw Gemini response text: %s", json_text if 'json_text' in locals() else 'N/A')
         raise RuntimeError(f"AI service returned invalid JSON: {json_e}")
     except Exception as e:
         # Catch other potential errors from the API call (network, authentication, rate limits etc.)
-        print(f"🚨 ERROR: Gemini API call failed: {type(e).__name__} - {e}")
+        logger.error("Gemini API call failed: %s - %s", type(e).__name__, e)
         # Consider more specific error handling based on google.api_core.exceptions if needed
         raise RuntimeError(f"AI service request failed: {e}")
 
 # --- Example Testing (Async) ---
 async def run_tests():
     """Runs async tests for the Gemini NLP service."""
-    if gemini_model:
+    if llm_client.get_model("parse"):
         test_texts = [
             "saturday evening i have meeting with clients at 4pm",
             "thursday evening i have meeting with clients at 4oclock",
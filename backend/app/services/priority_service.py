@@ -3,6 +3,8 @@
 import datetime
 from typing import Optional, Dict, Any # <-- Import Dict and Any
 
+from ..core import metrics
+
 # --- Define Weights for our Algorithm ---\
 # These can be tuned later
 WEIGHTS = {
@@ -20,6 +22,7 @@ IMPORTANCE_MAP = {
     5: 30    # Critical
 }
 
+@metrics.ml_stage("priority")
 def calculate_priority_score(
     due_date: Optional[datetime.datetime],
     importance: int, # User-defined, 1-5
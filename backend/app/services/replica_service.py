@@ -0,0 +1,87 @@
+# backend/app/services/replica_service.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict
+
+from fastapi import Depends
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..core.config_loader import settings
+from ..core.database import SessionLocal, ReplicaSessionLocal, replica_engine, engine
+from ..schemas.user_schema import Principal
+from . import auth_service, event_service
+
+# --- Configuration Constants ---
+READ_YOUR_WRITES_SECONDS = settings.DB_REPLICA_READ_YOUR_WRITES_SECONDS
+# -------------------------------
+
+# --- Read Replica Routing ---
+# Read-only endpoints take their session from get_read_db instead of
+# get_db. It hands out a replica session, unless the user wrote something
+# in the last READ_YOUR_WRITES_SECONDS: the replica may not have that
+# write yet, and a user must always see their own changes. Conditional
+# GETs read the ETag's change_version through this same session
+# (change_service.conditional_get), so the ETag always describes the data
+# we return, whichever database served it.
+
+
+# --- 1. Who Wrote Recently ---
+
+class RecentWriters:
+    """Per-worker record of when each user last wrote (thread-safe)."""
+
+    def __init__(self, window_seconds: float):
+        self._window = window_seconds
+        self._written_at: "OrderedDict[int, float]" = OrderedDict() # Oldest write first
+        self._lock = threading.Lock()
+
+    def note_write(self, user_id: int) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._written_at[user_id] = now
+            self._written_at.move_to_end(user_id)
+            # Forget writes that are out of the window
+            while self._written_at:
+                oldest_user_id, written_at = next(iter(self._written_at.items()))
+                if now - written_at <= self._window:
+                    break
+                del self._written_at[oldest_user_id]
+
+    def wrote_recently(self, user_id: int) -> bool:
+        written_at = self._written_at.get(user_id)
+        return written_at is not None and time.monotonic() - written_at <= self._window
+
+
+# --- Global Tracker ---
+recent_writers = RecentWriters(READ_YOUR_WRITES_SECONDS)
+
+
+# Writes committed by this worker count right away...
+@event.listens_for(Session, "after_commit", insert=True) # Before user_cache_service pops the set
+def _note_writes_after_commit(session: Session) -> None:
+    for user_id in session.info.get("changed_user_ids", ()):
+        recent_writers.note_write(user_id)
+
+# ...and every worker's writes arrive as events (task.*, user.updated, ...)
+def _note_write_on_event(event_data: Dict[str, Any]) -> None:
+    recent_writers.note_write(event_data["user_id"])
+
+event_service.event_hub.add_listener(_note_write_on_event)
+
+
+# --- 2. The Dependency ---
+
+def get_read_db(current_user: Principal = Depends(auth_service.get_current_principal)):
+    """
+    get_db for read-only endpoints: a replica session when it is safe to
+    use one, otherwise a primary session. Never write through it.
+    """
+    use_primary = replica_engine is engine or recent_writers.wrote_recently(current_user.id)
+    db = SessionLocal() if use_primary else ReplicaSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
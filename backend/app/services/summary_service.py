@@ -1,33 +1,19 @@
 # backend/app/services/summary_service.py
 
-import google.generativeai as genai
 import datetime
 import json
+import logging
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import List, Dict, Any, Optional
 
-from ..core.config_loader import settings
+from ..core import llm_client, metrics
 from ..models.user_model import User
 from ..models.log_model import UserLog
 from ..schemas.summary_schema import WeeklySummary
 from ..services import insights_service # Import to get heatmap data
 
-# --- Configure Gemini API Client ---
-try:
-    if not settings.GEMINI_API_KEY:
-        raise ValueError("GEMINI_API_KEY is not set in environment variables.")
-    genai.configure(api_key=settings.GEMINI_API_KEY)
-    
-    # --- FIX: Use user-requested model ---
-    gemini_model = genai.GenerativeModel(
-        model_name='gemini-2.5-flash-preview-09-2025'
-    )
-    # -------------------------------------
-    print("✅ Gemini Summary Service configured successfully.")
-except Exception as e:
-    print(f"❌ CRITICAL ERROR: Failed to configure Gemini Summary Service: {e}")
-    gemini_model = None
+logger = logging.getLogger(__name__)
 
 # --- System Prompt for the Summarizer ---
 SYSTEM_PROMPT = """
@@ -60,6 +46,7 @@ async def generate_new_summary(heatmap_data: List[Dict[str, Any]], recent_logs:
     Generates a new summary by calling the Gemini API.
     This function is now purely for generation and does no DB access.
     """
+    gemini_model = llm_client.get_model("summary")
     if gemini_model is None:
         raise RuntimeError("Gemini Summary Service is not initialized.")
 
@@ -91,21 +78,22 @@ async def generate_new_summary(heatmap_data: List[Dict[str, Any]], recent_logs:
     
     try:
         # 3. Call the Gemini API
-        response = await gemini_model.generate_content_async(
-            contents=[
-                SYSTEM_PROMPT, # Start with the system prompt
-                data_prompt    # Follow with the user data
-            ],
-            generation_config={
-                "response_mime_type": "text/plain", 
-            },
-            request_options={"timeout": 90}
-        )
+        with metrics.track_dependency("gemini", "weekly_summary"):
+            response = await gemini_model.generate_content_async(
+                contents=[
+                    SYSTEM_PROMPT, # Start with the system prompt
+                    data_prompt    # Follow with the user data
+                ],
+                generation_config={
+                    "response_mime_type": "text/plain", 
+                },
+                request_options={"timeout": 90}
+            )
 
         return response.text
 
     except Exception as e:
-        print(f"🚨 ERROR: Gemini Summary call failed: {type(e).__name__} - {e}")
+        logger.error("Gemini Summary call failed: %s - %s", type(e).__name__, e)
         # Return a user-friendly error in HTML format
         error_html = f"""
         <p><strong>Error Generating Summary</strong></p>
@@ -0,0 +1,100 @@
+# backend/app/services/timezone_service.py
+
+import datetime
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from fastapi import Depends
+
+from ..models.user_model import User
+from ..schemas.user_schema import Principal
+from . import auth_service
+
+# --- Configuration Constants ---
+# Used for users who have not picked a timezone (and for bad stored values)
+DEFAULT_TIMEZONE = "Asia/Kolkata"
+# -------------------------------
+
+
+# --- 1. Cached Timezone Resolver ---
+
+@lru_cache(maxsize=512)
+def _load_zone(name: str) -> datetime.tzinfo:
+    return ZoneInfo(name)
+
+def is_valid_timezone(name: Optional[str]) -> bool:
+    """True if 'name' is an IANA timezone key we can load (e.g. 'Europe/Berlin')."""
+    if not name:
+        return False
+    try:
+        _load_zone(name)
+        return True
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+
+def resolve_timezone(name: Optional[str]) -> datetime.tzinfo:
+    """
+    Returns the tzinfo for an IANA name, falling back to DEFAULT_TIMEZONE.
+    Results are cached, so this is cheap to call on every request.
+    """
+    if is_valid_timezone(name):
+        return _load_zone(name)
+    try:
+        return _load_zone(DEFAULT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        # Fallback if the system has no tz database (IST is UTC+05:30)
+        return datetime.timezone(datetime.timedelta(hours=5, minutes=30))
+
+def get_user_timezone_name(user: Union[User, Principal]) -> str:
+    return user.timezone if is_valid_timezone(user.timezone) else DEFAULT_TIMEZONE
+
+
+# --- 2. Shared Day-Window Helper ---
+
+@dataclass(frozen=True)
+class DayWindow:
+    """
+    The user's "today", computed once per request. All bounds are
+    timezone-aware, so they can be compared directly against our
+    timestamptz columns.
+    """
+    tz: datetime.tzinfo
+    now: datetime.datetime          # Current time in the user's timezone
+    today_start: datetime.datetime  # Local midnight
+    today_end: datetime.datetime    # Next local midnight
+
+    @property
+    def local_date(self) -> datetime.date:
+        return self.today_start.date()
+
+    def days_before_today(self, days: int) -> datetime.datetime:
+        """Local midnight 'days' days before today."""
+        return self.today_start - datetime.timedelta(days=days)
+
+    def days_after_today(self, days: int) -> datetime.datetime:
+        """Local midnight 'days' days after today (1 == today_end)."""
+        return self.today_start + datetime.timedelta(days=days)
+
+def get_day_window(timezone_name: Optional[str]) -> DayWindow:
+    tz = resolve_timezone(timezone_name)
+    now_local = datetime.datetime.now(tz)
+    today_start = now_local.replace(hour=0, minute=0, second=0, microsecond=0)
+    return DayWindow(
+        tz=tz,
+        now=now_local,
+        today_start=today_start,
+        # Aware + timedelta is wall-clock arithmetic, so this stays correct across DST changes
+        today_end=today_start + datetime.timedelta(days=1),
+    )
+
+
+# --- 3. Request Dependency ---
+# FastAPI caches dependency results per request, so every consumer
+# (the ETag check, the date filters, ...) shares one DayWindow.
+
+def get_request_day_window(
+    current_user: Principal = Depends(auth_service.get_current_principal)
+) -> DayWindow:
+    return get_day_window(current_user.timezone)
@@ -0,0 +1,140 @@
+# backend/app/services/user_cache_service.py
+
+import threading
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..core.config_loader import settings
+from ..models.user_model import User
+from ..schemas.user_schema import Principal
+from . import event_service
+
+# --- Configuration Constants ---
+CACHE_TTL_SECONDS = settings.AUTH_USER_CACHE_TTL_SECONDS   # Upper bound on how stale a snapshot can get
+CACHE_MAX_ENTRIES = settings.AUTH_USER_CACHE_MAX_ENTRIES   # Per worker
+# -------------------------------
+
+
+# --- 1. The Cache ---
+
+class UserCache:
+    """
+    A small per-worker cache of Principal snapshots keyed by user ID, so an
+    authenticated read does not need a DB round-trip just to load the user.
+
+    Entries are dropped as soon as any user write commits (in this worker
+    directly, in other workers via the event hub), and expire after
+    CACHE_TTL_SECONDS in case an invalidation is ever missed.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: Dict[int, Tuple[float, Principal]] = {}
+        self._lock = threading.Lock() # Sync endpoints run in a thread pool
+        # Bumped on every invalidation; see put()
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, principal = entry
+        if expires_at < time.monotonic():
+            with self._lock:
+                self._entries.pop(user_id, None)
+            return None
+        return principal
+
+    def put(self, principal: Principal, generation: int) -> None:
+        """
+        Stores a snapshot loaded while the cache was at 'generation'.
+        If anything was invalidated since, the snapshot may already be stale
+        (a write committed between our SELECT and now), so it is not stored.
+        """
+        if self._ttl <= 0:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            if len(self._entries) >= self._max_entries:
+                # Drop the oldest insert (dicts keep insertion order)
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[principal.id] = (time.monotonic() + self._ttl, principal)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+# --- Global Cache ---
+user_cache = UserCache(CACHE_TTL_SECONDS, CACHE_MAX_ENTRIES)
+
+
+# --- 2. Invalidation on Commit ---
+# Anything that changes a user's row (streaks, timezone, tokens, or the
+# change_version bump from change_service) marks the user here. When the
+# transaction commits we drop the local entry. Real changes to the row
+# also send a 'user.updated' event (with the same commit) that tells the
+# other workers and the user's event streams. A bare change_version bump
+# does not: it comes with its own task.* event, which other workers
+# already invalidate on, and ETags read the version from the database.
+
+def mark_user_changed(session: Session, user_id: int, notify: bool = True) -> None:
+    """
+    Call for any user whose row this transaction writes outside the ORM.
+    notify=False only drops this worker's entry (no 'user.updated' event).
+    """
+    session.info.setdefault("changed_user_ids", set()).add(user_id)
+    if notify:
+        session.info.setdefault("notify_user_ids", set()).add(user_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, flush_context) -> None:
+    for obj in session.dirty | session.deleted:
+        if isinstance(obj, User) and obj.id is not None and session.is_modified(obj):
+            mark_user_changed(session, obj.id)
+
+    changed: Set[int] = session.info.get("notify_user_ids", set())
+    notified: Set[int] = session.info.setdefault("notified_user_ids", set())
+    for user_id in sorted(changed - notified):
+        event_service.publish(session, user_id, event_service.USER_UPDATED, {})
+        notified.add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    session.info.pop("notified_user_ids", None)
+    session.info.pop("notify_user_ids", None)
+    for user_id in session.info.pop("changed_user_ids", ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    # Nothing was written (and the NOTIFYs were rolled back with it)
+    session.info.pop("notified_user_ids", None)
+    session.info.pop("notify_user_ids", None)
+    session.info.pop("changed_user_ids", None)
+
+
+def _invalidate_on_event(event_data: Dict[str, Any]) -> None:
+    # Any event for a user means their row (at least change_version) moved on
+    user_cache.invalidate(event_data["user_id"])
+
+
+event_service.event_hub.add_listener(_invalidate_on_event)
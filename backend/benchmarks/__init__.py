@@ -0,0 +1,11 @@
+# backend/benchmarks/__init__.py
+
+"""
+Reproducible benchmarks for the backend: a seeded Postgres data set
+(seed.py), local fakes for Gemini and Google (fakes.py) and the API
+benchmark runner (run.py, `python -m benchmarks.run --help`), offline
+micro-benchmarks of the hot service functions with a regression check
+(micro.py), a bulk generator of large synthetic histories
+(generate_data.py), and an import-time budget check for worker startup
+(import_time.py).
+"""
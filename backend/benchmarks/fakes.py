@@ -0,0 +1,104 @@
+# backend/benchmarks/fakes.py
+
+"""
+Deterministic local stand-ins for the external services, so a benchmark
+measures our code and not Gemini's or Google's mood that day.
+
+- Google (OAuth token endpoint, certs, Calendar): scripts/mock_google_api.py,
+  started in-process. start_fake_google() must run BEFORE the app is
+  imported, because the Google URLs are read from the settings at import.
+- Gemini: FakeGeminiModel replaces llm_client's model for each purpose
+  (nlp_service, summary_service, ai_tools_service). Its answers depend
+  only on the prompt, and it waits a fixed latency (like a remote call,
+  without holding the event loop).
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import types
+from typing import Any, Tuple
+
+from scripts.mock_google_api import MockGoogleServer, start_mock_server
+
+# Phrases the fake "understands" as due dates (the workload generator uses the same list)
+DATE_PHRASES = (
+    "today 5pm", "tomorrow 9am", "tomorrow 5pm", "friday 3pm", "next monday 10am",
+    "in 2 days", "next week", "eod", "asap", "saturday morning",
+)
+_DATE_PHRASE_PATTERN = re.compile(r"\b(" + "|".join(re.escape(p) for p in DATE_PHRASES) + r")\b", re.IGNORECASE)
+
+
+# --- 1. Google ---
+
+def start_fake_google(latency_ms: float = 0) -> Tuple[MockGoogleServer, str]:
+    """Starts the mock Google server and points the app's settings at it."""
+    server, base_url = start_mock_server(latency_ms=latency_ms)
+    os.environ["GOOGLE_API_BASE_URL"] = base_url
+    os.environ["GOOGLE_TOKEN_URI"] = f"{base_url}/token"
+    os.environ["GOOGLE_CERTS_URL"] = f"{base_url}/oauth2/v1/certs"
+    return server, base_url
+
+
+# --- 2. Gemini ---
+
+def _digest(text: str) -> int:
+    return int.from_bytes(hashlib.sha256(text.encode()).digest()[:4], "big")
+
+def _response(text: str) -> Any:
+    part = types.SimpleNamespace(text=text)
+    candidate = types.SimpleNamespace(content=types.SimpleNamespace(parts=[part]))
+    return types.SimpleNamespace(candidates=[candidate], text=text)
+
+class FakeGeminiModel:
+    """Answers generate_content_async() like the real model would for each service."""
+
+    def __init__(self, kind: str, latency_ms: float = 0):
+        self.kind = kind # "parse", "summary" or "split"
+        self.latency = latency_ms / 1000
+        self.calls = 0
+
+    async def generate_content_async(self, contents, **kwargs) -> Any:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        prompt = contents if isinstance(contents, str) else "\n".join(contents)
+        return _response(getattr(self, f"_{self.kind}")(prompt))
+
+    def _parse(self, text: str) -> str:
+        digest = _digest(text)
+        match = _DATE_PHRASE_PATTERN.search(text)
+        title = _DATE_PHRASE_PATTERN.sub("", text).strip(" ,.") or "New Task"
+        importance = 5 if re.search(r"\b(urgent|asap)\b", text, re.IGNORECASE) else 2 + digest % 3
+        return json.dumps({
+            "title": title[:1].upper() + title[1:],
+            "description": None,
+            "due_date_description": match.group(1) if match else None,
+            "tags": ["benchmark"] if digest % 4 == 0 else [],
+            "people": [],
+            "locations": [],
+            "apps": [],
+            "importance": importance,
+            "ask_completion_time": digest % 2 == 0,
+        })
+
+    def _summary(self, prompt: str) -> str:
+        completed = re.search(r"Total Tasks Completed \(Last 7 Days\): (\d+)", prompt)
+        return (
+            "<h3>Your Week</h3>"
+            f"<p>You completed {completed.group(1) if completed else 0} tasks this week. Keep it up!</p>"
+        )
+
+    def _split(self, prompt: str) -> str:
+        count = 3 + _digest(prompt) % 3
+        return json.dumps({"sub_tasks": [f"Step {i + 1}" for i in range(count)]})
+
+
+def install_fake_gemini(latency_ms: float = 0) -> None:
+    """Swaps the Gemini model of every service for a fake."""
+    from app.core import llm_client
+
+    for purpose in ("parse", "summary", "split"):
+        llm_client.set_model(purpose, FakeGeminiModel(purpose, latency_ms))
@@ -0,0 +1,275 @@
+# backend/benchmarks/generate_data.py
+
+"""
+Synthetic data generator: bulk-loads production-sized users, tasks and
+user_logs histories into the database from .env with COPY, so the ML
+trainer, insights_service and recalculate_priorities.py can be exercised
+at scale locally.
+
+Each user gets a task history over --days:
+
+- activity follows --distribution ('uniform', 'lognormal', or 'pareto'
+  for a few power users and a long tail)
+- tasks are created, sometimes edited (update_diff with the user's own
+  preferred importance for that kind of task), snoozed (old/new due
+  date), deleted (task gone, log kept with task_id NULL) or completed
+  (completion_time_minutes that depends on the kind of task)
+- completions cluster in the user's own peak days/hours (in their
+  timezone), so the heatmap and productivity profile have a signal
+
+The same --seed gives the same data. Generated users have emails under
+SYNTHETIC_EMAIL_DOMAIN; --clear removes them (and everything they own).
+Run from the backend/ directory:
+
+    python -m benchmarks.generate_data --users 10000 --tasks-per-user 300 --days 365
+    python -m benchmarks.generate_data --clear
+"""
+
+import argparse
+import csv
+import datetime
+import io
+import json
+import math
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+from zoneinfo import ZoneInfo
+
+# Add the 'backend' directory to the path so we can import our 'app' module
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sqlalchemy import delete, select
+
+from app.core.database import engine
+from app.models.log_model import UserLog
+from app.models.task_model import Task
+from app.models.tombstone_model import TaskTombstone
+from app.models.user_model import User
+from benchmarks.seed import TASK_OBJECTS, TASK_VERBS, TIMEZONES, task_snapshot
+
+SYNTHETIC_EMAIL_DOMAIN = "synthetic.example.com"
+
+USER_COLUMNS = ("id", "email", "full_name", "is_active", "has_finalized_signup", "timezone")
+TASK_COLUMNS = (
+    "id", "title", "description", "priority_score", "due_date", "created_at", "completed",
+    "task_metadata", "importance", "ask_completion_time", "owner_id",
+)
+LOG_COLUMNS = ("action", "task_snapshot", "timestamp", "user_id", "task_id")
+
+# Peak windows a user can have: (weekdays, local hours)
+PEAK_DAYS = ((0, 1, 2), (1, 2, 3), (2, 3, 4), (0, 2, 4), (5, 6))
+PEAK_HOURS = ((8, 9, 10), (10, 11), (13, 14, 15), (15, 16, 17), (19, 20, 21))
+PEAK_SHARE = 0.7 # Share of completions that land in the user's peak window
+
+# Per-task outcome probabilities (the rest stay open)
+DELETE_RATE = 0.08
+EDIT_RATE = 0.15
+SNOOZE_RATE = 0.2 # Chance of each further snooze
+
+
+# --- 1. Per-user Behaviour ---
+
+def _activity(rng: random.Random, distribution: str) -> float:
+    """A multiplier with mean ~1 for the user's number of tasks."""
+    if distribution == "pareto":
+        return rng.paretovariate(1.5) / 3.0 # Pareto(1.5) has mean 3
+    if distribution == "lognormal":
+        return rng.lognormvariate(0, 1) / math.exp(0.5)
+    return rng.uniform(0.5, 1.5)
+
+class UserProfile:
+    """What makes one user's history look like a person's, not noise."""
+
+    def __init__(self, rng: random.Random):
+        self.timezone = ZoneInfo(rng.choice(TIMEZONES))
+        self.peak_days = rng.choice(PEAK_DAYS)
+        self.peak_hours = rng.choice(PEAK_HOURS)
+        self.completion_rate = rng.uniform(0.45, 0.85)
+        # How this user sees each kind of task
+        self.preferred_importance = {obj: rng.randint(1, 5) for obj in TASK_OBJECTS}
+        self.typical_minutes = {obj: rng.choice((10, 15, 30, 45, 60, 90, 120)) for obj in TASK_OBJECTS}
+        self.friction = {obj: rng.random() for obj in TASK_OBJECTS} # Likelihood to snooze/delete
+
+    def completion_time(self, rng: random.Random, after: datetime.datetime, now: datetime.datetime) -> datetime.datetime:
+        """A completion moment after `after`, usually inside the user's peak window (in UTC)."""
+        local = after.astimezone(self.timezone) + datetime.timedelta(days=rng.expovariate(1 / 2.0))
+        if rng.random() < PEAK_SHARE:
+            # Move forward to the next peak day, at a peak hour
+            while local.weekday() not in self.peak_days:
+                local += datetime.timedelta(days=1)
+            local = local.replace(hour=rng.choice(self.peak_hours), minute=rng.randrange(60))
+        moment = local.astimezone(datetime.timezone.utc)
+        return min(max(moment, after + datetime.timedelta(minutes=5)), now)
+
+
+# --- 2. Generating Rows ---
+
+def _generate_user(
+    rng: random.Random, user_id: int, task_ids: List[int], profile: UserProfile,
+    days: int, now: datetime.datetime, seed: int
+) -> Tuple[tuple, List[tuple], List[tuple]]:
+    user_row = (user_id, f"synthetic-{seed}-{user_id}@{SYNTHETIC_EMAIL_DOMAIN}", f"Synthetic User {user_id}", True, True, profile.timezone.key)
+    task_rows: List[tuple] = []
+    log_rows: List[tuple] = []
+
+    def log(action: str, task: Dict[str, Any], task_id: int, at: datetime.datetime, **action_data) -> None:
+        snapshot = task_snapshot(task, task_id)
+        snapshot.update(action_data)
+        # user_logs.timestamp is naive UTC
+        log_rows.append((action, json.dumps(snapshot), at.replace(tzinfo=None).isoformat(), user_id, task_id))
+
+    for task_id in task_ids:
+        obj = rng.choice(TASK_OBJECTS)
+        created_at = now - datetime.timedelta(seconds=rng.uniform(0, days * 86400))
+        task = {
+            "title": f"{rng.choice(TASK_VERBS)} {obj}",
+            "due_date": created_at + datetime.timedelta(days=rng.lognormvariate(0.7, 0.8)),
+            "created_at": created_at,
+            "importance": rng.choice((3, 3, 3, 4, 2)), # What the NLP would have guessed
+            "priority_score": 0.0,
+            "completed": False,
+            "task_metadata": {},
+        }
+        task["priority_score"] = round(task["importance"] * 10 + rng.uniform(0, 30), 2)
+        moment = created_at
+
+        if rng.random() < EDIT_RATE and task["importance"] != profile.preferred_importance[obj]:
+            moment += datetime.timedelta(minutes=rng.uniform(1, 600))
+            old, task["importance"] = task["importance"], profile.preferred_importance[obj]
+            log("edited", task, task_id, min(moment, now), update_diff={"importance": {"old": old, "new": task["importance"]}})
+
+        while rng.random() < SNOOZE_RATE * (0.5 + profile.friction[obj]) and moment < now:
+            moment += datetime.timedelta(hours=rng.uniform(1, 48))
+            old_due = task["due_date"]
+            task["due_date"] = old_due + datetime.timedelta(days=rng.choice((1, 1, 2, 7)))
+            log("snoozed", task, task_id, min(moment, now), old_due_date=old_due.isoformat(), new_due_date=task["due_date"].isoformat())
+
+        if rng.random() < DELETE_RATE * (0.5 + profile.friction[obj]):
+            moment += datetime.timedelta(hours=rng.uniform(1, 72))
+            log("deleted", task, task_id, min(moment, now))
+            # The task row is gone, so its logs no longer point at it (ON DELETE SET NULL)
+            first = next(i for i, row in enumerate(log_rows) if row[4] == task_id)
+            log_rows[first:] = [row[:4] + (None,) for row in log_rows[first:]]
+            continue
+
+        if rng.random() < profile.completion_rate and moment < now:
+            task["completed"] = True
+            minutes = max(1, round(rng.gauss(profile.typical_minutes[obj], profile.typical_minutes[obj] * 0.25)))
+            log("completed", task, task_id, profile.completion_time(rng, moment, now),
+                completion_time_minutes=minutes if rng.random() < 0.7 else 0) # 'completed_basic' logs 0
+
+        task_rows.append((
+            task_id, task["title"], None, task["priority_score"], task["due_date"].isoformat(),
+            task["created_at"].isoformat(), task["completed"], json.dumps(task["task_metadata"]),
+            task["importance"], False, user_id,
+        ))
+
+    return user_row, task_rows, log_rows
+
+
+# --- 3. Loading with COPY ---
+
+def _reserve_ids(cursor, table: str, count: int) -> List[int]:
+    """Takes `count` ids from the table's sequence, so rows can reference each other before COPY."""
+    if count == 0:
+        return []
+    cursor.execute(f"SELECT nextval(pg_get_serial_sequence('{table}', 'id')) FROM generate_series(1, %s)", (count,))
+    return [row[0] for row in cursor.fetchall()]
+
+def _copy(cursor, table: str, columns: Tuple[str, ...], rows: List[tuple]) -> None:
+    if not rows:
+        return
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows) # None -> empty field -> NULL
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def clear_synthetic_data() -> None:
+    synthetic_users = select(User.id).where(User.email.like(f"%@{SYNTHETIC_EMAIL_DOMAIN}"))
+    with engine.begin() as conn:
+        conn.execute(delete(UserLog).where(UserLog.user_id.in_(synthetic_users)))
+        conn.execute(delete(TaskTombstone).where(TaskTombstone.owner_id.in_(synthetic_users)))
+        conn.execute(delete(Task).where(Task.owner_id.in_(synthetic_users)))
+        conn.execute(delete(User).where(User.id.in_(synthetic_users)))
+
+
+def generate(args) -> Dict[str, int]:
+    rng = random.Random(args.seed)
+    now = datetime.datetime.now(datetime.timezone.utc).replace(second=0, microsecond=0)
+    totals = {"users": 0, "tasks": 0, "logs": 0}
+    started = time.perf_counter()
+
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for first in range(0, args.users, args.batch_users):
+            batch = min(args.batch_users, args.users - first)
+            profiles = [UserProfile(rng) for _ in range(batch)]
+            task_counts = [
+                max(1, min(round(args.tasks_per_user * _activity(rng, args.distribution)), args.tasks_per_user * 50))
+                for _ in range(batch)
+            ]
+            user_ids = _reserve_ids(cursor, "users", batch)
+            task_ids = iter(_reserve_ids(cursor, "tasks", sum(task_counts)))
+
+            users, tasks, logs = [], [], []
+            for user_id, profile, count in zip(user_ids, profiles, task_counts):
+                user_row, task_rows, log_rows = _generate_user(
+                    rng, user_id, [next(task_ids) for _ in range(count)], profile, args.days, now, args.seed
+                )
+                users.append(user_row)
+                tasks.extend(task_rows)
+                logs.extend(log_rows)
+
+            # Parents first (foreign keys); one transaction per batch
+            _copy(cursor, "users", USER_COLUMNS, users)
+            _copy(cursor, "tasks", TASK_COLUMNS, tasks)
+            _copy(cursor, "user_logs", LOG_COLUMNS, logs)
+            raw.commit()
+
+            totals["users"] += len(users)
+            totals["tasks"] += len(tasks)
+            totals["logs"] += len(logs)
+            elapsed = time.perf_counter() - started
+            print(
+                f"  {totals['users']:>9,} users  {totals['tasks']:>11,} tasks  {totals['logs']:>11,} logs  "
+                f"({(totals['tasks'] + totals['logs']) / elapsed:,.0f} rows/s)"
+            )
+
+        # Fresh planner statistics, or the first queries plan for empty tables
+        raw.set_session(autocommit=True)
+        cursor.execute("ANALYZE users, tasks, user_logs")
+    finally:
+        raw.close()
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000, help="Users to generate.")
+    parser.add_argument("--tasks-per-user", type=int, default=200, help="Average tasks per user.")
+    parser.add_argument("--distribution", choices=("uniform", "lognormal", "pareto"), default="pareto",
+                        help="How activity is spread over users.")
+    parser.add_argument("--days", type=int, default=180, help="Time span of the histories, ending now.")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for reproducible data.")
+    parser.add_argument("--batch-users", type=int, default=200, help="Users generated and loaded per COPY batch.")
+    parser.add_argument("--clear", action="store_true", help="Only delete previously generated data.")
+    args = parser.parse_args()
+
+    print("--- Removing previously generated data ---")
+    clear_synthetic_data()
+    if args.clear:
+        return
+
+    print(f"--- Generating {args.users:,} users x ~{args.tasks_per_user} tasks over {args.days} days ({args.distribution}, seed {args.seed}) ---")
+    started = time.perf_counter()
+    totals = generate(args)
+    print(f"Done in {time.perf_counter() - started:.1f}s: {totals['users']:,} users, {totals['tasks']:,} tasks, {totals['logs']:,} logs.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# backend/benchmarks/import_time.py
+
+"""
+Import-time budget for the API: imports app.main in a fresh interpreter
+with `python -X importtime` and checks that
+
+- the whole import stays under --budget-ms (default 2000 ms), and
+- none of the heavy libraries (ML, Gemini, Google API discovery,
+  dateparser, passlib) are imported. The services load them on first
+  use, or in main.py's lifespan, so a worker starts quickly and a
+  module-level import of one of them is a regression.
+
+The exit status is 1 if either check fails. Run from the backend/
+directory:
+
+    python -m benchmarks.import_time --top 15
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_BUDGET_MS = 2000.0
+DEFAULT_TOP = 10
+# Must not be imported by `import app.main` (see the module docstring)
+HEAVY_MODULES = (
+    "sklearn", "joblib", "pandas", "scipy",
+    "google.generativeai", "googleapiclient.discovery", "googleapiclient.http",
+    "google_auth_oauthlib", "dateparser", "passlib",
+)
+
+
+def measure_imports(module: str) -> List[Tuple[str, int, int]]:
+    """(module, self µs, cumulative µs) for every module imported by 'import <module>'."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"'import {module}' failed:\n{result.stderr}")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit(): # The header line
+            continue
+        imports.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return imports
+
+def find_heavy_imports(imported: Dict[str, int]) -> List[str]:
+    return sorted(
+        name for name in imported
+        if any(name == heavy or name.startswith(heavy + ".") for heavy in HEAVY_MODULES)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main", help="Module to import (default: app.main)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="Show the N slowest imports (by self time)")
+    args = parser.parse_args()
+
+    imports = measure_imports(args.module)
+    cumulative = {name: cumulative_us for name, _, cumulative_us in imports}
+    if args.module not in cumulative:
+        print(f"No import time reported for {args.module}.")
+        sys.exit(1)
+    total_ms = cumulative[args.module] / 1000
+
+    print(f"Slowest imports (self time) for 'import {args.module}':")
+    for name, self_us, cumulative_us in sorted(imports, key=lambda entry: entry[1], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  (cumulative {cumulative_us / 1000:8.1f} ms)  {name}")
+
+    failed = False
+    status = "OK" if total_ms <= args.budget_ms else "OVER BUDGET"
+    print(f"\nTotal: {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms) {status}")
+    failed |= total_ms > args.budget_ms
+
+    heavy = find_heavy_imports(cumulative)
+    if heavy:
+        print("Heavy modules imported at startup (import them where they are used):")
+        for name in heavy:
+            print(f"  {name} ({cumulative[name] / 1000:.1f} ms)")
+        failed = True
+    else:
+        print("No heavy modules imported at startup.")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
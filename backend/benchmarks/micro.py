@@ -0,0 +1,361 @@
+# backend/benchmarks/micro.py
+
+"""
+Micro-benchmarks for the pure-Python functions on the request path. They
+run offline (no database, no Gemini) with representative inputs, and are
+compared against a saved baseline, so a change that makes one of them
+slower shows up before it reaches the API benchmark:
+
+    python -m benchmarks.micro --save-baseline      (on the base commit)
+    python -m benchmarks.micro                      (after the change)
+
+A benchmark whose median time per call grows by more than --threshold
+(default 25%) over the baseline is reported as a regression and the
+exit status is 1. Baselines are machine-specific: compare runs from the
+same machine only. Run from the backend/ directory; --filter nlp runs
+the benchmarks whose name contains 'nlp'.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import datetime
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple
+
+# Add the 'backend' directory to the path so we can import our 'app' module
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "micro-baseline.json"
+DEFAULT_THRESHOLD = 0.25
+MIN_ROUND_SECONDS = 0.05 # Calls per round are calibrated to last at least this long
+MAX_LOOPS = 100_000
+
+# Gemini answers for the NLP post-processing benchmark: one per branch of
+# the due-date handling (ASAP, EOD, time-only, ambiguous, day-only, none)
+NLP_ANSWERS = (
+    {"title": "Fix the login bug", "due_date_description": "asap", "importance": 5, "ask_completion_time": True},
+    {"title": "Server deployment", "due_date_description": "EOD", "importance": 4, "ask_completion_time": True,
+     "apps": ["Jenkins", "jenkins", " Slack "]},
+    {"title": "Call mom", "due_date_description": "5pm", "importance": 3, "ask_completion_time": False},
+    {"title": "Meeting with clients", "due_date_description": "saturday evening at 4pm", "importance": 4,
+     "ask_completion_time": False, "people": ["clients"], "locations": ["office"]},
+    {"title": "Submit expenses", "due_date_description": "friday", "importance": 3, "ask_completion_time": False},
+    {"title": "Review mockups", "due_date_description": "next wednesday at 3pm", "importance": 3,
+     "ask_completion_time": True, "people": ["Alex"], "tags": ["ProjectPhoenix"]},
+    {"title": "Buy milk", "due_date_description": None, "importance": 2, "ask_completion_time": False},
+)
+
+
+class Benchmark(NamedTuple):
+    name: str
+    # () -> the function to time (setup happens once, outside the timing)
+    setup: Callable[[], Callable[[], Any]]
+    warmup: int # Untimed calls first, enough to reach every input once
+
+BENCHMARKS: List[Benchmark] = []
+
+def benchmark(name: str, warmup: int = 1):
+    def register(setup):
+        BENCHMARKS.append(Benchmark(name, setup, warmup))
+        return setup
+    return register
+
+
+# --- 1. The Benchmarks ---
+
+NLP_TIMEZONES = ("Asia/Kolkata", "America/New_York", "UTC")
+
+# dateparser's first parse of a phrase (per timezone) takes seconds; warm all of them
+@benchmark("nlp.post_process", warmup=len(NLP_ANSWERS) * len(NLP_TIMEZONES))
+def _nlp_post_process():
+    from app.core import llm_client
+    from app.services import nlp_service
+    from benchmarks.fakes import _response
+
+    class CannedGemini:
+        """Returns the next NLP_ANSWERS entry, so only our post-processing is timed."""
+        def __init__(self):
+            self.answers = [_response(json.dumps(answer)) for answer in NLP_ANSWERS]
+            self.calls = 0
+
+        async def generate_content_async(self, contents, **kwargs):
+            self.calls += 1
+            return self.answers[self.calls % len(self.answers)]
+
+    llm_client.set_model("parse", CannedGemini())
+    loop = asyncio.new_event_loop()
+    counter = iter(range(sys.maxsize))
+
+    def run():
+        timezone_name = NLP_TIMEZONES[next(counter) % len(NLP_TIMEZONES)]
+        return loop.run_until_complete(nlp_service.parse_task_from_text("benchmark task", timezone_name))
+    return run
+
+# Due-date phrases as Gemini returns them (the last ones are left to dateparser)
+DUE_DATE_PHRASES = (
+    "tomorrow 5pm", "today 5pm", "friday 3pm", "tomorrow 9am", "next monday 10am", "in 2 days",
+    "next week", "EOD", "saturday evening at 4pm", "5:30 pm", "asap", "october 30 at 2pm",
+)
+
+@benchmark("dates.resolve_due_date", warmup=len(DUE_DATE_PHRASES) * len(NLP_TIMEZONES))
+def _resolve_due_date():
+    from app.services import date_phrase_service
+
+    def run():
+        for phrase in DUE_DATE_PHRASES:
+            for timezone_name in NLP_TIMEZONES:
+                date_phrase_service.resolve_due_date(phrase, timezone_name)
+    return run
+
+# The same phrases, all through dateparser (how they were resolved before date_phrase_service)
+@benchmark("dates.dateparser_only", warmup=2)
+def _dateparser_only():
+    import dateparser
+
+    def run():
+        for phrase in DUE_DATE_PHRASES:
+            for timezone_name in NLP_TIMEZONES:
+                dateparser.parse(phrase, settings={
+                    'PREFER_DATES_FROM': 'future', 'TIMEZONE': timezone_name, 'RETURN_AS_TIMEZONE_AWARE': True,
+                })
+    return run
+
+# The same phrases, all through the shared, language-restricted parser
+@benchmark("dates.shared_dateparser", warmup=2)
+def _shared_dateparser():
+    from app.services import date_phrase_service
+
+    def run():
+        for phrase in DUE_DATE_PHRASES:
+            for timezone_name in NLP_TIMEZONES:
+                date_phrase_service.parse_with_dateparser(phrase, timezone_name)
+    return run
+
+@benchmark("priority.calculate_priority_score")
+def _priority_score():
+    from app.services.priority_service import calculate_priority_score
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    rng = random.Random(1)
+    cases = [
+        (now + datetime.timedelta(days=rng.uniform(-3, 20)), rng.randint(1, 5), rng.uniform(0.6, 1.4), rng.uniform(0, 20))
+        for _ in range(64)
+    ] + [(None, 3, 1.0, 0.0), (now.replace(tzinfo=None), 5, 1.0, 0.0)]
+
+    def run():
+        for due_date, importance, multiplier, boost in cases:
+            calculate_priority_score(due_date, importance, personal_multiplier=multiplier, difficulty_boost=boost)
+    return run
+
+def _synthetic_logs(rng: random.Random):
+    """One synthetic user's history as the trainer's DataFrame (generate_data.py's generator, no database)."""
+    import pandas as pd
+    from benchmarks.generate_data import UserProfile, _generate_user
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    _, _, log_rows = _generate_user(rng, 1, list(range(1, 601)), UserProfile(rng), 180, now, seed=7)
+    return pd.DataFrame(
+        [{"action": action, "task_snapshot": json.loads(snapshot), "timestamp": timestamp} for action, snapshot, timestamp, _, _ in log_rows]
+    )
+
+def _train_user_model():
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "ml" / "scripts"))
+    import train_user_model
+    return train_user_model
+
+@benchmark("ml.get_personalization")
+def _personalization():
+    from app.services.ml_service import MLModelService
+    from benchmarks.seed import random_task_title
+
+    # Train the three models on one synthetic user's history, like the trainer would
+    train_user_model = _train_user_model()
+    rng = random.Random(7)
+    logs = _synthetic_logs(rng)
+    with contextlib.redirect_stdout(io.StringIO()):
+        models = (
+            train_user_model.train_difficulty_model(logs),
+            train_user_model.train_personalization_model(logs),
+            train_user_model.train_friction_model(logs),
+        )
+
+    service = MLModelService(user_id=-1) # No model files: nothing is loaded from disk
+    service.model_a_difficulty, service.model_b_personalization, service.model_c_friction = models
+    service.vectorizer_a, service.vectorizer_b, service.vectorizer_c = (
+        model.named_steps.get("tfidf") if model else None for model in models
+    )
+    # Known titles (all models run) and unknown ones (rejected by the relevance check)
+    titles = [random_task_title(rng) for _ in range(8)] + ["water the plants", "book flights to Lisbon"]
+
+    def run():
+        for title in titles:
+            service.get_personalization(title)
+    return run
+
+@benchmark("ml.get_smart_suggestion")
+def _smart_suggestion():
+    from app.services import ml_service
+
+    train_user_model = _train_user_model()
+    with contextlib.redirect_stdout(io.StringIO()):
+        profile = train_user_model.create_productivity_profile(_synthetic_logs(random.Random(7)))
+
+    service = ml_service.MLModelService(user_id=-1)
+    service.model_d_profile = profile
+    service.peak_windows = ml_service._peak_window_table(profile)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    # Deadlines from "in an hour" (no window fits) to next month (the strongest one does)
+    due_dates = [now + datetime.timedelta(hours=hours) for hours in (1, 20, 50, 100, 170, 720)] + [None]
+
+    def run():
+        for due_date in due_dates:
+            service.get_smart_suggestion(1, is_high_friction=True, is_hard=True, task_due_date=due_date)
+    return run
+
+@benchmark("log.create_log_entry")
+def _log_entry():
+    from app.models.task_model import Task
+    from app.services import log_service
+
+    class AddOnlySession:
+        """create_log_entry() only calls db.add(); the flush is the router's."""
+        def add(self, instance):
+            pass
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    task = Task(
+        id=1, title="Write quarterly report", description="Numbers from finance", due_date=now, importance=4,
+        priority_score=61.5, completed=True, created_at=now, ask_completion_time=True, owner_id=1,
+        task_metadata={"tags": ["finance"], "people": ["Alex", "Sam"], "apps": ["Excel"]},
+    )
+    db = AddOnlySession()
+    action_data = {"completion_time_minutes": 45}
+
+    def run():
+        log_service.create_log_entry(db, task, user_id=1, action="completed", action_data=action_data)
+    return run
+
+@benchmark("gamification.update_gamification_stats")
+def _gamification():
+    from app.models.user_model import User
+    from app.services import gamification_service
+
+    class CountSession:
+        """Answers the completed-count query with a fixed number (the query is the database's cost)."""
+        def query(self, *entities):
+            return self
+
+        def filter(self, *criteria):
+            return self
+
+        def scalar(self):
+            return 37
+
+    users = [
+        User(id=i, email=f"user{i}@example.com", timezone=tz, current_streak=streak, longest_streak=streak,
+             last_active_day=None, achievements=["tasks_1", "tasks_5"])
+        for i, (tz, streak) in enumerate([("Asia/Kolkata", 2), ("America/New_York", 6), ("UTC", 13), (None, 0)])
+    ]
+    db = CountSession()
+
+    def run():
+        for user in users:
+            # Yesterday, so every call extends the streak and checks achievements
+            user.last_active_day = datetime.date.today() - datetime.timedelta(days=1)
+            gamification_service.update_gamification_stats(db, user)
+    return run
+
+
+# --- 2. Timing ---
+
+def _measure(func: Callable[[], Any], warmup: int, rounds: int) -> Dict[str, Any]:
+    for _ in range(warmup):
+        func()
+    loops = 1
+    while loops < MAX_LOOPS:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        if time.perf_counter() - started >= MIN_ROUND_SECONDS:
+            break
+        loops *= 2
+
+    per_call = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        per_call.append((time.perf_counter() - started) / loops)
+    return {
+        "loops": loops,
+        "rounds": rounds,
+        "min_us": round(min(per_call) * 1e6, 2),
+        "median_us": round(statistics.median(per_call) * 1e6, 2),
+        "mean_us": round(statistics.fmean(per_call) * 1e6, 2),
+        "stdev_us": round(statistics.stdev(per_call) * 1e6, 2) if rounds > 1 else 0.0,
+    }
+
+
+# --- 3. Main ---
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=15, help="Timed rounds per benchmark.")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this.")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline results file.")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed growth of the median over the baseline (0.25 = 25%%).")
+    args = parser.parse_args()
+
+    # The services' debug/info logs are not what we measure
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+    from app.core.logging_config import setup_logging
+    setup_logging()
+
+    baseline = {}
+    if args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text())["benchmarks"]
+
+    results: Dict[str, Any] = {}
+    regressions = []
+    print(f"--- Micro-benchmarks ({args.rounds} rounds, median per call) ---")
+    for bench in BENCHMARKS:
+        if args.filter not in bench.name:
+            continue
+        result = results[bench.name] = _measure(bench.setup(), bench.warmup, args.rounds)
+        line = f"  {bench.name:<40} {result['median_us']:>12,.1f} us   (min {result['min_us']:,.1f}, stdev {result['stdev_us']:,.1f})"
+        before = baseline.get(bench.name)
+        if before:
+            change = (result["median_us"] - before["median_us"]) / before["median_us"]
+            line += f"   {change:>+7.1%}"
+            if change > args.threshold:
+                regressions.append(bench.name)
+                line += "  REGRESSION"
+        print(line)
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps({
+            "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "benchmarks": results,
+        }, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+    elif not baseline:
+        print(f"No baseline at {args.baseline}; run with --save-baseline first to compare.")
+
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+# backend/benchmarks/run.py
+
+"""
+API benchmark: runs the real FastAPI app in this process (lifespan
+included) against the database from .env, seeded with a reproducible
+data set, with Gemini and Google replaced by deterministic local fakes.
+Each scenario is driven by concurrent requests over httpx's ASGI
+transport, and the latency percentiles and throughput are written as
+JSON, so two commits can be compared:
+
+    python -m benchmarks.run --output before.json
+    git checkout <other commit>
+    python -m benchmarks.run --output after.json --compare before.json
+
+Run from the backend/ directory. Useful options:
+
+    --users 20 --tasks-per-user 200 --logs-per-user 500   (the seeded data set)
+    --requests 200 --concurrency 10                       (per scenario)
+    --gemini-latency-ms 300 --google-latency-ms 50        (fake remote latency)
+    --scenarios tasks.list,insights.heatmap               (a subset)
+
+The benchmark users (emails @bench.example.com) are deleted afterwards,
+unless --keep-data is given.
+"""
+
+import argparse
+import asyncio
+import datetime
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+# Add the 'backend' directory to the path so we can import our 'app' module
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx
+
+from benchmarks.fakes import DATE_PHRASES, start_fake_google
+
+
+class Scenario(NamedTuple):
+    method: str
+    # (rng, user) -> (path, json body or None)
+    build: Callable[[random.Random, Any], tuple]
+
+
+def _new_task_text(rng: random.Random, user) -> tuple:
+    from benchmarks.seed import random_task_title
+    return "/tasks/", {"nlp_text": f"{random_task_title(rng).lower()} {rng.choice(DATE_PHRASES)}"}
+
+def _update_task(rng: random.Random, user) -> tuple:
+    return f"/tasks/{rng.choice(user.task_ids)}", {"importance": rng.randint(1, 5), "action_type": "edited"}
+
+SCENARIOS: Dict[str, Scenario] = {
+    "tasks.create": Scenario("POST", _new_task_text),
+    "tasks.list": Scenario("GET", lambda rng, user: (f"/tasks/?status=all&show={rng.choice(['today', 'upcoming', 'last7days'])}", None)),
+    "tasks.update": Scenario("PUT", _update_task),
+    "insights.burndown": Scenario("GET", lambda rng, user: ("/insights/burndown", None)),
+    "insights.heatmap": Scenario("GET", lambda rng, user: ("/insights/heatmap", None)),
+    "insights.progress_summary": Scenario("GET", lambda rng, user: ("/insights/progress-summary", None)),
+    "summary.weekly": Scenario("GET", lambda rng, user: ("/summary/weekly?force_regenerate=true", None)),
+}
+
+
+# --- 1. Measuring ---
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+async def _run_scenario(client: httpx.AsyncClient, scenario: Scenario, users: list, args, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    # Requests are built up front, so the workload is the same on every run
+    planned = []
+    for user in itertools.islice(itertools.cycle(users), args.warmup + args.requests):
+        path, body = scenario.build(rng, user)
+        planned.append((path, body, user.headers))
+
+    async def _send(path, body, headers) -> httpx.Response:
+        return await client.request(scenario.method, path, json=body, headers=headers)
+
+    for path, body, headers in planned[:args.warmup]:
+        await _send(path, body, headers)
+
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    queue = iter(planned[args.warmup:])
+
+    async def _worker() -> None:
+        for path, body, headers in queue:
+            started = time.perf_counter()
+            response = await _send(path, body, headers)
+            latencies.append(time.perf_counter() - started)
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": sum(count for status, count in statuses.items() if int(status) >= 400),
+        "statuses": statuses,
+        "rps": round(len(latencies) / elapsed, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 2),
+        "p90_ms": round(_percentile(latencies, 0.90) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2),
+    }
+
+
+# --- 2. Reporting ---
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _print_result(name: str, result: Dict[str, Any]) -> None:
+    print(
+        f"  {name:<27} {result['rps']:>8,.1f} req/s   p50 {result['p50_ms']:>8.1f} ms   "
+        f"p95 {result['p95_ms']:>8.1f} ms   p99 {result['p99_ms']:>8.1f} ms   errors {result['errors']}"
+    )
+
+def _print_comparison(baseline: Dict[str, Any], current: Dict[str, Any]) -> None:
+    print(f"--- Compared with {baseline['meta'].get('git_commit') or 'baseline'} (negative latency change = faster) ---")
+    for name, result in current["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if not before:
+            continue
+        change = lambda key: (result[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+        print(f"  {name:<27} rps {change('rps'):>+7.1f}%   p50 {change('p50_ms'):>+7.1f}%   p95 {change('p95_ms'):>+7.1f}%")
+
+
+# --- 3. Main ---
+
+async def _main(args) -> Dict[str, Any]:
+    # The fake Google must be running (and configured) before the app is imported
+    google_server, _ = start_fake_google(args.google_latency_ms)
+    from app.main import app
+    from benchmarks.fakes import install_fake_gemini
+    from benchmarks.seed import clear_benchmark_data, seed_database
+
+    install_fake_gemini(args.gemini_latency_ms)
+    names = args.scenarios.split(",") if args.scenarios else list(SCENARIOS)
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))} (choose from {', '.join(SCENARIOS)})")
+
+    print(f"--- Seeding {args.users} users x {args.tasks_per_user} tasks, {args.logs_per_user} logs (seed {args.seed}) ---")
+    users = seed_database(args.users, args.tasks_per_user, args.logs_per_user, seed=args.seed)
+
+    results: Dict[str, Any] = {
+        "meta": {
+            "git_commit": _git_commit(),
+            "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        },
+        "scenarios": {},
+    }
+    print(f"--- API Benchmark ({args.requests} requests per scenario, {args.concurrency} concurrent) ---")
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=120) as client:
+                for index, name in enumerate(names):
+                    result = await _run_scenario(client, SCENARIOS[name], users, args, seed=args.seed + index)
+                    results["scenarios"][name] = result
+                    _print_result(name, result)
+    finally:
+        if not args.keep_data:
+            clear_benchmark_data()
+        google_server.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20, help="Benchmark users to seed.")
+    parser.add_argument("--tasks-per-user", type=int, default=200, help="Tasks seeded per user.")
+    parser.add_argument("--logs-per-user", type=int, default=500, help="user_logs rows seeded per user.")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the data set and the request mix.")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per scenario.")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured requests per scenario first.")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requests in flight at once.")
+    parser.add_argument("--gemini-latency-ms", type=float, default=0.0, help="Latency of each fake Gemini call.")
+    parser.add_argument("--google-latency-ms", type=float, default=0.0, help="Latency of each fake Google call.")
+    parser.add_argument("--scenarios", default="", help=f"Comma-separated subset of: {', '.join(SCENARIOS)}.")
+    parser.add_argument("--output", default="benchmark-results.json", help="Where to write the JSON results.")
+    parser.add_argument("--compare", help="A previous results file to compare against.")
+    parser.add_argument("--keep-data", action="store_true", help="Leave the seeded data in the database.")
+    args = parser.parse_args()
+
+    # Per-request INFO logs would be measured too; no background calendar sync
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+    os.environ.setdefault("CALENDAR_SYNC_ENABLED", "false")
+
+    results = asyncio.run(_main(args))
+    Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+    print(f"Results written to {args.output}")
+    if args.compare:
+        _print_comparison(json.loads(Path(args.compare).read_text()), results)
+
+
+if __name__ == "__main__":
+    main()
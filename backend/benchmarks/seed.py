@@ -0,0 +1,142 @@
+# backend/benchmarks/seed.py
+
+"""
+Seeds the database from .env with a reproducible benchmark data set: the
+same --seed always gives the same users, tasks and logs. Benchmark users
+have emails under BENCH_EMAIL_DOMAIN, so they can be wiped (and re-seeded)
+without touching real data.
+"""
+
+import datetime
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from sqlalchemy import delete, insert, select
+
+from app.core.database import engine
+from app.models.log_model import UserLog
+from app.models.task_model import Task
+from app.models.tombstone_model import TaskTombstone
+from app.models.user_model import User
+from app.services import auth_service
+
+BENCH_EMAIL_DOMAIN = "bench.example.com"
+TOKEN_LIFETIME = datetime.timedelta(hours=12) # Outlasts any benchmark run
+
+TASK_VERBS = ("Write", "Review", "Fix", "Plan", "Call", "Email", "Prepare", "Update", "Design", "Buy")
+TASK_OBJECTS = (
+    "quarterly report", "login bug", "team meeting", "client proposal", "grocery list",
+    "project roadmap", "budget sheet", "slides for demo", "onboarding docs", "dentist appointment",
+)
+TIMEZONES = ("Asia/Kolkata", "Europe/Berlin", "America/New_York", "UTC")
+
+
+@dataclass
+class SeededUser:
+    id: int
+    access_token: str
+    task_ids: List[int] = field(default_factory=list)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+
+def random_task_title(rng: random.Random) -> str:
+    return f"{rng.choice(TASK_VERBS)} {rng.choice(TASK_OBJECTS)}"
+
+
+def task_snapshot(task: Dict[str, Any], task_id: int) -> Dict[str, Any]:
+    # The shape log_service.create_log_entry() stores
+    return {
+        "id": task_id,
+        "title": task["title"],
+        "description": None,
+        "due_date": task["due_date"].isoformat(),
+        "importance": task["importance"],
+        "priority_score": task["priority_score"],
+        "completed": task["completed"],
+        "created_at": task["created_at"].isoformat(),
+        "task_metadata": task["task_metadata"],
+        "ask_completion_time": False,
+    }
+
+def _log_row(rng: random.Random, user_id: int, task: Dict[str, Any], task_id: int, now: datetime.datetime) -> Dict[str, Any]:
+    action = rng.choices(("completed", "snoozed", "edited", "deleted"), weights=(6, 2, 2, 1))[0]
+    snapshot = task_snapshot(task, task_id)
+    if action == "completed":
+        snapshot["completion_time_minutes"] = rng.choice((0, 10, 15, 25, 30, 45, 60, 90, 120))
+    elif action == "snoozed":
+        snapshot["old_due_date"] = snapshot["due_date"]
+        snapshot["new_due_date"] = (task["due_date"] + datetime.timedelta(days=1)).isoformat()
+    elif action == "edited":
+        snapshot["update_diff"] = {"importance": {"old": task["importance"], "new": min(task["importance"] + 1, 5)}}
+    # user_logs.timestamp is naive UTC
+    timestamp = now - datetime.timedelta(days=rng.uniform(0, 28), hours=rng.uniform(0, 24))
+    return {
+        "user_id": user_id,
+        "task_id": task_id,
+        "action": action,
+        "task_snapshot": snapshot,
+        "timestamp": timestamp.replace(tzinfo=None),
+    }
+
+
+def clear_benchmark_data() -> None:
+    """Deletes every benchmark user and everything they own."""
+    bench_users = select(User.id).where(User.email.like(f"%@{BENCH_EMAIL_DOMAIN}"))
+    with engine.begin() as conn:
+        conn.execute(delete(UserLog).where(UserLog.user_id.in_(bench_users)))
+        conn.execute(delete(TaskTombstone).where(TaskTombstone.owner_id.in_(bench_users)))
+        conn.execute(delete(Task).where(Task.owner_id.in_(bench_users)))
+        conn.execute(delete(User).where(User.id.in_(bench_users)))
+
+
+def seed_database(users: int, tasks_per_user: int, logs_per_user: int, seed: int = 42) -> List[SeededUser]:
+    """Replaces the benchmark data set with a fresh one and returns its users."""
+    rng = random.Random(seed)
+    now = datetime.datetime.now(datetime.timezone.utc).replace(minute=0, second=0, microsecond=0)
+    clear_benchmark_data()
+
+    seeded: List[SeededUser] = []
+    with engine.begin() as conn:
+        user_ids = conn.execute(insert(User).returning(User.id, sort_by_parameter_order=True), [
+            {
+                "email": f"bench-{seed}-{i}@{BENCH_EMAIL_DOMAIN}",
+                "full_name": f"Bench User {i}",
+                "has_finalized_signup": True,
+                "timezone": rng.choice(TIMEZONES),
+                "google_oauth_refresh_token": "bench-refresh-token", # Accepted by the fake Google
+            }
+            for i in range(users)
+        ]).scalars().all()
+
+        for user_id in user_ids:
+            tasks = []
+            for _ in range(tasks_per_user):
+                created_at = now - datetime.timedelta(days=rng.uniform(0, 35))
+                importance = rng.randint(1, 5)
+                tasks.append({
+                    "title": random_task_title(rng),
+                    "due_date": created_at + datetime.timedelta(days=rng.uniform(0, 14), hours=rng.randint(8, 18)),
+                    "created_at": created_at,
+                    "importance": importance,
+                    "priority_score": round(rng.uniform(5, 100), 2),
+                    "completed": rng.random() < 0.4,
+                    "task_metadata": {"tags": ["benchmark"]} if rng.random() < 0.2 else {},
+                    "owner_id": user_id,
+                })
+            task_ids = conn.execute(insert(Task).returning(Task.id, sort_by_parameter_order=True), tasks).scalars().all() if tasks else []
+
+            logs = [
+                _log_row(rng, user_id, tasks[index], task_ids[index], now)
+                for index in (rng.randrange(len(tasks)) for _ in range(logs_per_user if tasks else 0))
+            ]
+            if logs:
+                conn.execute(insert(UserLog), logs)
+
+            token = auth_service._create_jwt(data={"sub": str(user_id), "type": "access"}, expires_delta=TOKEN_LIFETIME)
+            seeded.append(SeededUser(id=user_id, access_token=token, task_ids=list(task_ids)))
+
+    return seeded
@@ -19,7 +19,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 from app.core.config_loader import settings # Reads from .env
 from app.core.database import Base         # Our SQLAlchemy Base class
 # --- MODIFIED LINE: Import ALL models ---
-from app.models import user_model, task_model, log_model # Import all our models
+from app.models import user_model, task_model, log_model, tombstone_model, stream_ticket_model # Import all our models
 # -----------------------------------------------
 
 
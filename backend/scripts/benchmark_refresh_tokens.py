@@ -0,0 +1,79 @@
+# backend/scripts/benchmark_refresh_tokens.py
+
+"""
+Measures how many refresh-token checks one CPU core can do per second,
+comparing the legacy bcrypt hash with the current HMAC-SHA256 digest.
+
+It times the CPU work of POST /auth/refresh-token (decode the refresh JWT,
+verify it against the stored hash, sign a new access token); the DB query
+is left out. Run from the backend/ directory (needs the usual .env):
+
+    python scripts/benchmark_refresh_tokens.py [--seconds 3]
+"""
+
+import argparse
+import datetime
+import sys
+import time
+from pathlib import Path
+
+# Add the 'backend' directory to the path so we can import our 'app' module
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from jose import jwt
+from app.services import auth_service
+
+
+def _refresh_once(refresh_token: str, stored_hash: str, verify) -> None:
+    payload = jwt.decode(refresh_token, auth_service.SECRET_KEY, algorithms=[auth_service.ALGORITHM])
+    if not verify(refresh_token, stored_hash):
+        raise RuntimeError("Benchmark token failed to verify")
+    auth_service._create_jwt(
+        data={"sub": payload["sub"], "type": "access"},
+        expires_delta=datetime.timedelta(minutes=auth_service.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+
+
+def _measure(label: str, refresh_token: str, stored_hash: str, verify, seconds: float) -> float:
+    count = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        _refresh_once(refresh_token, stored_hash, verify)
+        count += 1
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed
+    print(f"  {label:<22} {rate:>12,.1f} refreshes/sec/core  ({elapsed / count * 1000:.3f} ms each)")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=3.0, help="How long to run each variant.")
+    args = parser.parse_args()
+
+    refresh_token = auth_service._create_jwt(
+        data={"sub": "1", "type": "refresh"},
+        expires_delta=datetime.timedelta(days=auth_service.REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+
+    print("--- Refresh Token Benchmark (single thread, no DB) ---")
+    bcrypt_rate = _measure(
+        "bcrypt (legacy)",
+        refresh_token,
+        auth_service.get_pwd_context().hash(refresh_token),
+        auth_service.get_pwd_context().verify,
+        args.seconds,
+    )
+    hmac_rate = _measure(
+        "hmac-sha256 (current)",
+        refresh_token,
+        auth_service.get_token_hash(refresh_token),
+        auth_service.verify_token_hash,
+        args.seconds,
+    )
+    print(f"  Speedup: {hmac_rate / bcrypt_rate:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# backend/scripts/load_test_async_db.py
+
+"""
+Load test: the DB work of POST /tasks/manual done from an 'async def'
+endpoint with the old sync Session (psycopg2, blocks the event loop)
+versus the new AsyncSession (asyncpg, awaits every query).
+
+Both variants run in one throwaway FastAPI app in this process, driven
+by concurrent requests over httpx's ASGI transport, against the real
+database from .env. Each request inserts a task (the change_version
+hook and NOTIFY fire as usual), commits, refreshes it, and reads the
+user's open tasks back. --db-latency-ms adds a pg_sleep() per request to
+mimic a database on another host. A ticker measures how late the event
+loop runs while the load is on: with the sync session it stalls for as
+long as each query takes.
+
+Run from the backend/ directory:
+
+    python scripts/load_test_async_db.py [--requests 500] [--concurrency 10] [--db-latency-ms 5]
+
+Keep --concurrency below the pool size (5 + 10 overflow): above it the
+sync variant deadlocks until the pool timeout, because the sessions that
+would free a connection are closed by the very event loop the blocked
+request is holding. The async variant has no such limit.
+
+The test user and its tasks are deleted afterwards.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List
+
+# Add the 'backend' directory to the path so we can import our 'app' module
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal, async_engine, engine, get_async_db, get_db
+from app.models.task_model import Task
+from app.models.user_model import User
+from app.services import change_service # Registers the change_version hooks, as in the app
+
+TICK_SECONDS = 0.005 # Event loop lag probe interval
+
+
+def _build_app(user_id: int, db_latency: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/sync")
+    async def create_with_sync_session(db: Session = Depends(get_db)):
+        if db_latency:
+            db.execute(text("SELECT pg_sleep(:s)"), {"s": db_latency})
+        task = Task(title="load test", importance=3, priority_score=1.0, owner_id=user_id)
+        db.add(task)
+        db.commit()
+        db.refresh(task)
+        open_tasks = db.scalar(select(func.count(Task.id)).where(Task.owner_id == user_id, Task.completed.is_(False)))
+        return {"id": task.id, "open_tasks": open_tasks}
+
+    @app.post("/async")
+    async def create_with_async_session(db: AsyncSession = Depends(get_async_db)):
+        if db_latency:
+            await db.execute(text("SELECT pg_sleep(:s)"), {"s": db_latency})
+        task = Task(title="load test", importance=3, priority_score=1.0, owner_id=user_id)
+        db.add(task)
+        await db.commit()
+        await db.refresh(task)
+        open_tasks = await db.scalar(select(func.count(Task.id)).where(Task.owner_id == user_id, Task.completed.is_(False)))
+        return {"id": task.id, "open_tasks": open_tasks}
+
+    return app
+
+
+async def _measure_loop_lag(stop: asyncio.Event, lags: List[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(time.perf_counter() - started - TICK_SECONDS)
+
+
+async def _run_variant(app: FastAPI, path: str, requests: int, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    remaining = iter(range(requests))
+
+    async def _worker(client: httpx.AsyncClient) -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.post(path)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as client:
+        await client.post(path) # Warm up the pool
+
+        stop = asyncio.Event()
+        lags: List[float] = []
+        ticker = asyncio.create_task(_measure_loop_lag(stop, lags))
+        started = time.perf_counter()
+        await asyncio.gather(*(_worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await ticker
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "max_loop_lag_ms": max(lags, default=0.0) * 1000,
+    }
+
+
+def _print_result(label: str, result: Dict[str, float]) -> None:
+    print(
+        f"  {label:<26} {result['rps']:>9,.1f} req/s   p50 {result['p50_ms']:>7.1f} ms   "
+        f"p95 {result['p95_ms']:>7.1f} ms   max loop lag {result['max_loop_lag_ms']:>7.1f} ms"
+    )
+
+
+async def _main(args) -> None:
+    db = SessionLocal()
+    user = User(email=f"loadtest-{uuid.uuid4().hex[:12]}@example.com", full_name="Load Test", has_finalized_signup=True)
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+
+    app = _build_app(user_id, args.db_latency_ms / 1000)
+    print(f"--- Async DB Load Test ({args.requests} requests, {args.concurrency} concurrent, +{args.db_latency_ms} ms DB latency) ---")
+    try:
+        sync_result = await _run_variant(app, "/sync", args.requests, args.concurrency)
+        _print_result("sync Session (psycopg2)", sync_result)
+        async_result = await _run_variant(app, "/async", args.requests, args.concurrency)
+        _print_result("AsyncSession (asyncpg)", async_result)
+        print(f"  Throughput: {async_result['rps'] / sync_result['rps']:.2f}x")
+    finally:
+        db = SessionLocal()
+        db.execute(delete(Task).where(Task.owner_id == user_id))
+        db.execute(delete(User).where(User.id == user_id))
+        db.commit()
+        db.close()
+        await async_engine.dispose()
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per variant.")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requests in flight at once.")
+    parser.add_argument("--db-latency-ms", type=float, default=5.0, help="Extra per-request DB round-trip time (pg_sleep).")
+    args = parser.parse_args()
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+# backend/scripts/mock_google_api.py
+
+"""
+A small in-memory stand-in for the Google endpoints the backend calls:
+the OAuth token endpoint (code exchange with signed ID tokens, and
+refresh), the ID-token signing certs, and Calendar v3 events (single
+calls and batch).
+
+Run it, then point the backend at it through the usual .env settings:
+
+    python scripts/mock_google_api.py --port 8765 [--latency-ms 50]
+
+    GOOGLE_API_BASE_URL=http://127.0.0.1:8765
+    GOOGLE_TOKEN_URI=http://127.0.0.1:8765/token
+    GOOGLE_CERTS_URL=http://127.0.0.1:8765/oauth2/v1/certs
+
+Scripts and benchmarks can also start it in-process:
+
+    server, base_url = start_mock_server(latency_ms=20)
+    ...
+    server.shutdown()
+
+Behaviour worth knowing:
+- Any authorization code is accepted; the user's email is '<code>@example.com'.
+- The refresh token 'revoked' is rejected with 400 invalid_grant.
+- Event IDs containing 'fail' answer 500, so partial batch failures can be exercised.
+- events.list supports syncToken/pageToken; edit_event_as_user(), delete_event_as_user()
+  and expire_sync_tokens() simulate changes made in Google for the pull sync.
+- server.stats counts requests per kind ('token', 'certs', 'api', 'batch', 'watch').
+"""
+
+import argparse
+import datetime
+import email.parser
+import itertools
+import json
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from google.auth import crypt, jwt
+
+EVENTS_PATH = re.compile(r"^/calendar/v3/calendars/([^/]+)/events(?:/([^/?]+))?/?(?:\?.*)?$")
+BATCH_PATH = "/batch/calendar/v3"
+CERTS_PATH = "/oauth2/v1/certs"
+CERTS_MAX_AGE_SECONDS = 3600
+
+
+def _make_signing_key() -> Tuple[crypt.RSASigner, Dict[str, str]]:
+    """A throwaway RSA key and self-signed cert, in the {kid: PEM} shape Google serves."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "mock-google")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name).issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=30))
+        .sign(key, hashes.SHA256())
+    )
+    key_id = uuid.uuid4().hex
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    signer = crypt.RSASigner.from_string(private_pem, key_id=key_id)
+    return signer, {key_id: cert.public_bytes(serialization.Encoding.PEM).decode()}
+
+
+class MockGoogleServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency_ms: float = 0):
+        super().__init__(address, MockGoogleHandler)
+        self.latency = latency_ms / 1000
+        # One shared 'primary' calendar. Every event (including deleted ones,
+        # kept as 'cancelled') remembers the change sequence that last touched it
+        self.events: Dict[str, Dict[str, Any]] = {}
+        self.stats: Counter = Counter()
+        self.lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._seq = 0
+        self._sync_epoch = 0 # Sync tokens from an older epoch answer 410
+        self.signer, self.certs = _make_signing_key()
+
+    def next_id(self) -> str:
+        return f"mockevent{next(self._ids)}"
+
+    def _store(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        self._seq += 1
+        self.events[event["id"]] = {**event, "_seq": self._seq}
+        return _public(self.events[event["id"]])
+
+    # --- Simulating the user editing their calendar in Google ---
+
+    def edit_event_as_user(self, event_id: str, **fields) -> None:
+        with self.lock:
+            self._store({**self.events[event_id], **fields})
+
+    def delete_event_as_user(self, event_id: str) -> None:
+        with self.lock:
+            self._store({"id": event_id, "status": "cancelled"})
+
+    def expire_sync_tokens(self) -> None:
+        with self.lock:
+            self._sync_epoch += 1
+
+    # --- Calendar semantics (shared by plain and batched calls) ---
+
+    def _list(self, query: Dict[str, str]) -> Tuple[int, Optional[Dict[str, Any]]]:
+        sync_token = query.get("syncToken")
+        if sync_token:
+            epoch, _, since = sync_token.removeprefix("sync").partition(".")
+            if epoch != str(self._sync_epoch) or not since.isdigit():
+                return 410, {"error": {"code": 410, "message": "Sync token is no longer valid, a full sync is required."}}
+            items = [e for e in self.events.values() if e["_seq"] > int(since)]
+        else:
+            items = [e for e in self.events.values() if e.get("status") != "cancelled"]
+        items.sort(key=lambda e: e["_seq"])
+
+        offset = int(query.get("pageToken") or 0)
+        page_size = int(query.get("maxResults") or 250)
+        page = {"kind": "calendar#events", "items": [_public(e) for e in items[offset:offset + page_size]]}
+        if offset + page_size < len(items):
+            page["nextPageToken"] = str(offset + page_size)
+        else:
+            page["nextSyncToken"] = f"sync{self._sync_epoch}.{self._seq}"
+        return 200, page
+
+    def handle_api(self, method: str, path: str, authorization: Optional[str], body: bytes) -> Tuple[int, Optional[Dict[str, Any]]]:
+        if not (authorization or "").startswith("Bearer "):
+            return 401, {"error": {"code": 401, "message": "Request is missing valid authentication credentials."}}
+
+        match = EVENTS_PATH.match(path)
+        if not match:
+            return 404, {"error": {"code": 404, "message": f"No route for {method} {path}"}}
+        event_id = match.group(2)
+        if event_id and "fail" in event_id:
+            return 500, {"error": {"code": 500, "message": "Backend Error"}}
+
+        payload = json.loads(body) if body.strip() else {}
+        with self.lock:
+            if method == "GET" and not event_id:
+                return self._list(dict(parse_qsl(urlsplit(path).query)))
+            if method == "POST" and event_id == "watch":
+                self.stats["watch"] += 1
+                expiration_ms = int((time.time() + 7 * 24 * 3600) * 1000)
+                return 200, {"kind": "api#channel", "id": payload.get("id"), "resourceId": "mock-resource", "expiration": str(expiration_ms)}
+            if method == "POST" and not event_id:
+                return 200, self._store({**payload, "id": self.next_id(), "status": "confirmed"})
+
+            event = self.events.get(event_id)
+            if event is None or event.get("status") == "cancelled":
+                return 404, {"error": {"code": 404, "message": "Not Found"}}
+            if method == "GET":
+                return 200, _public(event)
+            if method == "PUT":
+                return 200, self._store({**payload, "id": event_id, "status": "confirmed"})
+            if method == "DELETE":
+                self._store({"id": event_id, "status": "cancelled"})
+                return 204, None
+        return 405, {"error": {"code": 405, "message": "Method Not Allowed"}}
+
+
+def _public(event: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in event.items() if not key.startswith("_")}
+
+
+class MockGoogleHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Keep-alive, like the real endpoints
+    server: MockGoogleServer
+
+    def log_message(self, *args):
+        pass
+
+    def _read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def _send(self, status: int, body: bytes = b"", content_type: str = "application/json") -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, data: Optional[Dict[str, Any]]) -> None:
+        self._send(status, json.dumps(data).encode() if data is not None else b"")
+
+    def _simulate_latency(self) -> None:
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+    # --- Routes ---
+
+    def _token(self, body: bytes) -> None:
+        self.server.stats["token"] += 1
+        form = dict(parse_qsl(body.decode()))
+        if form.get("refresh_token") == "revoked":
+            return self._send_json(400, {"error": "invalid_grant", "error_description": "Token has been expired or revoked."})
+
+        tokens = {
+            "access_token": f"mock-access-{uuid.uuid4().hex[:12]}",
+            "expires_in": 3599,
+            "token_type": "Bearer",
+        }
+        if form.get("grant_type") == "authorization_code":
+            code = form.get("code", "user")
+            now = int(time.time())
+            tokens["refresh_token"] = f"mock-refresh-{code}"
+            tokens["id_token"] = jwt.encode(self.server.signer, {
+                "iss": "https://accounts.google.com",
+                "aud": form.get("client_id"),
+                "sub": f"mock-{code}",
+                "email": f"{code}@example.com",
+                "email_verified": True,
+                "name": f"Mock {code}",
+                "iat": now,
+                "exp": now + 3600,
+            }).decode()
+        self._send_json(200, tokens)
+
+    def _certs(self) -> None:
+        self.server.stats["certs"] += 1
+        body = json.dumps(self.server.certs).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Cache-Control", f"public, max-age={CERTS_MAX_AGE_SECONDS}, must-revalidate")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _batch(self, body: bytes) -> None:
+        self.server.stats["batch"] += 1
+        message = email.parser.BytesParser().parsebytes(
+            f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + body
+        )
+        boundary = f"batch_{uuid.uuid4().hex}"
+        parts = []
+        for part in message.get_payload():
+            raw = part.get_payload(decode=True) or b""
+            head, _, inner_body = raw.replace(b"\r\n", b"\n").partition(b"\n\n")
+            method, path = head.split(b"\n", 1)[0].decode().split()[:2]
+            # Outer headers (Authorization) apply to every part
+            status, data = self.server.handle_api(method, path, self.headers.get("Authorization"), inner_body)
+            parts.append(
+                f"--{boundary}\r\n"
+                f"Content-Type: application/http\r\n"
+                f"Content-ID: <response-{part.get('Content-ID', '').strip('<>')}>\r\n\r\n"
+                f"HTTP/1.1 {status} {self.responses.get(status, ('',))[0]}\r\n"
+                f"Content-Type: application/json; charset=UTF-8\r\n\r\n"
+                f"{json.dumps(data) if data is not None else ''}\r\n"
+            )
+        parts.append(f"--{boundary}--")
+        self._send(200, "".join(parts).encode(), f"multipart/mixed; boundary={boundary}")
+
+    def _dispatch(self) -> None:
+        self._simulate_latency()
+        body = self._read_body()
+        path = self.path
+        if self.command == "POST" and path.split("?")[0] == "/token":
+            return self._token(body)
+        if self.command == "POST" and path.split("?")[0] == BATCH_PATH:
+            return self._batch(body)
+        if self.command == "GET" and path.split("?")[0] == CERTS_PATH:
+            return self._certs()
+        self.server.stats["api"] += 1
+        status, data = self.server.handle_api(self.command, path, self.headers.get("Authorization"), body)
+        self._send_json(status, data)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _dispatch
+
+
+def start_mock_server(host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0) -> Tuple[MockGoogleServer, str]:
+    """Starts the mock on a background thread. Returns (server, base_url)."""
+    server = MockGoogleServer((host, port), latency_ms=latency_ms)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay added to every request.")
+    args = parser.parse_args()
+
+    server = MockGoogleServer((args.host, args.port), latency_ms=args.latency_ms)
+    print(f"✅ Mock Google API listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nStopped. Requests served: {dict(server.stats)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,11 +17,12 @@ sys.path.append(str(BACKEND_ROOT))
 
 # --- Database & Model Imports ---
 try:
-    from app.core.database import SessionLocal
+    from app.core.database import SessionLocal, ReplicaSessionLocal
     from app.models.task_model import Task
     from app.models.user_model import User 
     from app.models.log_model import UserLog # <-- THIS IS THE FIX
     from app.services import priority_service # We import our existing service
+    from app.services import change_service # Registers the change-version hook so clients see new scores
 except ImportError as e:
     print(f"🚨 FATAL ERROR: Could not import backend modules: {e}")
     print("Please ensure this script is run from the project's root or `ml/scripts` directory.")
@@ -32,8 +33,11 @@ def run_priority_recalculation():
     """
     Connects to the DB, finds all active tasks due in the future,
     and recalculates their priority score.
+    The scan runs on the read replica (if configured); only the tasks
+    whose score changed are loaded and written on the primary.
     """
     print("--- Starting Dynamic Priority Recalculation Script ---")
+    replica_db = ReplicaSessionLocal()
     db = SessionLocal()
     
     # Get the current time with UTC timezone
@@ -45,47 +49,60 @@ def run_priority_recalculation():
         # 1. Not completed
         # 2. Have a due date
         # 3. The due date is in the future (not overdue)
-        tasks_to_update = db.query(Task).filter(
+        candidates = replica_db.query(
+            Task.id, Task.due_date, Task.importance, Task.priority_score
+        ).filter(
             Task.completed == False,
             Task.due_date != None,
             Task.due_date > now 
         ).all()
+        replica_db.close()
         # -----------------------------
 
-        if not tasks_to_update:
+        if not candidates:
             print("No active, future-dated tasks found to update.")
             return
 
-        print(f"Found {len(tasks_to_update)} tasks to recalculate...")
+        print(f"Found {len(candidates)} tasks to recalculate...")
         
+        # Re-run the priority calculation
+        # We don't pass ML parameters because they are for *creation* time.
+        # We are only re-calculating based on new *urgency*.
+        def _recalculate(due_date, importance):
+            return priority_service.calculate_priority_score(due_date=due_date, importance=importance)
+
+        # Only update the DB if the score actually changed
+        changed_ids = [
+            candidate.id for candidate in candidates
+            if candidate.priority_score != _recalculate(candidate.due_date, candidate.importance)["total_score"]
+        ]
+
+        # Load just those tasks on the primary (so the change-version hook
+        # sees the writes) and recalculate from the primary's values, in
+        # case the replica was lagging behind an edit
+        tasks_to_update = db.query(Task).filter(Task.id.in_(changed_ids)).all() if changed_ids else []
+
         updated_count = 0
         for task in tasks_to_update:
             old_score = task.priority_score
-            
-            # Re-run the priority calculation
-            # We don't pass ML parameters because they are for *creation* time.
-            # We are only re-calculating based on new *urgency*.
-            priority_result = priority_service.calculate_priority_score(
-                due_date=task.due_date,
-                importance=task.importance
-            )
-            
+            priority_result = _recalculate(task.due_date, task.importance)
             new_score = priority_result["total_score"]
             new_breakdown = priority_result["breakdown"]
 
-            # Only update the DB if the score actually changed
-            if old_score != new_score:
-                task.priority_score = new_score
-                
-                if task.task_metadata is None:
-                    task.task_metadata = {}
-                
-                task.task_metadata["priority_breakdown"] = new_breakdown
-                flag_modified(task, "task_metadata") # Force save the JSON change
-                
-                db.add(task)
-                updated_count += 1
-                print(f"  - Task ID {task.id}: '{task.title[:20]}...' score {old_score} -> {new_score}")
+            if task.completed or old_score == new_score:
+                continue
+
+            task.priority_score = new_score
+            
+            if task.task_metadata is None:
+                task.task_metadata = {}
+            
+            task.task_metadata["priority_breakdown"] = new_breakdown
+            flag_modified(task, "task_metadata") # Force save the JSON change
+            
+            db.add(task)
+            updated_count += 1
+            print(f"  - Task ID {task.id}: '{task.title[:20]}...' score {old_score} -> {new_score}")
 
         if updated_count > 0:
             db.commit()
@@ -98,6 +115,7 @@ def run_priority_recalculation():
         print(e)
         db.rollback()
     finally:
+        replica_db.close()
         db.close()
         print("--- Recalculation Script Finished ---")
 
@@ -2,6 +2,7 @@
 
 import sys
 import os
+import calendar
 import pandas as pd
 import json
 import joblib
@@ -23,7 +24,7 @@ sys.path.append(str(BACKEND_ROOT))
 # --- Database & Model Imports ---
 # Now we can import from the 'backend' package
 try:
-    from app.core.database import SessionLocal
+    from app.core.database import SessionLocal, ReplicaSessionLocal
     from app.models.user_model import User
     from app.models.task_model import Task
     from app.models.log_model import UserLog
@@ -196,18 +197,24 @@ def create_productivity_profile(logs: pd.DataFrame) -> Dict[str, Any]:
         print("    Not enough 'completed' logs to build a profile (< 10). Skipping.")
         return {"peak_windows": []} # Return empty profile
         
-    # 2. Convert timestamp to datetime and extract features
+    # 2. Convert timestamp to datetime and extract features (timestamps are UTC)
     df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df['day_of_week'] = df['timestamp'].dt.day_name()
+    df['day_of_week'] = df['timestamp'].dt.weekday # 0 = Monday
     df['hour_of_day'] = df['timestamp'].dt.hour
     
     # 3. Find the most common completion windows (day + hour)
     peak_windows = df.groupby(['day_of_week', 'hour_of_day']).size()
     peak_windows = peak_windows.nlargest(5) # Get top 5 windows
     
-    profile_data = [f"{day} {hour}:00" for (day, hour), count in peak_windows.items()]
+    # Structured, so the API can compute the next occurrence without parsing.
+    # 'weight' is the window's share of all completions.
+    profile_data = [
+        {"weekday": int(day), "hour": int(hour), "weight": round(count / len(df), 4)}
+        for (day, hour), count in peak_windows.items()
+    ]
     
-    print(f"    Productivity Profile (D) created. Peak windows: {profile_data}")
+    labels = [f"{calendar.day_name[w['weekday']]} {w['hour']}:00" for w in profile_data]
+    print(f"    Productivity Profile (D) created. Peak windows: {labels}")
     return {"peak_windows": profile_data}
 
 def train_models_for_user(db: SessionLocal, user_id: int):
@@ -248,7 +255,8 @@ def main():
     Fetches all users and attempts to train models for each one.
     """
     print("--- Starting ML Model Training Script ---")
-    db = SessionLocal()
+    # Training only reads, so it runs on the read replica (if configured)
+    db = ReplicaSessionLocal()
     try:
         # 1. Get all users
         users = db.query(User).all()